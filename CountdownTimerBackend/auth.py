@@ -1,11 +1,27 @@
 import os
+import time
+import hashlib
 import jwt
 import bcrypt
-import json
 from datetime import datetime, timedelta
 from functools import wraps
 from flask import request, jsonify, current_app
 from database import db
+from cache import TTLCache
+from cluster import cluster
+from password_hashing import password_hasher
+from logs import get_logger
+
+logger = get_logger('auth')
+
+# Explicit per-project grants for non-admin users. The primary key serves
+# user -> projects lookups, the extra index project -> users lookups.
+user_project_permissions = db.Table(
+    'user_project_permissions',
+    db.Column('user_id', db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('project_id', db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_user_project_permissions_project_id_user_id', 'project_id', 'user_id'),
+)
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -15,16 +31,20 @@ class User(db.Model):
     is_admin = db.Column(db.Boolean, nullable=False, default=False)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     last_login = db.Column(db.DateTime, nullable=True)
-    authorised_projects = db.Column(db.Text, nullable=True)  # JSON string of project IDs
+
+    # Lets the ORM clear a user's or project's grants when either is deleted
+    permitted_projects = db.relationship('Project', secondary=user_project_permissions, lazy='select',
+                                         backref=db.backref('permitted_users', lazy='select'))
 
     def set_password(self, password):
         """Hash and set the user's password"""
         salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        hashed = password_hasher.run(bcrypt.hashpw, password.encode('utf-8'), salt)
+        self.password_hash = hashed.decode('utf-8')
 
     def check_password(self, password):
         """Check if the provided password matches the stored hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        return password_hasher.run(bcrypt.checkpw, password.encode('utf-8'), self.password_hash.encode('utf-8'))
 
     def update_last_login(self):
         """Update the user's last login timestamp"""
@@ -33,61 +53,103 @@ class User(db.Model):
 
     def get_authorised_projects(self):
         """Get list of project IDs the user is authorised to access"""
-        if not self.authorised_projects:
-            return []
-        try:
-            return json.loads(self.authorised_projects)
-        except (json.JSONDecodeError, TypeError):
-            return []
+        return list(db.session.execute(
+            db.select(user_project_permissions.c.project_id)
+            .where(user_project_permissions.c.user_id == self.id)
+            .order_by(user_project_permissions.c.project_id)
+        ).scalars())
+
+    def authorised_projects_query(self):
+        """Query for the projects the user has been granted, as a single join"""
+        from models import Project  # Import here to avoid circular imports
+        return Project.query.join(
+            user_project_permissions, user_project_permissions.c.project_id == Project.id
+        ).filter(user_project_permissions.c.user_id == self.id)
+
+    @staticmethod
+    def with_project_permission_query(project_id):
+        """Query for all users who can access a project: admins plus explicit grants"""
+        granted = db.select(user_project_permissions.c.user_id).where(
+            user_project_permissions.c.project_id == int(project_id)
+        )
+        return User.query.filter(db.or_(User.is_admin.is_(True), User.id.in_(granted)))
 
     def set_authorised_projects(self, project_ids):
         """Set the list of project IDs the user is authorised to access"""
-        if project_ids is None:
-            self.authorised_projects = None
-        else:
-            # Ensure project_ids is a list of integers
-            project_ids = [int(pid) for pid in project_ids if isinstance(pid, (int, str)) and str(pid).isdigit()]
-            self.authorised_projects = json.dumps(project_ids)
+        db.session.execute(
+            user_project_permissions.delete().where(user_project_permissions.c.user_id == self.id)
+        )
+        if project_ids:
+            # Ensure project_ids is a list of unique integers
+            project_ids = {int(pid) for pid in project_ids if isinstance(pid, (int, str)) and str(pid).isdigit()}
+            db.session.execute(user_project_permissions.insert(), [
+                {'user_id': self.id, 'project_id': pid} for pid in sorted(project_ids)
+            ])
+        db.session.expire(self, ['permitted_projects'])
 
     def add_project_permission(self, project_id):
         """Add permission for a specific project"""
         project_id = int(project_id)
-        current_projects = self.get_authorised_projects()
-        if project_id not in current_projects:
-            current_projects.append(project_id)
-            self.set_authorised_projects(current_projects)
+        if not self._has_grant(project_id):
+            db.session.execute(user_project_permissions.insert().values(user_id=self.id, project_id=project_id))
+            db.session.expire(self, ['permitted_projects'])
 
     def remove_project_permission(self, project_id):
         """Remove permission for a specific project"""
-        project_id = int(project_id)
-        current_projects = self.get_authorised_projects()
-        if project_id in current_projects:
-            current_projects.remove(project_id)
-            self.set_authorised_projects(current_projects)
+        db.session.execute(user_project_permissions.delete().where(
+            user_project_permissions.c.user_id == self.id,
+            user_project_permissions.c.project_id == int(project_id)
+        ))
+        db.session.expire(self, ['permitted_projects'])
+
+    def _has_grant(self, project_id):
+        """Primary-key lookup of a single explicit grant"""
+        return db.session.execute(
+            db.select(user_project_permissions.c.project_id).where(
+                user_project_permissions.c.user_id == self.id,
+                user_project_permissions.c.project_id == project_id
+            )
+        ).first() is not None
 
     def has_project_permission(self, project_id):
         """Check if user has permission to access a specific project"""
         if self.is_admin:
             return True  # Admins can access everything
         
-        project_id = int(project_id)
-        return project_id in self.get_authorised_projects()
+        return self._has_grant(int(project_id))
 
     def can_access_project(self, project_id):
         """Alias for has_project_permission for clarity"""
         return self.has_project_permission(project_id)
 
+# sha256(token) -> decoded payload of recently verified tokens, so repeated requests
+# from the same session skip signature verification and JSON decoding.
+# Entries never outlive the token's own exp claim.
+verified_token_cache = TTLCache(maxsize=4096, ttl=300)
+
 class AuthManager:
-    @staticmethod
-    def get_jwt_secret():
-        """Get JWT secret from environment or generate a default one"""
+    _jwt_secret = None
+
+    @classmethod
+    def load_jwt_secret(cls):
+        """Resolve the JWT secret from the environment; called once at app start"""
         secret = os.getenv('JWT_SECRET_KEY')
         if not secret:
             # In production, always use an environment variable
             secret = 'your-secret-key-change-this-in-production'
-            print("WARNING: Using default JWT secret. Set JWT_SECRET_KEY environment variable in production!")
+            logger.warning('Using the default JWT secret; set JWT_SECRET_KEY in production')
+        cls._jwt_secret = secret
+        # Tokens verified against a previous secret must be checked again
+        verified_token_cache.clear()
         return secret
 
+    @classmethod
+    def get_jwt_secret(cls):
+        """Get the JWT secret, resolving it on first use if the app did not load it"""
+        if cls._jwt_secret is None:
+            return cls.load_jwt_secret()
+        return cls._jwt_secret
+
     @staticmethod
     def generate_token(user_id, username, is_admin=False, expires_in_hours=24):
         """Generate a JWT token for the user"""
@@ -103,14 +165,23 @@ class AuthManager:
     @staticmethod
     def verify_token(token):
         """Verify and decode a JWT token"""
+        key = hashlib.sha256(token.encode('utf-8')).hexdigest()
+        payload = verified_token_cache.get(key)
+        if payload is not None:
+            return payload
+
         try:
             payload = jwt.decode(token, AuthManager.get_jwt_secret(), algorithms=['HS256'])
-            return payload
         except jwt.ExpiredSignatureError:
             return None
         except jwt.InvalidTokenError:
             return None
 
+        # Cache until the token expires, capped by the cache's own TTL
+        expires_in = payload['exp'] - time.time() if 'exp' in payload else verified_token_cache.ttl
+        verified_token_cache.set(key, payload, ttl=min(expires_in, verified_token_cache.ttl))
+        return payload
+
     @staticmethod
     def authenticate_user(username, password):
         """Authenticate a user with username and password"""
@@ -146,6 +217,23 @@ class AuthManager:
             return user
         return None
 
+# (user_id, project_id) -> bool access decisions for project_access_required.
+# Routes that change grants, admin status or delete users/projects invalidate entries;
+# the TTL bounds staleness for changes made by other worker processes.
+project_access_cache = TTLCache(maxsize=10000, ttl=30)
+
+def invalidate_project_access(user_id=None, project_id=None, propagate=True):
+    """Drop cached access decisions for a user, a project, or everything"""
+    if user_id is None and project_id is None:
+        project_access_cache.clear()
+    else:
+        project_access_cache.discard_where(
+            lambda key: (user_id is None or key[0] == user_id) and (project_id is None or key[1] == project_id)
+        )
+    if propagate:
+        # Other workers cache decisions too; a revoked grant must not outlive its TTL there
+        cluster.publish('project_access_invalidated', {'user_id': user_id, 'project_id': project_id})
+
 def token_required(f):
     """Decorator to require authentication for routes"""
     @wraps(f)
@@ -264,18 +352,23 @@ def project_access_required(f):
                 'message': 'Invalid project ID',
                 'code': 400
             }), 400
-          # Get user and check if project exists first
-        user = User.query.get(request.current_user['user_id'])
-        if not user:
-            return jsonify({
-                'error': 'Unauthorized',
-                'message': 'User not found',
-                'code': 401
-            }), 401
+        user_id = request.current_user['user_id']
+        allowed = project_access_cache.get((user_id, project_id))
+        if allowed is None:
+            # Cache miss: get user and check permission against the database
+            user = db.session.get(User, user_id)
+            if not user:
+                return jsonify({
+                    'error': 'Unauthorized',
+                    'message': 'User not found',
+                    'code': 401
+                }), 401
+            allowed = user.has_project_permission(project_id)
+            project_access_cache.set((user_id, project_id), allowed)
         
         # Check if project exists first
         from models import Project  # Import here to avoid circular imports
-        project = Project.query.get(project_id)
+        project = db.session.get(Project, project_id)
         if not project:
             return jsonify({
                 'error': 'Not Found',
@@ -284,13 +377,15 @@ def project_access_required(f):
             }), 404
         
         # Now check if user has permission to access this existing project
-        if not user.has_project_permission(project_id):
+        if not allowed:
             return jsonify({
                 'error': 'Forbidden',
                 'message': 'You do not have permission to access this project',
                 'code': 403
             }), 403
         
+        # Hand the already-loaded project to the view
+        request.current_project = project
         return f(*args, **kwargs)
     return decorated
 
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for JSON encoding of API responses and socket frames.
+Encodes GET /api/projects-shaped payloads with Flask's default provider and with
+FastJSONProvider, and a timer_update frame with the standard library and the
+Socket.IO encoder. Without orjson installed both columns use the standard library.
+
+Usage:
+    python benchmark_json.py
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Never touch the real database
+os.environ['DATABASE_URL'] = os.getenv('BENCHMARK_DATABASE_URL', 'sqlite://')
+
+SIZES = [(10, 10), (50, 20), (100, 50), (200, 100)]  # (projects, timers per project)
+FRAMES = 100000
+
+def projects_payload(project_count, timers_per_project):
+    """A list shaped like the GET /api/projects response"""
+    from timer_state import to_epoch_ms
+    now = datetime.now()
+    server_time_ms = to_epoch_ms(now)
+    return [
+        {
+            'id': p,
+            'name': f'Project {p}',
+            'description': 'Benchmark project with a description',
+            'selected_timer_id': p * timers_per_project,
+            'timers': [
+                {
+                    'id': p * timers_per_project + t,
+                    'name': f'Timer {t}',
+                    'duration': 600,
+                    'description': 'Benchmark timer',
+                    'remaining_seconds': 600 - t,
+                    'paused': t % 2 == 0,
+                    'end_time_ms': None if t % 2 == 0 else to_epoch_ms(now + timedelta(seconds=600 - t)),
+                    'server_time_ms': server_time_ms
+                }
+                for t in range(timers_per_project)
+            ]
+        }
+        for p in range(project_count)
+    ]
+
+def per_second(fn, min_seconds=0.5):
+    """Calls of fn per second, repeating until min_seconds have passed"""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return calls / elapsed
+
+def main():
+    """Run the benchmark for every size"""
+    import json
+    from flask.json.provider import DefaultJSONProvider
+    from main import create_app
+    import json_provider
+    from json_provider import FastJSONProvider, socket_json
+
+    print("=== JSON Encoding Benchmark ===\n")
+    print(f"Fast encoder: {'orjson ' + json_provider.orjson.__version__ if json_provider.orjson else 'not installed'}\n")
+
+    app = create_app()
+    default, fast = DefaultJSONProvider(app), FastJSONProvider(app)
+
+    print(f"{'Projects':>8} {'Timers':>8} {'KiB':>7} | {'default/s':>10} {'fast/s':>10} {'speedup':>8}")
+    print("-" * 60)
+    with app.test_request_context():
+        for project_count, timers_per_project in SIZES:
+            payload = projects_payload(project_count, timers_per_project)
+            size_kib = len(default.response(payload).get_data()) / 1024
+            default_rate = per_second(lambda: default.response(payload))
+            fast_rate = per_second(lambda: fast.response(payload))
+            print(f"{project_count:>8} {project_count * timers_per_project:>8} {size_kib:>7.0f} | "
+                  f"{default_rate:>10.1f} {fast_rate:>10.1f} {fast_rate / default_rate:>7.1f}x")
+
+    frame = {'id': 1, 'name': 'Timer', 'duration': 600, 'description': 'Benchmark timer',
+             'remaining_seconds': 421, 'paused': False, 'project_id': 1}
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        json.dumps(['timer_update', frame], separators=(',', ':'))
+    stdlib_us = (time.perf_counter() - start) * 1e6 / FRAMES
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        socket_json.dumps(['timer_update', frame], separators=(',', ':'))
+    fast_us = (time.perf_counter() - start) * 1e6 / FRAMES
+    print(f"\ntimer_update frame: stdlib {stdlib_us:.2f} us, socket encoder {fast_us:.2f} us "
+          f"({stdlib_us / fast_us:.1f}x); each emit is encoded once per room, not per socket")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+from datetime import datetime
+import time
+from cluster import cluster
+from timer_state import timer_states
+from subscriptions import timer_subscriptions
+
+# Running timers get a timer_sync correction at least this often so clients that
+# interpolate locally from end_time cannot drift far from the server clock
+SYNC_INTERVAL_SECONDS = 30
+
+# Shared by the tick loop and the route emits, so a change pushed by a route is not sent again on the next tick
+last_sent = {}  # timer_id -> last timer_update payload broadcast for a polled timer
+last_synced = {}  # timer_id -> monotonic time of the last timer_sync drift correction
+
+def timer_room(timer_id):
+    """Room of sockets that receive a timer_update frame on every displayed second"""
+    return f'timer_{timer_id}'
+
+def timer_sync_room(timer_id):
+    """Room of sockets that count down locally and only receive timer_sync events"""
+    return f'timer_sync_{timer_id}'
+
+def timer_delta_room(timer_id):
+    """Room of sockets that get a timer's full state on join, then only timer_delta records"""
+    return f'timer_delta_{timer_id}'
+
+def project_timers_room(project_id):
+    """Room of sockets that receive one timers_update frame per tick with every changed timer of a project"""
+    return f'project_timers_{project_id}'
+
+def project_sync_room(project_id):
+    """Room of sockets that joined a whole project and only receive timer_sync events"""
+    return f'project_sync_{project_id}'
+
+# What a delta subscriber keeps from the last full timer_update; they only
+# need another full frame when one of these changes
+METADATA_FIELDS = ('name', 'duration', 'description', 'project_id')
+
+def delta_frame(payload):
+    """Compact timer_delta record for a timer_update payload: [id, remaining_seconds, paused as 0/1]"""
+    return [payload['id'], payload['remaining_seconds'], int(payload['paused'])]
+
+def metadata_changed(previous, current):
+    return any(previous[field] != current[field] for field in METADATA_FIELDS)
+
+def project_room(project_id):
+    """Room of sockets watching any timer of a project"""
+    return f'project_{project_id}'
+
+def selection_room(project_id):
+    """Room of displays that follow whichever timer a project has selected"""
+    return f'selection_{project_id}'
+
+def selection_payload(project_id, state):
+    """selected_timer_changed payload; timer is the timer_sync payload of the selected timer, or None"""
+    return {'project_id': project_id, 'timer': state.to_sync_dict() if state else None}
+
+def emit_selection_changed(socketio, project_id, state=None):
+    """Push a project's newly selected timer, or None once nothing is selected"""
+    socketio.emit('selected_timer_changed', selection_payload(project_id, state), room=selection_room(project_id))
+
+def record_sent(state, payload=None):
+    """Note a timer_update and timer_sync pushed outside the tick loop, so the loop does not repeat them"""
+    # Timers the loop does not poll yet get their first frame from it
+    if state.id in last_sent:
+        last_sent[state.id] = payload or state.to_dict()
+    # Deadline sockets just got the current end_time; the next drift correction can wait a full interval
+    if not state.paused and (state.id in last_sent or state.id in last_synced):
+        last_synced[state.id] = time.monotonic()
+
+def emit_timer_changed(socketio, state):
+    """Push a timer's new state to both streaming and deadline subscribers"""
+    # Edits can change metadata, so delta subscribers get the full frame too
+    payload = state.to_dict()
+    socketio.emit('timer_update', payload, room=[timer_room(state.id), timer_delta_room(state.id)])
+    socketio.emit('timers_update', {'project_id': state.project_id, 'timers': [payload]},
+                  room=project_timers_room(state.project_id))
+    socketio.emit('timer_sync', state.to_sync_dict(), room=[timer_sync_room(state.id), project_sync_room(state.project_id)])
+    record_sent(state, payload)
+    # Other workers, the leader's tick loop among them, refresh their copy
+    cluster.publish('timer_state', state.to_record())
+
+def emit_timers_changed(socketio, project_id, states):
+    """Push the new states of several timers of one project as a single timers_sync frame"""
+    now = datetime.now()
+    socketio.emit('timers_sync', {
+        'project_id': project_id,
+        'timers': [state.to_sync_dict(now) for state in states]
+    }, room=project_room(project_id))
+    # Streaming clients pick the changes up on the next tick; other workers refresh their copies
+    cluster.publish('timer_states', [state.to_record() for state in states])
+
+def emit_timer_added(socketio, state):
+    """Subscribe sockets that joined the project as a whole to a new timer and push its state"""
+    timer_subscriptions.track(state.id, state.project_id)
+    emit_timer_changed(socketio, state)
+
+def emit_timers_added(socketio, project_id, states):
+    """Subscribe sockets that joined the project as a whole to several new timers and push them in one frame"""
+    for state in states:
+        # Only keep the timers someone here watches; other workers track their own
+        if timer_subscriptions.track(state.id, project_id):
+            timer_states.put(state)
+    emit_timers_changed(socketio, project_id, states)
+
+def emit_timer_removed(socketio, project_id, timer_id):
+    """Tell a project's sockets that a timer was deleted and forget it in every worker"""
+    socketio.emit('timer_removed', {'project_id': project_id, 'timer_id': timer_id}, room=project_room(project_id))
+    discard_timer_state(timer_id)
+
+def discard_timer_state(timer_id):
+    """Forget a deleted timer in this worker and all others"""
+    timer_states.discard(timer_id)
+    cluster.publish('timer_deleted', {'timer_id': timer_id})
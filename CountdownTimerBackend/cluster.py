@@ -0,0 +1,144 @@
+import time
+import socketio
+
+# Worker-to-worker events travel on the Socket.IO message queue as emits to
+# this namespace. No client ever connects to it; ClusterEvents intercepts them.
+CLUSTER_NAMESPACE = '/_cluster'
+
+# Workers re-announce the timers they poll this often, so the leader forgets
+# the timers of a worker that died without saying goodbye
+WATCH_HEARTBEAT_SECONDS = 10
+WATCH_EXPIRY_SECONDS = 3 * WATCH_HEARTBEAT_SECONDS
+
+class ClusterEvents:
+    """Mixin for a python-socketio pub/sub manager that also carries worker-to-worker events"""
+    cluster = None  # Set by Cluster.attach
+
+    def _handle_emit(self, message):
+        if message.get('namespace') == CLUSTER_NAMESPACE:
+            if self.cluster:
+                self.cluster.dispatch(message['event'], message['data'][0])
+        else:
+            super()._handle_emit(message)
+
+class LocalManager(socketio.PubSubManager):
+    """In-process message queue for tests: every manager on a channel acts as one worker"""
+    name = 'local'
+    _channels = {}  # channel -> managers listening on it
+
+    def __init__(self, url='local://', channel='socketio', write_only=False, logger=None, json=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger, json=json)
+        self.queue = None
+
+    def initialize(self):
+        if not self.write_only:
+            self.queue = self.server.eio.create_queue()
+            LocalManager._channels.setdefault(self.channel, []).append(self)
+        super().initialize()
+
+    def _publish(self, data):
+        message = self.json.dumps(data)
+        for manager in LocalManager._channels.get(self.channel, []):
+            manager.queue.put(message)
+
+    def _listen(self):
+        while True:
+            yield self.queue.get()
+
+def create_client_manager(url, channel='flask-socketio'):
+    """Build the Socket.IO client manager for a message queue URL, or None for a single worker"""
+    if not url:
+        return None
+    if url.startswith('local://'):
+        base = LocalManager
+    elif url.startswith(('redis://', 'rediss://')):
+        base = socketio.RedisManager
+    elif url.startswith('kafka://'):
+        base = socketio.KafkaManager
+    elif url.startswith('zmq'):
+        base = socketio.ZmqManager
+    else:
+        base = socketio.KombuManager
+    manager_class = type(f'Cluster{base.__name__}', (ClusterEvents, base), {})
+    return manager_class(url, channel=channel)
+
+class Cluster:
+    """Events shared between the worker processes behind one message queue.
+
+    Without a message queue the backend runs as a single worker and publishing
+    is a no-op. With one, workers tell each other about timer state changes and
+    permission changes, and announce the timers they have subscribers for, so
+    the leader's tick loop covers every worker's clients.
+    """
+
+    def __init__(self):
+        self.manager = None
+        self._handlers = {}
+        self._watched = {}  # host_id -> (monotonic time announced, set of timer ids)
+        self._announced = None
+        self._announced_at = 0
+        self.on('timers_watched', self._remember_watched)
+
+    def attach(self, server):
+        """Use the message queue of a python-socketio server, if it has one"""
+        manager = server.manager
+        if not isinstance(manager, ClusterEvents):
+            return
+        self.manager = manager
+        manager.cluster = self
+        if not server.manager_initialized:
+            # Normally done on the first client connection; a worker needs to
+            # hear from the others before that
+            server.manager_initialized = True
+            manager.initialize()
+
+    @property
+    def enabled(self):
+        return self.manager is not None
+
+    def on(self, event, handler=None):
+        """Register a handler for an event published by another worker"""
+        def register(handler):
+            self._handlers[event] = handler
+            return handler
+        return register(handler) if handler else register
+
+    def publish(self, event, data):
+        """Send an event to every other worker; data must be JSON serializable"""
+        if not self.manager:
+            return
+        self.manager._publish({'method': 'emit', 'event': event, 'data': [data],
+                               'namespace': CLUSTER_NAMESPACE, 'host_id': self.manager.host_id})
+
+    def dispatch(self, event, data):
+        handler = self._handlers.get(event)
+        if handler:
+            handler(data)
+
+    def announce_watched(self, timer_ids):
+        """Tell the leader which timers this worker polls, on change and as a heartbeat"""
+        if not self.manager:
+            return
+        timer_ids = set(timer_ids)
+        now = time.monotonic()
+        if timer_ids == self._announced and now - self._announced_at < WATCH_HEARTBEAT_SECONDS:
+            return
+        self._announced = timer_ids
+        self._announced_at = now
+        self.publish('timers_watched', {'host_id': self.manager.host_id, 'timer_ids': sorted(timer_ids)})
+
+    def _remember_watched(self, data):
+        self._watched[data['host_id']] = (time.monotonic(), set(data['timer_ids']))
+
+    def remote_watched(self):
+        """Timers other workers currently have subscribers for"""
+        now = time.monotonic()
+        watched = set()
+        for host_id, (announced_at, timer_ids) in list(self._watched.items()):
+            if now - announced_at > WATCH_EXPIRY_SECONDS:
+                del self._watched[host_id]
+            else:
+                watched |= timer_ids
+        return watched
+
+cluster = Cluster()
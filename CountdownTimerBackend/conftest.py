@@ -0,0 +1,69 @@
+"""
+Shared fixtures for the test scripts that run the app against an in-memory SQLite database.
+"""
+
+import sys
+import os
+from datetime import timedelta
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def app(monkeypatch):
+    """An app bound to a fresh in-memory SQLite database, never the configured one"""
+    monkeypatch.setenv('DATABASE_URL', 'sqlite://')
+    from main import create_app
+    return create_app()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def admin_headers(client):
+    """Authorization headers for the default admin"""
+    token = client.post('/api/auth/login', json={
+        'username': os.getenv('DEFAULT_ADMIN_USERNAME', 'admin'),
+        'password': os.getenv('DEFAULT_ADMIN_PASSWORD', 'admin123')
+    }).get_json()['token']
+    return {'Authorization': f'Bearer {token}'}
+
+@pytest.fixture
+def make_project(client, admin_headers):
+    """Create a project as the default admin with the given timers; returns (project_id, timer_ids).
+
+    Each timer is the JSON body of its create request. New timers are paused
+    unless start is set.
+    """
+    def make(name, timers=(), start=False):
+        project_id = client.post('/api/projects', json={'name': name}, headers=admin_headers).get_json()['id']
+        timer_ids = []
+        for timer in timers:
+            timer_id = client.post(f'/api/projects/{project_id}/timers', json=timer,
+                                   headers=admin_headers).get_json()['id']
+            if start:
+                client.post(f'/api/projects/{project_id}/timers/{timer_id}/start', headers=admin_headers)
+            timer_ids.append(timer_id)
+        return project_id, timer_ids
+    return make
+
+@pytest.fixture
+def tick(app, monkeypatch):
+    """Run the timer loop by hand: tick(seconds) moves every watched running timer that much closer
+    to its deadline, then sends one tick's frames.
+
+    The background loops stand by while the test runs, so every frame comes from these calls.
+    """
+    import main
+    monkeypatch.setattr(main.leader, 'is_leader', False)
+
+    def run(seconds=0):
+        for timer_id in list(main.active_timers):
+            state = main.timer_states.get(timer_id)
+            if seconds and state and not state.paused:
+                state.end_time -= timedelta(seconds=seconds)
+        with app.app_context():
+            main.send_timer_updates()
+    return run
@@ -0,0 +1,44 @@
+import hashlib
+from datetime import datetime
+from flask import request, make_response
+from sqlalchemy import select
+from database import db
+from models import Project
+from timer_state import to_epoch_ms
+
+# Sent on 200 and 304 alike. A client reusing a cached body after a 304
+# should take the server clock from here, not from the stale server_time_ms
+SERVER_TIME_HEADER = 'X-Server-Time-Ms'
+
+def project_etag(project_id):
+    """Strong ETag for everything served about one project, or None if it does not exist"""
+    version = db.session.execute(select(Project.version).where(Project.id == project_id)).scalar()
+    if version is None:
+        return None
+    return f'p{project_id}-v{version}'
+
+def projects_etag():
+    """Strong ETag for the project list: covers every project's version, and additions and deletions"""
+    digest = hashlib.sha1()
+    for project_id, version in db.session.execute(select(Project.id, Project.version).order_by(Project.id)):
+        digest.update(f'{project_id}:{version},'.encode())
+    return f'projects-{digest.hexdigest()[:16]}'
+
+def conditional(etag, build):
+    """Answer 304 if the client already has etag, otherwise build() the response and tag it.
+
+    Timers in a body run on between versions, so the ETag stands for their
+    schedule (end_time_ms), not for the seconds left at the time it was built.
+    The ETag is read before the body: a change in between only makes the tag
+    older than the body, which costs the next request a 200, never a stale 304.
+    """
+    if etag is not None and etag in request.if_none_match:
+        response = make_response('', 304)
+    else:
+        response = make_response(build())
+    if etag is not None and response.status_code in (200, 304):
+        response.set_etag(etag)
+        # Caches may keep the body but must ask again before every reuse
+        response.headers['Cache-Control'] = 'no-cache'
+    response.headers[SERVER_TIME_HEADER] = str(to_epoch_ms(datetime.now()))
+    return response
@@ -0,0 +1,93 @@
+import heapq
+import time
+from threading import Event, Lock
+
+class ExpiryScheduler:
+    """Min-heap of running timers keyed on their end_time.
+
+    The expiry task sleeps until the earliest deadline instead of polling every
+    timer on each tick. Rescheduled or paused timers leave stale heap entries
+    behind; they are skipped when they reach the top and compacted when they
+    pile up.
+    """
+
+    def __init__(self):
+        self._heap = []  # (deadline as epoch seconds, timer_id)
+        self._deadlines = {}  # timer_id -> current deadline
+        self._lock = Lock()
+        self._wakeup = Event()
+
+    def use_event(self, event):
+        """Wake the expiry task with an event of the Socket.IO async mode"""
+        self._wakeup = event
+
+    def update(self, state):
+        """Schedule a running timer's end_time, or cancel a paused timer"""
+        if state.paused:
+            self.cancel(state.id)
+        else:
+            self.schedule(state.id, state.end_time)
+
+    def schedule(self, timer_id, end_time):
+        deadline = end_time.timestamp()
+        with self._lock:
+            if self._deadlines.get(timer_id) == deadline:
+                return
+            self._deadlines[timer_id] = deadline
+            heapq.heappush(self._heap, (deadline, timer_id))
+            if len(self._heap) > 2 * len(self._deadlines) + 64:
+                self._heap = [(d, t) for t, d in self._deadlines.items()]
+                heapq.heapify(self._heap)
+            earliest = self._heap[0] == (deadline, timer_id)
+        if earliest:
+            # The expiry task may be sleeping towards a later deadline
+            self._wakeup.set()
+
+    def clear(self):
+        """Unschedule every timer"""
+        with self._lock:
+            self._heap.clear()
+            self._deadlines.clear()
+
+    def cancel(self, timer_id):
+        with self._lock:
+            self._deadlines.pop(timer_id, None)
+
+    def _drop_stale(self):
+        while self._heap and self._deadlines.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def next_delay(self, now=None):
+        """Seconds until the earliest deadline, or None if no timer is running"""
+        with self._lock:
+            self._drop_stale()
+            if not self._heap:
+                return None
+            return max(self._heap[0][0] - (now or time.time()), 0)
+
+    def pop_due(self, now=None):
+        """Return and unschedule the timers whose deadline has passed"""
+        now = now or time.time()
+        due = []
+        with self._lock:
+            self._drop_stale()
+            while self._heap and self._heap[0][0] <= now:
+                deadline, timer_id = heapq.heappop(self._heap)
+                del self._deadlines[timer_id]
+                due.append(timer_id)
+                self._drop_stale()
+        return due
+
+    def wait(self):
+        """Block until the earliest deadline or until an earlier one is scheduled"""
+        self._wakeup.clear()
+        self._wakeup.wait(self.next_delay())
+
+    def __contains__(self, timer_id):
+        return timer_id in self._deadlines
+
+    def __len__(self):
+        return len(self._deadlines)
+
+# Shared scheduler, fed by timer_states.load
+timer_expiry = ExpiryScheduler()
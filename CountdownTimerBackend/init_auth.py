@@ -17,7 +17,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from flask import Flask
 from database import db
 from auth import User, AuthManager
-import sqlalchemy
+from migrations import migrate, LATEST_VERSION
 
 def create_app():
     """Create Flask app for database operations"""
@@ -48,45 +48,10 @@ def init_database():
     with app.app_context():
         print("Initializing database...")
         
-        # Create all tables
-        db.create_all()
-        print("✓ Database tables created")
-        
-        # Check and add missing columns (for existing installations)
-        insp = sqlalchemy.inspect(db.engine)
-        
-        # add description to projects if missing
-        cols = [c['name'] for c in insp.get_columns('projects')]
-        if 'description' not in cols:
-            with db.engine.begin() as conn:
-                conn.execute(sqlalchemy.text("ALTER TABLE projects ADD COLUMN description TEXT"))
-            print("✓ Added description column to projects table")
-
-        # add name to timers if missing
-        cols = [c['name'] for c in insp.get_columns('timers')]
-        if 'name' not in cols:
-            with db.engine.begin() as conn:
-                conn.execute(sqlalchemy.text("ALTER TABLE timers ADD COLUMN name TEXT NOT NULL DEFAULT ''"))
-            print("✓ Added name column to timers table")
-
-        # add paused to timers if missing
-        cols = [c['name'] for c in insp.get_columns('timers')]
-        if 'paused' not in cols:
-            with db.engine.begin() as conn:
-                conn.execute(sqlalchemy.text("ALTER TABLE timers ADD COLUMN paused BOOLEAN NOT NULL DEFAULT 1"))
-            print("✓ Added paused column to timers table")        # add selected_timer_id to projects if missing
-        cols = [c['name'] for c in insp.get_columns('projects')]
-        if 'selected_timer_id' not in cols:
-            with db.engine.begin() as conn:
-                conn.execute(sqlalchemy.text("ALTER TABLE projects ADD COLUMN selected_timer_id INTEGER"))
-            print("✓ Added selected_timer_id column to projects table")
-
-        # add authorised_projects to users if missing
-        cols = [c['name'] for c in insp.get_columns('users')]
-        if 'authorised_projects' not in cols:
-            with db.engine.begin() as conn:
-                conn.execute(sqlalchemy.text("ALTER TABLE users ADD COLUMN authorised_projects TEXT"))
-            print("✓ Added authorised_projects column to users table")
+        # Create tables and apply pending schema migrations
+        applied = migrate(db, log=lambda message: print(f"✓ {message}"))
+        if not applied:
+            print(f"✓ Database schema is up to date (version {LATEST_VERSION})")
 
         # Create default admin user if no users exist
         if User.query.count() == 0:
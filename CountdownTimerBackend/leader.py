@@ -0,0 +1,84 @@
+import os
+import tempfile
+import zlib
+import sqlalchemy
+
+try:
+    import fcntl
+except ImportError:  # Windows: no file locks, single worker only
+    fcntl = None
+
+class LeaderLock:
+    """Cluster-wide lock that elects the one worker running the timer loops.
+
+    On PostgreSQL this is a session advisory lock held on a dedicated connection,
+    so it is released as soon as the leader's process or connection dies. Other
+    databases can only be shared by workers on one host; there an exclusive
+    lock on a file in lock_dir (the system temp dir by default) plays the same role.
+    """
+
+    def __init__(self, name='countdown-timer-loops', lock_dir=None):
+        self.name = name
+        self.lock_dir = lock_dir or tempfile.gettempdir()
+        self.key = zlib.crc32(name.encode('utf-8'))
+        self.is_leader = False
+        self._conn = None
+        self._file = None
+
+    def try_acquire(self, engine):
+        """Become the leader if no other worker is; returns is_leader"""
+        if self.is_leader:
+            return True
+        if engine.dialect.name == 'postgresql':
+            conn = engine.connect()
+            acquired = conn.execute(sqlalchemy.text("SELECT pg_try_advisory_lock(:key)"), {'key': self.key}).scalar()
+            # The lock belongs to the session; don't sit idle in a transaction
+            conn.commit()
+            if acquired:
+                self._conn = conn
+            else:
+                conn.close()
+            self.is_leader = bool(acquired)
+        elif fcntl is None or engine.url.database in (None, '', ':memory:'):
+            # An in-memory database cannot be shared between processes anyway
+            self.is_leader = True
+        else:
+            url_key = zlib.crc32(str(engine.url).encode('utf-8'))
+            path = os.path.join(self.lock_dir, f'{self.name}-{url_key:08x}.lock')
+            lock_file = open(path, 'a')
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return False
+            self._file = lock_file
+            self.is_leader = True
+        return self.is_leader
+
+    def lead(self):
+        """Run the timer loops without an election, for a single worker without a message queue"""
+        self.is_leader = True
+
+    def check(self):
+        """Confirm the advisory lock's connection is still alive, stepping down if not"""
+        if not self.is_leader or self._conn is None:
+            return self.is_leader
+        try:
+            self._conn.execute(sqlalchemy.text("SELECT 1"))
+            self._conn.commit()
+        except sqlalchemy.exc.DBAPIError:
+            self.release()
+        return self.is_leader
+
+    def release(self):
+        if self._conn is not None:
+            # Discard the connection rather than pooling it, which ends the
+            # session and with it the advisory lock
+            self._conn.invalidate()
+            self._conn = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.is_leader = False
+
+leader = LeaderLock()
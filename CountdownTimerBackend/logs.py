@@ -0,0 +1,99 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+from datetime import datetime, timezone
+
+# Every backend logger lives under this one, e.g. countdown.routes
+LOGGER_NAME = 'countdown'
+
+# Attributes every LogRecord has; anything else came in through extra= and is a field
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+class StructuredFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger and message, plus the fields passed with extra="""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """Let through a fraction of the records at or below a level, and every record above it"""
+
+    def __init__(self, rate, level=logging.DEBUG):
+        super().__init__()
+        self.rate = rate
+        self.level = level
+
+    def filter(self, record):
+        return record.levelno > self.level or self.rate >= 1 or random.random() < self.rate
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Render the message and traceback now, while the arguments are still
+        # current, but keep the extra= fields on the record for the formatter
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+_listener = None
+
+def configure_logging(level=None, sample_rate=None, stream=None):
+    """Send the backend's log records through a queue to a JSON lines handler.
+
+    Request handlers and timer loops only put records on the queue; a
+    listener thread formats and writes them. The level comes from LOG_LEVEL
+    (default INFO); LOG_DEBUG_SAMPLE_RATE (default 1) keeps that fraction of
+    debug records.
+    """
+    global _listener
+    level = level or os.getenv('LOG_LEVEL', 'INFO').upper()
+    if sample_rate is None:
+        sample_rate = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', '1'))
+
+    if _listener is None:
+        atexit.register(lambda: _listener and _listener.stop())
+    else:
+        # create_app() may run more than once in a process, e.g. in the tests
+        _listener.stop()
+
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(StructuredFormatter())
+    records = queue.SimpleQueue()
+    queue_handler = _QueueHandler(records)
+    queue_handler.addFilter(SamplingFilter(sample_rate))
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.handlers[:] = [queue_handler]
+    logger.setLevel(level)
+    logger.propagate = False
+    _listener = logging.handlers.QueueListener(records, handler)
+    _listener.start()
+    return logger
+
+def flush_logs():
+    """Wait until every queued record has been written"""
+    if _listener is not None:
+        _listener.stop()
+        _listener.start()
+
+def get_logger(name):
+    """Logger for one backend module; records go wherever configure_logging sends them"""
+    return logging.getLogger(f'{LOGGER_NAME}.{name}')
@@ -1,9 +1,24 @@
 from flask import Flask, request, jsonify
-from flask_socketio import SocketIO
+from flask_socketio import SocketIO, join_room, leave_room
 from database import db
 from routes import create_routes
-from auth import User, AuthManager
-import os, sqlalchemy, time
+from auth import User, AuthManager, invalidate_project_access
+from password_hashing import password_hasher, PasswordHasherBusy
+from timer_state import TimerState, timer_states
+from migrations import ensure_schema
+from broadcast import (SYNC_INTERVAL_SECONDS, timer_room, timer_sync_room, timer_delta_room, project_room,
+                       project_timers_room, project_sync_room, selection_room, selection_payload,
+                       emit_timer_changed, record_sent, delta_frame, metadata_changed, last_sent, last_synced)
+from expiry import timer_expiry
+from subscriptions import timer_subscriptions
+from cluster import cluster, create_client_manager
+from leader import leader
+from response_cache import response_cache
+from json_provider import FastJSONProvider, socket_json
+from logs import configure_logging, get_logger
+from sqlalchemy.orm import joinedload
+from datetime import datetime
+import os, time
 from threading import Lock
 from dotenv import load_dotenv
 
@@ -11,46 +26,186 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Initialize SocketIO but don't create routes yet
-socketio = SocketIO(cors_allowed_origins="*")
+# Socket.IO packets use the same fast JSON encoder as the API responses
+socketio = SocketIO(cors_allowed_origins="*", json=socket_json)
 thread = None
+expiry_thread = None
+leader_thread = None
 thread_lock = Lock()
-active_timers = set()  # Just track which timers are active
+active_timers = set()  # Timers the tick loop polls: watched ones, plus recently watched until evicted
+LEADER_RETRY_SECONDS = 5  # How quickly a standby worker takes over the timer loops
+logger = get_logger('main')
+
+def forget_timer(timer_id):
+    """Stop polling a timer that was deleted or that nobody watches any more"""
+    timer_states.discard(timer_id)
+    active_timers.discard(timer_id)
+    last_sent.pop(timer_id, None)
+    last_synced.pop(timer_id, None)
+    timer_subscriptions.drop_timer(timer_id)
+
+def reset_timer_state():
+    """Forget every loaded, watched and scheduled timer, e.g. before serving another database"""
+    active_timers.clear()
+    last_sent.clear()
+    last_synced.clear()
+    timer_states.clear()
+    timer_subscriptions.clear()
+    timer_expiry.clear()
+
+def evict_idle_timers():
+    """Stop polling timers whose last subscriber left a while ago, or that were deleted"""
+    for timer_id in timer_subscriptions.pop_idle():
+        forget_timer(timer_id)
+    # Joined timers always have a state; a missing one was deleted here or in another worker
+    for timer_id in [t for t in active_timers if t not in timer_states]:
+        forget_timer(timer_id)
+
+def send_timer_updates():
+    """Send timer frames for every timer watched by any worker's clients"""
+    from models import Timer
+    polled = active_timers | cluster.remote_watched()
+
+    # Timers other workers stopped watching
+    for timer_id in last_sent.keys() - polled:
+        forget_timer(timer_id)
+
+    # project_id -> changed timer_update payloads, sent as one timers_update frame
+    changed = {}
+
+    # Update all polled timers from the in-memory state store
+    for timer_id in polled:
+        try:
+            state = timer_states.get(timer_id)
+            if state is None:
+                # Only another worker's clients watch it; load it here once
+                timer = db.session.get(Timer, timer_id)
+                if not timer:
+                    continue
+                state = timer_states.load(timer)
+
+            # Deadline clients count down locally; expiry_task sends them the final
+            # paused state, here they only get an occasional drift correction
+            now = time.monotonic()
+            if not state.paused and now - last_synced.get(timer_id, 0) >= SYNC_INTERVAL_SECONDS:
+                socketio.emit('timer_sync', state.to_sync_dict(),
+                              room=[timer_sync_room(timer_id), project_sync_room(state.project_id)])
+                last_synced[timer_id] = now
+
+            current_state = state.to_dict()
+
+            # Skip unchanged frames: running timers change once per second,
+            # paused timers only when they are edited or resumed
+            previous = last_sent.get(timer_id)
+            if previous == current_state:
+                continue
+
+            # Only sockets that joined this timer receive the update
+            socketio.emit('timer_update', current_state, room=timer_room(timer_id))
+            # Delta subscribers got the metadata on join; repeat it only when it changed
+            if previous is not None and metadata_changed(previous, current_state):
+                socketio.emit('timer_update', current_state, room=timer_delta_room(timer_id))
+            else:
+                socketio.emit('timer_delta', delta_frame(current_state), room=timer_delta_room(timer_id))
+            changed.setdefault(state.project_id, []).append(current_state)
+            last_sent[timer_id] = current_state
+        except Exception:
+            logger.exception('Timer update failed', extra={'timer_id': timer_id})
+
+    # Batch subscribers get every changed timer of a project in one frame per tick
+    for project_id, timers in changed.items():
+        socketio.emit('timers_update', {'project_id': project_id, 'timers': timers},
+                      room=project_timers_room(project_id))
 
 def background_task():
-    """Background task that sends timer updates every second"""
+    """Background task that sends timer updates whenever a timer's displayed state changes"""
+    while True:
+        with app.app_context():
+            evict_idle_timers()
+            # Timers subscribed since the last tick, e.g. new ones of a project joined with join_project
+            active_timers.update(timer_subscriptions.timer_ids())
+            # Every worker reports its clients' timers; only the leader sends frames
+            cluster.announce_watched(active_timers)
+            if leader.is_leader:
+                send_timer_updates()
+        socketio.sleep(0.25)
+
+def expire_timer(timer_id):
+    """Pause a timer that reached zero and push its final state"""
+    from models import Timer
+    timer = db.session.get(Timer, timer_id)
+    # The timer may have been deleted, or its id reused by a new timer
+    if not timer or timer.paused or timer.remaining() > 0:
+        return
+    timer.pause()
+    state = timer_states.load(timer)
+    emit_timer_changed(socketio, state)
+
+def expiry_task():
+    """Background task that sleeps until the next timer deadline and auto-pauses it at zero"""
     while True:
+        if not leader.is_leader:
+            # Standby workers keep their schedule current but leave expiry to the leader
+            socketio.sleep(LEADER_RETRY_SECONDS)
+            continue
+        timer_expiry.wait()
         with app.app_context():
-            # Update all active timers
-            from models import Timer
-            for timer_id in list(active_timers):
+            for timer_id in timer_expiry.pop_due():
                 try:
-                    timer = db.session.get(Timer, timer_id)
-                    if timer:
-                        remaining_time = timer.remaining()
-                        
-                        # Auto-pause timer when it reaches zero
-                        if remaining_time <= 0 and not timer.paused:
-                            timer.pause()
-                            # print(f"Timer {timer.name} (ID: {timer.id}) has finished and been paused.")
-                        
-                        current_state = {
-                            'id': timer.id,
-                            'name': timer.name,
-                            'remaining_seconds': remaining_time,
-                            'paused': timer.paused,
-                            'duration': timer.duration,
-                            'description': timer.description,
-                            'project_id': timer.project_id
-                        }
-                        # Broadcast to all clients
-                        socketio.emit('timer_update', current_state)
-                except Exception as e:
-                    print(f"Error updating timer {timer_id}: {e}")
-            socketio.sleep(0.25)
-                
+                    expire_timer(timer_id)
+                except Exception:
+                    db.session.rollback()
+                    logger.exception('Timer expiry failed', extra={'timer_id': timer_id})
+
+def leader_task():
+    """Background task that lets a standby worker take over the timer loops when the leader dies"""
+    while True:
+        socketio.sleep(LEADER_RETRY_SECONDS)
+        with app.app_context():
+            if leader.is_leader:
+                if not leader.check():
+                    logger.warning('Lost the timer loop leader lock')
+            elif leader.try_acquire(db.engine):
+                logger.info('This worker now runs the timer loops')
+
+@cluster.on('timer_state')
+def apply_remote_timer_state(record):
+    """Another worker changed a timer and pushed it to every socket"""
+    record_sent(store_remote_state(record))
+
+@cluster.on('timer_states')
+def apply_remote_timer_states(records):
+    """Another worker changed several timers at once"""
+    # Only deadline sockets got these; streaming ones pick them up on the next tick
+    for record in records:
+        store_remote_state(record)
+
+def store_remote_state(record):
+    """Keep the state of a timer another worker changed, if a socket here watches it"""
+    state = TimerState.from_record(record)
+    if state.id in timer_states:
+        timer_states.put(state)
+    elif timer_subscriptions.track(state.id, state.project_id):
+        # A new timer of a project that sockets here joined as a whole
+        timer_states.put(state)
+    else:
+        # Not polled here, but this worker may become the leader and has to expire it
+        timer_expiry.update(state)
+    return state
+
+@cluster.on('timer_deleted')
+def apply_remote_timer_deletion(data):
+    timer_states.discard(data['timer_id'])
+
+@cluster.on('project_access_invalidated')
+def apply_remote_access_invalidation(data):
+    invalidate_project_access(data['user_id'], data['project_id'], propagate=False)
+
 def create_app():
     global app
+    configure_logging()
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     
     # PostgreSQL database configuration
     # You can set these environment variables or modify directly
@@ -69,9 +224,23 @@ def create_app():
     
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+    # Resolve the JWT signing key once instead of on every token operation
+    AuthManager.load_jwt_secret()
+
 
     db.init_app(app)
-    socketio.init_app(app)
+    # Cached read responses and timer state came from whatever database the last app used
+    response_cache.clear()
+    reset_timer_state()
+    # Several workers share Socket.IO rooms, and talk to each other, through a message queue
+    message_queue = os.getenv('SOCKETIO_MESSAGE_QUEUE')
+    if message_queue:
+        socketio.init_app(app, client_manager=create_client_manager(message_queue))
+    else:
+        socketio.init_app(app)
+    cluster.attach(socketio.server)
+    # bcrypt runs in native threads so logins cannot stall the timer loop
+    password_hasher.configure(socketio.async_mode)
 
     # Add error handlers for API responses
     @app.errorhandler(404)
@@ -96,44 +265,50 @@ def create_app():
             'error': 'Internal Server Error',
             'message': 'An unexpected error occurred',
             'code': 500
-        }), 500    # Start background timer task
-    global thread
+        }), 500
+
+    @app.errorhandler(PasswordHasherBusy)
+    def password_hasher_busy(error):
+        response = jsonify({
+            'error': 'Service Unavailable',
+            'message': 'Too many sign-ins in progress, please try again shortly',
+            'code': 503
+        })
+        response.headers['Retry-After'] = '1'
+        return response, 503
+
+    # Exactly one worker in the cluster runs the timer loops; the others stand by.
+    # A single worker always leads; it must not take the lock, which the
+    # debug reloader's parent process would then hold instead of the server.
+    if message_queue:
+        with app.app_context():
+            leader.try_acquire(db.engine)
+    else:
+        leader.lead()
+
+    # Start background timer tasks
+    global thread, expiry_thread, leader_thread
     with thread_lock:
         if thread is None:
             thread = socketio.start_background_task(background_task)
+        if expiry_thread is None:
+            # Lets a newly started timer wake the expiry task before its current deadline
+            timer_expiry.use_event(socketio.server.eio.create_event())
+            expiry_thread = socketio.start_background_task(expiry_task)
+        if leader_thread is None:
+            leader_thread = socketio.start_background_task(leader_task)
             
     with app.app_context():
-        # Database setup remains the same
-        db.create_all()
-        insp = sqlalchemy.inspect(db.engine)
-
-        # add description to projects if missing
-        cols = [c['name'] for c in insp.get_columns('projects')]
-        if 'description' not in cols:
-            with db.engine.begin() as conn:
-                conn.execute(sqlalchemy.text("ALTER TABLE projects ADD COLUMN description TEXT"))
-
-        # add name to timers if missing
-        cols = [c['name'] for c in insp.get_columns('timers')]
-        if 'name' not in cols:
-            with db.engine.begin() as conn:
-                conn.execute(sqlalchemy.text("ALTER TABLE timers ADD COLUMN name TEXT NOT NULL DEFAULT ''"))        
-        
-        # add paused to timers if missing
-        cols = [c['name'] for c in insp.get_columns('timers')]
-        if 'paused' not in cols:
-            with db.engine.begin() as conn:
-                conn.execute(sqlalchemy.text("ALTER TABLE timers ADD COLUMN paused BOOLEAN NOT NULL DEFAULT 1"))        # add selected_timer_id to projects if missing
-        cols = [c['name'] for c in insp.get_columns('projects')]
-        if 'selected_timer_id' not in cols:
-            with db.engine.begin() as conn:
-                conn.execute(sqlalchemy.text("ALTER TABLE projects ADD COLUMN selected_timer_id INTEGER"))
-
-        # add authorised_projects to users if missing
-        cols = [c['name'] for c in insp.get_columns('users')]
-        if 'authorised_projects' not in cols:
-            with db.engine.begin() as conn:
-                conn.execute(sqlalchemy.text("ALTER TABLE users ADD COLUMN authorised_projects TEXT"))        # Create default admin user if no users exist
+        # Single schema-version check; numbered migrations only run when the database is behind
+        ensure_schema(db)
+
+        # Schedule expiry for timers that were running when the server stopped,
+        # including ones that ran out in the meantime
+        from models import Timer
+        for timer in Timer.query.filter_by(paused=False):
+            timer_states.load(timer)
+
+        # Create default admin user if no users exist
         if User.query.count() == 0:
             default_admin_username = os.getenv('DEFAULT_ADMIN_USERNAME', 'admin')
             default_admin_password = os.getenv('DEFAULT_ADMIN_PASSWORD', 'admin123')
@@ -145,11 +320,10 @@ def create_app():
             )
             
             if admin_user:
-                print(f"Created default admin user: {default_admin_username}")
-                print(f"Default password: {default_admin_password}")
-                print("IMPORTANT: Change the default password immediately!")
+                logger.warning('Created default admin user; change the default password immediately',
+                               extra={'username': default_admin_username})
             else:
-                print(f"Failed to create default admin user: {message}")
+                logger.error('Failed to create default admin user', extra={'reason': message})
 
     # Create and register the blueprint with routes
     bp = create_routes(socketio)
@@ -194,32 +368,227 @@ def handle_join_timer(data):
         }, room=request.sid)
         return
 
-    # Add timer to active timers
+    # Clients joining with sync='deadline' count down locally from end_time and
+    # only receive timer_sync events instead of a timer_update every second.
+    # With sync='delta' they get the full timer_update below once, then a
+    # compact timer_delta record every second. With sync='batch' they get
+    # one timers_update per tick for all changed timers of the project.
+    sync = data.get('sync')
+    deadline_sync = sync == 'deadline'
+    if deadline_sync:
+        room = timer_sync_room(timer.id)
+    elif sync == 'delta':
+        room = timer_delta_room(timer.id)
+    elif sync == 'batch':
+        room = project_timers_room(project.id)
+    else:
+        room = timer_room(timer.id)
+
+    # Subscribe this socket to the timer and its project
+    join_room(room)
+    join_room(project_room(project.id))
+    timer_subscriptions.subscribe(request.sid, timer.id, project.id)
+
+    # Poll the timer while at least one socket watches it
     active_timers.add(timer.id)
     
     # Send initial state
-    current_state = {
-        'id': timer.id,
-        'name': timer.name,
-        'remaining_seconds': timer.remaining(),
-        'paused': timer.paused,
-        'duration': timer.duration,
-        'description': timer.description,
-        'project_id': timer.project_id,
-    }
-    socketio.emit('timer_update', current_state, room=request.sid)
+    state = timer_states.load(timer)
+    if deadline_sync:
+        socketio.emit('timer_sync', state.to_sync_dict(), room=request.sid)
+        # Other deadline sockets of the timer keep their drift correction schedule
+        last_synced.setdefault(timer.id, time.monotonic())
+    elif sync == 'batch':
+        socketio.emit('timers_update', {'project_id': project.id, 'timers': [state.to_dict()]}, room=request.sid)
+    else:
+        payload = state.to_dict()
+        socketio.emit('timer_update', payload, room=request.sid)
+        # The first socket of a timer already has this frame; the next tick need not repeat it
+        last_sent.setdefault(timer.id, payload)
+
+@socketio.on('join_project')
+def handle_join_project(data):
+    """Subscribe a socket to every timer of a project, including ones created later"""
+    from models import Project
+    if not data or not isinstance(data, dict):
+        socketio.emit('error', {
+            'code': 400,
+            'message': 'Invalid request data'
+        }, room=request.sid)
+        return
+
+    try:
+        project_id = int(data.get('project_id'))
+    except (ValueError, TypeError):
+        socketio.emit('error', {
+            'code': 400,
+            'message': 'Missing or invalid project_id'
+        }, room=request.sid)
+        return
+
+    # sync='deadline' gets timer_sync events like join_timer; otherwise the
+    # socket streams one timers_update per tick like join_timer sync='batch'
+    sync = data.get('sync', 'batch')
+    if sync not in ('deadline', 'batch'):
+        socketio.emit('error', {
+            'code': 400,
+            'message': "sync must be 'deadline' or 'batch'"
+        }, room=request.sid)
+        return
+
+    # The project and all of its timers in one query
+    project = Project.query.options(joinedload(Project.timers)).filter_by(id=project_id).first()
+    if not project:
+        socketio.emit('error', {
+            'code': 404,
+            'message': f'Project with id {project_id} not found'
+        }, room=request.sid)
+        return
+
+    states = [timer_states.load(timer) for timer in project.timers]
+    join_room(project_room(project.id))
+    join_room(project_sync_room(project.id) if sync == 'deadline' else project_timers_room(project.id))
+    timer_subscriptions.subscribe_project(request.sid, project.id, [state.id for state in states])
+    active_timers.update(state.id for state in states)
+
+    # One snapshot of every timer instead of a frame per timer
+    if sync == 'deadline':
+        now = datetime.now()
+        socketio.emit('timers_sync', {
+            'project_id': project.id,
+            'timers': [state.to_sync_dict(now) for state in states]
+        }, room=request.sid)
+        synced = time.monotonic()
+        for state in states:
+            last_synced.setdefault(state.id, synced)
+    else:
+        socketio.emit('timers_update', {
+            'project_id': project.id,
+            'timers': [state.to_dict() for state in states]
+        }, room=request.sid)
+
+@socketio.on('leave_project')
+def handle_leave_project(data):
+    if not data or not isinstance(data, dict):
+        socketio.emit('error', {
+            'code': 400,
+            'message': 'Invalid request data'
+        }, room=request.sid)
+        return
+
+    try:
+        project_id = int(data.get('project_id'))
+    except (ValueError, TypeError):
+        socketio.emit('error', {
+            'code': 400,
+            'message': 'Missing or invalid project_id'
+        }, room=request.sid)
+        return
+
+    timer_subscriptions.unsubscribe_project(request.sid, project_id)
+    leave_room(project_sync_room(project_id))
+
+    # Stay in the project rooms while single timers of that project are joined
+    if project_id not in timer_subscriptions.project_ids(request.sid):
+        leave_room(project_room(project_id))
+        leave_room(project_timers_room(project_id))
+
+@socketio.on('join_selection')
+def handle_join_selection(data):
+    """Follow a project's selected timer: selected_timer_changed now and whenever the selection changes"""
+    from models import Project
+    if not data or not isinstance(data, dict):
+        socketio.emit('error', {
+            'code': 400,
+            'message': 'Invalid request data'
+        }, room=request.sid)
+        return
+
+    try:
+        project_id = int(data.get('project_id'))
+    except (ValueError, TypeError):
+        socketio.emit('error', {
+            'code': 400,
+            'message': 'Missing or invalid project_id'
+        }, room=request.sid)
+        return
+
+    project = db.session.get(Project, project_id)
+    if not project:
+        socketio.emit('error', {
+            'code': 404,
+            'message': f'Project with id {project_id} not found'
+        }, room=request.sid)
+        return
+
+    join_room(selection_room(project.id))
+    # The selected timer's countdown still comes from join_timer; this only says which one it is
+    timer = project.selected_timer
+    state = timer_states.load(timer) if timer else None
+    socketio.emit('selected_timer_changed', selection_payload(project.id, state), room=request.sid)
+
+@socketio.on('leave_selection')
+def handle_leave_selection(data):
+    if not data or not isinstance(data, dict):
+        socketio.emit('error', {
+            'code': 400,
+            'message': 'Invalid request data'
+        }, room=request.sid)
+        return
+
+    try:
+        project_id = int(data.get('project_id'))
+    except (ValueError, TypeError):
+        socketio.emit('error', {
+            'code': 400,
+            'message': 'Missing or invalid project_id'
+        }, room=request.sid)
+        return
+
+    leave_room(selection_room(project_id))
 
 @socketio.on_error_default
 def default_error_handler(e):
     """Handle any unhandled errors in WebSocket connections"""
-    print(f"WebSocket error: {e}")
+    logger.exception('WebSocket handler failed')
     socketio.emit('error', {
         'code': 500,
         'message': 'An unexpected error occurred'
     }, room=request.sid)
 
-# We don't need to handle disconnect for individual timers
-# All timers remain active as long as the application is running
+@socketio.on('leave_timer')
+def handle_leave_timer(data):
+    if not data or not isinstance(data, dict):
+        socketio.emit('error', {
+            'code': 400,
+            'message': 'Invalid request data'
+        }, room=request.sid)
+        return
+
+    try:
+        timer_id = int(data.get('timer_id'))
+    except (ValueError, TypeError):
+        socketio.emit('error', {
+            'code': 400,
+            'message': 'Missing or invalid timer_id'
+        }, room=request.sid)
+        return
+
+    project_id = timer_subscriptions.unsubscribe(request.sid, timer_id)
+    leave_room(timer_room(timer_id))
+    leave_room(timer_sync_room(timer_id))
+    leave_room(timer_delta_room(timer_id))
+
+    # Stay in the project rooms while other timers of that project are joined
+    if project_id is not None and project_id not in timer_subscriptions.project_ids(request.sid):
+        leave_room(project_room(project_id))
+        leave_room(project_timers_room(project_id))
+
+@socketio.on('disconnect')
+def handle_disconnect(reason=None):
+    # Flask-SocketIO drops the socket from its rooms; release its timers so
+    # unwatched ones are evicted from the tick loop
+    timer_subscriptions.drop_socket(request.sid)
 
 if __name__ == '__main__':
     app = create_app()
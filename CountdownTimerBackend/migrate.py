@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Schema migration command for CountdownTimer backend
+
+Applies the numbered migrations in migrations.py to bring the database up to date.
+Run it before deploying a new version when AUTO_MIGRATE is disabled, so that workers
+start with a single schema-version check and never alter the schema themselves.
+
+Usage:
+    python migrate.py            # Apply pending migrations
+    python migrate.py --status   # Show current and latest schema version
+"""
+
+import os
+import sys
+import argparse
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+def create_app():
+    """Create Flask app for database operations"""
+    from flask import Flask
+    from database import db
+
+    app = Flask(__name__)
+
+    # PostgreSQL database configuration
+    database_url = os.getenv('DATABASE_URL')
+    if database_url:
+        app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    else:
+        pg_user = os.getenv('POSTGRES_USER', 'postgres')
+        pg_password = os.getenv('POSTGRES_PASSWORD', 'password')
+        pg_host = os.getenv('POSTGRES_HOST', 'localhost')
+        pg_port = os.getenv('POSTGRES_PORT', '5432')
+        pg_database = os.getenv('POSTGRES_DB', 'countdown_timer')
+
+        app.config['SQLALCHEMY_DATABASE_URI'] = f'postgresql://{pg_user}:{pg_password}@{pg_host}:{pg_port}/{pg_database}'
+
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply database schema migrations for CountdownTimer backend")
+    parser.add_argument('--status', action='store_true',
+                       help='Show the current schema version without migrating')
+    args = parser.parse_args()
+
+    app = create_app()
+
+    with app.app_context():
+        from database import db
+        # Import models so db.create_all() knows every table
+        import models, auth
+        from migrations import migrate, get_schema_version, LATEST_VERSION, MIGRATIONS
+
+        try:
+            version = get_schema_version(db.engine)
+
+            if args.status:
+                print(f"Current schema version: {version if version is not None else 'unversioned'}")
+                print(f"Latest schema version:  {LATEST_VERSION}")
+                for m in MIGRATIONS:
+                    state = "applied" if version is not None and m.version <= version else "pending"
+                    print(f"  {m.version:>3}  {state:<8} {m.description}")
+                return 0
+
+            applied = migrate(db, log=lambda message: print(f"✓ {message}"))
+            if not applied:
+                print(f"✓ Database schema is up to date (version {LATEST_VERSION})")
+            return 0
+
+        except Exception as e:
+            print(f"✗ Migration failed: {str(e)}")
+            print("Make sure PostgreSQL is running and the database exists.")
+            return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+import os
+import json
+from collections import namedtuple
+import sqlalchemy
+
+Migration = namedtuple('Migration', ['version', 'description', 'upgrade'])
+
+# Ordered list of schema migrations; append new ones with the next version number
+MIGRATIONS = []
+
+def migration(version, description):
+    """Register an upgrade function as a numbered schema migration"""
+    def register(upgrade):
+        MIGRATIONS.append(Migration(version, description, upgrade))
+        return upgrade
+    return register
+
+def _add_column_if_missing(conn, table, column, ddl):
+    """Add a column unless an older installation already has it"""
+    cols = [c['name'] for c in sqlalchemy.inspect(conn).get_columns(table)]
+    if column not in cols:
+        conn.execute(sqlalchemy.text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+# Migrations 1-5 replace the column checks create_app used to run on every boot.
+# They only ever run against databases created before schema versioning existed.
+
+@migration(1, 'Add projects.description')
+def _add_project_description(conn):
+    _add_column_if_missing(conn, 'projects', 'description', 'TEXT')
+
+@migration(2, 'Add timers.name')
+def _add_timer_name(conn):
+    _add_column_if_missing(conn, 'timers', 'name', "TEXT NOT NULL DEFAULT ''")
+
+@migration(3, 'Add timers.paused')
+def _add_timer_paused(conn):
+    _add_column_if_missing(conn, 'timers', 'paused', 'BOOLEAN NOT NULL DEFAULT TRUE')
+
+@migration(4, 'Add projects.selected_timer_id')
+def _add_project_selected_timer(conn):
+    _add_column_if_missing(conn, 'projects', 'selected_timer_id', 'INTEGER')
+
+@migration(5, 'Add users.authorised_projects')
+def _add_user_authorised_projects(conn):
+    _add_column_if_missing(conn, 'users', 'authorised_projects', 'TEXT')
+
+@migration(6, 'Index timers by (project_id, id) and projects by selected_timer_id')
+def _add_lookup_indexes(conn):
+    conn.execute(sqlalchemy.text("CREATE INDEX IF NOT EXISTS ix_timers_project_id_id ON timers (project_id, id)"))
+    conn.execute(sqlalchemy.text("CREATE INDEX IF NOT EXISTS ix_projects_selected_timer_id ON projects (selected_timer_id)"))
+
+@migration(7, 'Move users.authorised_projects into the user_project_permissions table')
+def _normalize_project_permissions(conn):
+    conn.execute(sqlalchemy.text(
+        "CREATE TABLE IF NOT EXISTS user_project_permissions ("
+        "user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE, "
+        "project_id INTEGER NOT NULL REFERENCES projects (id) ON DELETE CASCADE, "
+        "PRIMARY KEY (user_id, project_id))"
+    ))
+    conn.execute(sqlalchemy.text(
+        "CREATE INDEX IF NOT EXISTS ix_user_project_permissions_project_id_user_id "
+        "ON user_project_permissions (project_id, user_id)"
+    ))
+
+    cols = [c['name'] for c in sqlalchemy.inspect(conn).get_columns('users')]
+    if 'authorised_projects' not in cols:
+        return
+
+    # Copy the JSON lists over, skipping malformed entries and deleted projects
+    project_ids = {pid for (pid,) in conn.execute(sqlalchemy.text("SELECT id FROM projects"))}
+    rows = []
+    for user_id, raw in conn.execute(sqlalchemy.text(
+            "SELECT id, authorised_projects FROM users WHERE authorised_projects IS NOT NULL")):
+        try:
+            granted = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            continue
+        if not isinstance(granted, list):
+            continue
+        granted = {int(pid) for pid in granted if isinstance(pid, (int, str)) and str(pid).isdigit()}
+        rows.extend({'user_id': user_id, 'project_id': pid} for pid in sorted(granted & project_ids))
+    if rows:
+        conn.execute(sqlalchemy.text(
+            "INSERT INTO user_project_permissions (user_id, project_id) VALUES (:user_id, :project_id)"
+        ), rows)
+    conn.execute(sqlalchemy.text("ALTER TABLE users DROP COLUMN authorised_projects"))
+
+@migration(8, 'Add projects.version for ETags')
+def _add_project_version(conn):
+    _add_column_if_missing(conn, 'projects', 'version', 'INTEGER NOT NULL DEFAULT 1')
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+def get_schema_version(engine):
+    """Return the stored schema version, or None for an unversioned database"""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(sqlalchemy.text("SELECT version FROM schema_version")).scalar()
+    except sqlalchemy.exc.DatabaseError:
+        # schema_version does not exist yet
+        return None
+
+def _set_schema_version(conn, version):
+    conn.execute(sqlalchemy.text("DELETE FROM schema_version"))
+    conn.execute(sqlalchemy.text("INSERT INTO schema_version (version) VALUES (:version)"), {'version': version})
+
+def migrate(db, log=print):
+    """Bring the database schema up to LATEST_VERSION and return the migrations applied"""
+    engine = db.engine
+    version = get_schema_version(engine)
+
+    if version is None:
+        # Only unversioned databases pay for catalog introspection, and only once
+        has_tables = sqlalchemy.inspect(engine).has_table('projects')
+        db.create_all()
+        with engine.begin() as conn:
+            conn.execute(sqlalchemy.text("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)"))
+            # A fresh database was just created at the latest shape
+            version = 0 if has_tables else LATEST_VERSION
+            _set_schema_version(conn, version)
+        if not has_tables:
+            log(f"Created database schema at version {version}")
+
+    applied = []
+    for m in MIGRATIONS:
+        if m.version <= version:
+            continue
+        with engine.begin() as conn:
+            m.upgrade(conn)
+            _set_schema_version(conn, m.version)
+        log(f"Applied migration {m.version}: {m.description}")
+        applied.append(m)
+    return applied
+
+def ensure_schema(db):
+    """Startup check: one schema_version query, migrating only when the database is behind"""
+    version = get_schema_version(db.engine)
+    if version is not None and version >= LATEST_VERSION:
+        return
+
+    auto_migrate = os.getenv('AUTO_MIGRATE', 'True').lower() in ['true', '1', 'yes']
+    if not auto_migrate:
+        raise RuntimeError(
+            f"Database schema is at version {version}, expected {LATEST_VERSION}. "
+            "Run `python migrate.py` before starting the application."
+        )
+    migrate(db)
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from sqlalchemy import event
 from database import db
 
 class Project(db.Model):
@@ -6,7 +7,10 @@ class Project(db.Model):
     id          = db.Column(db.Integer, primary_key=True)
     name        = db.Column(db.String(80), unique=True, nullable=False)
     description = db.Column(db.Text, nullable=True)
-    selected_timer_id = db.Column(db.Integer, db.ForeignKey('timers.id'), nullable=True)
+    # Indexed so deleting a timer does not scan projects for the foreign key check
+    selected_timer_id = db.Column(db.Integer, db.ForeignKey('timers.id'), nullable=True, index=True)
+    # Bumped whenever the project or one of its timers changes; read for ETags
+    version     = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     # Specify foreign_keys to resolve ambiguity
     timers      = db.relationship('Timer', backref='project', lazy=True, foreign_keys='Timer.project_id')
@@ -14,6 +18,10 @@ class Project(db.Model):
 
 class Timer(db.Model):
     __tablename__ = 'timers'
+    __table_args__ = (
+        # Routes look timers up by (project, id) and list them by project
+        db.Index('ix_timers_project_id_id', 'project_id', 'id'),
+    )
     id                  = db.Column(db.Integer, primary_key=True)
     name                = db.Column(db.String(80), nullable=False)
     duration            = db.Column(db.Integer, nullable=False)      # seconds
@@ -23,7 +31,8 @@ class Timer(db.Model):
     remaining_seconds   = db.Column(db.Integer, nullable=False, default=0)
     description         = db.Column(db.Text, nullable=True)
 
-    def _get_safe_seconds(self, seconds_value):
+    @staticmethod
+    def _get_safe_seconds(seconds_value):
         """Return a safe seconds value for timedelta calculations to prevent overflow"""
         # Define a reasonable maximum (e.g., 10 years in seconds)
         MAX_SECONDS = 10 * 365 * 24 * 60 * 60  # 10 years in seconds
@@ -36,38 +45,69 @@ class Timer(db.Model):
         self.remaining_seconds = self.duration
         self.end_time = datetime.now() + timedelta(seconds=self._get_safe_seconds(self.duration))
 
-    def start(self):
+    # start, pause and reset accept a shared `now` and commit=False so batch
+    # operations can move many timers in lockstep within one transaction
+
+    def start(self, now=None, commit=True):
         """Start or resume the timer"""
         if self.paused:
             # If resuming from paused state, calculate new end time based on remaining seconds
-            self.end_time = datetime.now() + timedelta(seconds=self._get_safe_seconds(self.remaining_seconds))
+            self.end_time = (now or datetime.now()) + timedelta(seconds=self._get_safe_seconds(self.remaining_seconds))
             self.paused = False
-            db.session.commit()
+            if commit:
+                db.session.commit()
 
-    def remaining(self):
+    def remaining(self, now=None):
         """Get remaining seconds for a running timer"""
         if self.paused:
             return self.remaining_seconds
         else:
-            delta = self.end_time - datetime.now()
+            delta = self.end_time - (now or datetime.now())
             return max(int(delta.total_seconds()), 0)
     
-    def pause(self):
+    def pause(self, now=None, commit=True):
         """Pause the timer and save the remaining seconds"""
         if not self.paused:
-            self.remaining_seconds = self.remaining()
+            self.remaining_seconds = self.remaining(now)
             self.paused = True
-            db.session.commit()
+            if commit:
+                db.session.commit()
         
-    def reset(self):
+    def reset(self, now=None, commit=True):
         """Reset the timer to its initial state"""
         self.paused = True
         self.remaining_seconds = self.duration
-        self.end_time = datetime.now() + timedelta(seconds=self._get_safe_seconds(self.duration))
-        db.session.commit()
+        self.end_time = (now or datetime.now()) + timedelta(seconds=self._get_safe_seconds(self.duration))
+        if commit:
+            db.session.commit()
         
     def calculate_end_time_and_remaining_seconds(self):
         """Calculate the end time based on the current time and duration"""
         self.end_time = datetime.now() + timedelta(seconds=self._get_safe_seconds(self.duration))
         self.remaining_seconds = self.duration
-        db.session.commit()
\ No newline at end of file
+        db.session.commit()
+
+def bump_project_versions(session, project_ids):
+    """Increment the version of each project in one UPDATE, in the session's transaction"""
+    project_ids = {pid for pid in project_ids if pid is not None}
+    if project_ids:
+        projects = Project.__table__
+        session.execute(
+            projects.update().where(projects.c.id.in_(project_ids)).values(version=projects.c.version + 1)
+        )
+
+@event.listens_for(db.session, 'before_flush')
+def _bump_changed_project_versions(session, flush_context, instances):
+    """Every flush that adds, changes or deletes a timer or project bumps that project's version"""
+    project_ids = set()
+    for obj in session.new | session.deleted:
+        if isinstance(obj, Timer):
+            project_ids.add(obj.project_id if obj.project_id is not None else getattr(obj.project, 'id', None))
+    for obj in session.dirty:
+        if not session.is_modified(obj):
+            continue
+        if isinstance(obj, Timer):
+            project_ids.add(obj.project_id)
+        elif isinstance(obj, Project):
+            project_ids.add(obj.id)
+    bump_project_versions(session, project_ids)
@@ -0,0 +1,74 @@
+from urllib.parse import urlencode
+from flask import abort, request
+
+# Largest page a client can ask for with ?limit=
+MAX_PAGE_SIZE = 500
+
+def page_args(args):
+    """Read ?after=<id>&limit=<n>. Both are optional; without limit the whole list is returned."""
+    after = args.get('after')
+    limit = args.get('limit')
+    try:
+        after = int(after) if after not in (None, '') else None
+        limit = int(limit) if limit not in (None, '') else None
+    except ValueError:
+        abort(400, 'after and limit must be integers')
+    if limit is not None and limit < 1:
+        abort(400, 'limit must be at least 1')
+    if limit is not None:
+        limit = min(limit, MAX_PAGE_SIZE)
+    return after, limit
+
+def requested_fields(args, allowed):
+    """Read ?fields=a,b as a list in the order of allowed, or None for every field"""
+    fields = args.get('fields')
+    if not fields:
+        return None
+    wanted = {field.strip() for field in fields.split(',') if field.strip()}
+    unknown = wanted - set(allowed)
+    if unknown:
+        abort(400, f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed)}")
+    return [field for field in allowed if field in wanted]
+
+def paginate(query, id_column, after=None, limit=None):
+    """Run query as one keyset page ordered by id_column; returns (rows, next_after).
+
+    Seeking past the last id seen uses the primary key index, so every page
+    costs the same however deep into the table it is. next_after is None on
+    the last page.
+    """
+    query = query.order_by(id_column)
+    if after is not None:
+        query = query.filter(id_column > after)
+    if limit is None:
+        return query.all(), None
+    # One extra row tells us whether there is another page
+    rows = query.limit(limit + 1).all()
+    if len(rows) > limit:
+        return rows[:limit], rows[limit - 1].id
+    return rows, None
+
+def select_fields(getters, fields):
+    """Build a response dict from {key: getter}, calling only the getters for requested keys.
+
+    Columns left out of the query with load_only are never touched, so leaving
+    a field out also saves loading it.
+    """
+    return {key: get() for key, get in getters.items() if fields is None or key in fields}
+
+def columns(model, fields):
+    """Model columns needed for the requested fields, for load_only; every column if fields is None"""
+    return [getattr(model, column.key) for column in model.__table__.columns
+            if fields is None or column.primary_key or column.key in fields]
+
+def next_link(next_after):
+    """Link header value pointing at the page after next_after, keeping the other query args"""
+    args = request.args.to_dict()
+    args['after'] = next_after
+    return f'<{request.base_url}?{urlencode(args)}>; rel="next"'
+
+def add_next_link(response, next_after):
+    """Point a Link: rel="next" header at the following page, if there is one"""
+    if next_after is not None:
+        response.headers['Link'] = next_link(next_after)
+    return response
@@ -0,0 +1,56 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many password hashes are already queued"""
+
+class PasswordHasher:
+    """Runs bcrypt in native threads so a login does not stall the event loop.
+
+    Under gevent a bcrypt call made from a request greenlet would block the hub,
+    and with it the timer broadcaster, for the whole hash. Work is handed to a
+    small native thread pool instead; bcrypt releases the GIL while hashing.
+    At most max_pending hashes may be running or queued; further callers wait
+    up to queue_timeout seconds for a slot and then get PasswordHasherBusy.
+    """
+
+    def __init__(self):
+        self._submit = None
+        self._slots = None
+        self.queue_timeout = 2
+
+    def configure(self, async_mode='threading', max_workers=None, max_pending=None, queue_timeout=None):
+        """Create the pool for the Socket.IO async mode; called once from create_app"""
+        if max_workers is None:
+            max_workers = int(os.getenv('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1)))
+        if max_pending is None:
+            max_pending = int(os.getenv('PASSWORD_HASH_QUEUE', 32))
+        if queue_timeout is not None:
+            self.queue_timeout = queue_timeout
+
+        if async_mode == 'gevent':
+            from gevent.threadpool import ThreadPool
+            from gevent.lock import BoundedSemaphore
+            pool = ThreadPool(max_workers)
+            # Only the calling greenlet waits for the result
+            self._submit = lambda fn, args: pool.apply(fn, args)
+            self._slots = BoundedSemaphore(max_pending)
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password-hash')
+            self._submit = lambda fn, args: executor.submit(fn, *args).result()
+            self._slots = threading.BoundedSemaphore(max_pending)
+
+    def run(self, fn, *args):
+        """Run a hashing function in the pool and return its result"""
+        if self._submit is None:
+            # Scripts such as create_admin_account.py never call configure()
+            self.configure()
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise PasswordHasherBusy()
+        try:
+            return self._submit(fn, args)
+        finally:
+            self._slots.release()
+
+password_hasher = PasswordHasher()
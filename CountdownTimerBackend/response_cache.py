@@ -0,0 +1,98 @@
+import re
+import secrets
+from datetime import datetime
+from flask import current_app
+from cache import TTLCache
+from timer_state import to_epoch_ms
+
+class ResponseSlots:
+    """Handed to a body builder to mark values that must be filled in when a cached body is served"""
+
+    def __init__(self):
+        self._marker = secrets.token_hex(8)
+        self.values = []  # epoch ms end time for remaining_seconds, or None for the server time
+        self.headers = {}
+
+    def _slot(self, value):
+        self.values.append(value)
+        return f'{self._marker}:{len(self.values) - 1}'
+
+    def remaining(self, end_time):
+        """remaining_seconds of a running timer, counted down to end_time at serve time"""
+        return self._slot(to_epoch_ms(end_time))
+
+    def server_time(self):
+        """server_time_ms at serve time"""
+        return self._slot(None)
+
+class CachedBody:
+    """A serialized JSON body split around its slots, valid for one project version"""
+    __slots__ = ('version', 'parts', 'values', 'headers')
+
+    def __init__(self, version, text, slots):
+        self.version = version
+        # re.split keeps the slot index between every two literal parts;
+        # key sorting can reorder slots, so the index says which value goes where
+        pieces = re.split(f'"{slots._marker}:(\\d+)"', text)
+        self.parts = [piece.encode() for piece in pieces[::2]]
+        self.values = [slots.values[int(index)] for index in pieces[1::2]]
+        self.headers = dict(slots.headers)
+
+    def render(self, now_ms=None):
+        now_ms = now_ms if now_ms is not None else to_epoch_ms(datetime.now())
+        out = [self.parts[0]]
+        for end_ms, part in zip(self.values, self.parts[1:]):
+            # Same rounding as Timer.remaining()
+            out.append(b'%d' % (now_ms if end_ms is None else max(int((end_ms - now_ms) / 1000), 0)))
+            out.append(part)
+        return b''.join(out)
+
+class ResponseCache(TTLCache):
+    """LRU of serialized read responses, each tagged with the version it was built from.
+
+    Keys name the route, project and query string; the version is the
+    project's ETag. Any write bumps the version, so a lookup with the new one
+    misses and replaces the entry, in every worker, without explicit
+    invalidation. Entries of deleted projects age out through the LRU and TTL.
+    """
+
+    def __init__(self, maxsize=1024, ttl=600):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+
+    def serve(self, key, version, build):
+        """Return a JSON response for key at version, calling build(slots) only on a miss.
+
+        build returns the body as a dict or list, or a ready response (such as
+        an error) that is passed through without being cached.
+        """
+        entry = self.get(key)
+        if entry is not None and entry.version == version:
+            self.hits += 1
+        else:
+            self.misses += 1
+            slots = ResponseSlots()
+            body = build(slots)
+            if not isinstance(body, (dict, list)):
+                return body
+            entry = CachedBody(version, current_app.json.dumps(body) + '\n', slots)
+            self.set(key, entry)
+        return current_app.response_class(entry.render(), mimetype='application/json', headers=entry.headers)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+        }
+
+    def clear(self):
+        super().clear()
+        self.hits = 0
+        self.misses = 0
+
+response_cache = ResponseCache()
@@ -1,8 +1,32 @@
-from flask import Blueprint, request, jsonify, abort, make_response
+import csv
+import logging
+from flask import Blueprint, request, jsonify, abort, make_response, Response, stream_with_context
 from database import db
 from models import Project, Timer
-from auth import AuthManager, User, token_required, admin_required, optional_auth, project_access_required, optional_project_access
+from timer_state import TimerState, timer_states, to_epoch_ms
+from broadcast import (emit_timer_changed, emit_timers_changed, emit_timer_added, emit_timers_added, emit_timer_removed,
+                       emit_selection_changed)
+from auth import AuthManager, User, token_required, admin_required, optional_auth, project_access_required, optional_project_access, invalidate_project_access
 from datetime import datetime, timedelta
+from sqlalchemy.orm import selectinload, load_only
+from etags import conditional, project_etag, projects_etag
+from pagination import page_args, requested_fields, paginate, select_fields, columns, next_link, add_next_link
+from response_cache import response_cache
+from timer_transfer import FORMATS, TimerImportError, requested_format, iter_timer_rows, iter_export_chunks, iter_import_records, import_timers
+from logs import get_logger
+
+logger = get_logger('routes')
+
+def log_selection(message, project_id, timer_id, previous_timer_id):
+    fields = {'project_id': project_id, 'timer_id': timer_id, 'previous_timer_id': previous_timer_id}
+    if logger.isEnabledFor(logging.DEBUG):
+        # Re-read the selection to confirm it was persisted; costs a query, so debug level only
+        fields['persisted_timer_id'] = db.session.get(Project, project_id, populate_existing=True).selected_timer_id
+    logger.info(message, extra=fields)
+
+# Fields a client can ask for with ?fields=
+PROJECT_FIELDS = ['id', 'name', 'description', 'selected_timer_id', 'timers']
+USER_FIELDS = ['id', 'username', 'is_admin', 'created_at', 'last_login']
 
 def create_routes(socketio):
     """Create and return a blueprint with all routes"""
@@ -30,38 +54,50 @@ def create_routes(socketio):
     @bp.route('/api/projects', methods=['GET'])
     def list_projects():
         # Everyone can see all projects (read-only)
-        projects = Project.query.all()
-        
-        # Debug: Print all projects and their selected timers
-        print("DEBUG: All projects and their selected timers:")
-        for p in projects:
-            print(f"  Project {p.id} ({p.name}) - Selected timer: {p.selected_timer_id}")
-        
-        return jsonify([
-            {
-                'id': p.id,
-                'name': p.name,
-                'description': p.description,
-                'selected_timer_id': p.selected_timer_id,
-                'timers': [
-                    {
-                        'id': t.id,
-                        'name': t.name,
-                        'duration': t.duration,
-                        'description': t.description,
-                        'remaining_seconds': t.remaining(),
-                        'paused': t.paused
-                    }
-                    for t in p.timers
-                ]
-            }
-            for p in projects
-        ])    
+        # A matching If-None-Match costs one query on projects and no timer rows,
+        # and a cached body for the same versions skips the timer query too
+        def build(slots):
+            after, limit = page_args(request.args)
+            fields = requested_fields(request.args, PROJECT_FIELDS)
+            query = Project.query.options(load_only(*columns(Project, fields)))
+            if fields is None or 'timers' in fields:
+                # Load every project's timers in one extra SELECT ... IN query instead of one per project
+                query = query.options(selectinload(Project.timers))
+            projects, next_after = paginate(query, Project.id, after, limit)
+            if next_after is not None:
+                slots.headers['Link'] = next_link(next_after)
+            server_time_ms = slots.server_time()
+        
+            return [
+                select_fields({
+                    'id': lambda: p.id,
+                    'name': lambda: p.name,
+                    'description': lambda: p.description,
+                    'selected_timer_id': lambda: p.selected_timer_id,
+                    'timers': lambda: [
+                        {
+                            'id': t.id,
+                            'name': t.name,
+                            'duration': t.duration,
+                            'description': t.description,
+                            'remaining_seconds': t.remaining_seconds if t.paused else slots.remaining(t.end_time),
+                            'paused': t.paused,
+                            'end_time_ms': None if t.paused else to_epoch_ms(t.end_time),
+                            'server_time_ms': server_time_ms
+                        }
+                        for t in p.timers
+                    ]
+                }, fields)
+                for p in projects
+            ]
+
+        etag = projects_etag()
+        return conditional(etag, lambda: response_cache.serve(('projects', request.query_string), etag, build))
         
     @bp.route('/api/projects/<int:project_id>/timers', methods=['POST'])
     @project_access_required
     def create_timer(project_id):
-        project = Project.query.get_or_404(project_id)
+        project = request.current_project
         data = request.get_json() or {}
         duration = data.get('duration')
         if not data.get('name') or data.get('duration') is None:
@@ -75,6 +111,7 @@ def create_routes(socketio):
         t.start()
         db.session.add(t)
         db.session.commit()
+        emit_timer_added(socketio, timer_states.load(t))
         
         # NO AUTO-SELECTION - Let user manually select timers
         
@@ -88,19 +125,24 @@ def create_routes(socketio):
     @bp.route('/api/projects/<int:project_id>/timers/<int:timer_id>', methods=['GET'])
     def get_timer(project_id, timer_id):
         # Everyone can view timer details (read-only)
-        project = Project.query.get_or_404(project_id)
-        t = Timer.query.filter_by(id=timer_id, project=project).first_or_404()
-        return jsonify({
-            'id': t.id,
-            'name': t.name,
-            'remaining_seconds': t.remaining(),
-            'paused': t.paused
-        }), 200
+        def build():
+            project = Project.query.get_or_404(project_id)
+            t = Timer.query.filter_by(id=timer_id, project=project).first_or_404()
+            return jsonify({
+                'id': t.id,
+                'name': t.name,
+                'remaining_seconds': t.remaining(),
+                'paused': t.paused,
+                'end_time_ms': None if t.paused else to_epoch_ms(t.end_time),
+                'server_time_ms': to_epoch_ms(datetime.now())
+            }), 200
+
+        return conditional(project_etag(project_id), build)
         
     @bp.route('/api/projects/<int:project_id>/timers/<int:timer_id>/start', methods=['POST'])
     @project_access_required
     def start_timer(project_id, timer_id):
-        project = Project.query.get_or_404(project_id)
+        project = request.current_project
         t = Timer.query.filter_by(id=timer_id, project=project).first_or_404()
         if not t.paused:
             abort(400, 'Timer already running')
@@ -108,15 +150,8 @@ def create_routes(socketio):
         # Start/resume the timer
         t.start()
         
-        # Broadcast update to all clients watching this timer
-        timer_room = f'timer_{t.id}'
-        socketio.emit('timer_update', {
-            'id': t.id,
-            'name': t.name,
-            'remaining_seconds': t.remaining(),
-            'paused': t.paused,
-            'project_id': t.project_id
-        }, room=timer_room)
+        # Sync the in-memory state and broadcast to all clients watching this timer
+        emit_timer_changed(socketio, timer_states.load(t))
         
         # Return response to API caller
         return jsonify({
@@ -130,7 +165,7 @@ def create_routes(socketio):
     @bp.route('/api/projects/<int:project_id>/timers/<int:timer_id>/pause', methods=['POST'])
     @project_access_required
     def pause_timer(project_id, timer_id):
-        project = Project.query.get_or_404(project_id)
+        project = request.current_project
         t = Timer.query.filter_by(id=timer_id, project=project).first_or_404()
         if t.paused:
             abort(400, 'Timer already paused')
@@ -139,14 +174,7 @@ def create_routes(socketio):
         t.pause()
         db.session.commit()
         
-        timer_room = f'timer_{t.id}'
-        socketio.emit('timer_update', {
-            'id': t.id,
-            'name': t.name,
-            'remaining_seconds': t.remaining(),
-            'paused': t.paused,
-            'project_id': t.project_id
-        }, room=timer_room)
+        emit_timer_changed(socketio, timer_states.load(t))
         
         return jsonify({
             'id': t.id,
@@ -158,7 +186,7 @@ def create_routes(socketio):
     @bp.route('/api/projects/<int:project_id>/timers/<int:timer_id>', methods=['PUT'])
     @project_access_required
     def edit_timer(project_id, timer_id):
-        project = Project.query.get_or_404(project_id)
+        project = request.current_project
         timer = Timer.query.filter_by(id=timer_id, project=project).first_or_404()
         data = request.get_json() or {}
         if data.get('name'): timer.name = data['name']
@@ -170,15 +198,7 @@ def create_routes(socketio):
     
         db.session.commit()
         
-        timer_room = f'timer_{timer.id}'
-        socketio.emit('timer_update', {
-            'id': timer.id,
-            'name': timer.name,
-            'description': timer.description,
-            'remaining_seconds': timer.remaining(),
-            'paused': timer.paused,
-            'project_id': timer.project_id
-        }, room=timer_room)
+        emit_timer_changed(socketio, timer_states.load(timer))
         
         return jsonify({
             'id': timer.id,
@@ -191,32 +211,29 @@ def create_routes(socketio):
     @bp.route('/api/projects/<int:project_id>/timers/<int:timer_id>', methods=['DELETE'])
     @project_access_required
     def delete_timer(project_id, timer_id):
-        project = Project.query.get_or_404(project_id)
+        project = request.current_project
         timer = Timer.query.filter_by(id=timer_id, project=project).first_or_404()
         
         # Only deselect if this timer is currently selected (no auto-selection of remaining timers)
-        if project.selected_timer_id == timer_id:
+        was_selected = project.selected_timer_id == timer_id
+        if was_selected:
             project.selected_timer_id = None
         
         db.session.delete(timer)
         db.session.commit()
+        emit_timer_removed(socketio, project.id, timer_id)
+        if was_selected:
+            emit_selection_changed(socketio, project.id)
         return jsonify({'message': 'Timer deleted'}), 200    
     
     @bp.route('/api/projects/<int:project_id>/timers/<int:timer_id>/reset', methods=['POST'])
     @project_access_required
     def reset_timer(project_id, timer_id):
-        project = Project.query.get_or_404(project_id)
+        project = request.current_project
         t = Timer.query.filter_by(id=timer_id, project=project).first_or_404()        # Reset the timer properly
         t.reset()
         
-        timer_room = f'timer_{t.id}'
-        socketio.emit('timer_update', {
-            'id': t.id,
-            'name': t.name,
-            'remaining_seconds': t.remaining(),
-            'paused': t.paused,
-            'project_id': t.project_id
-        }, room=timer_room)
+        emit_timer_changed(socketio, timer_states.load(t))
         
         return jsonify({
             'id': t.id,
@@ -226,33 +243,134 @@ def create_routes(socketio):
             'paused': t.paused
         }), 200      
         
+    @bp.route('/api/projects/<int:project_id>/timers/batch', methods=['POST'])
+    @project_access_required
+    def batch_timers(project_id):
+        project = request.current_project
+        data = request.get_json() or {}
+        operations = data.get('operations')
+        actions = {'start': Timer.start, 'pause': Timer.pause, 'reset': Timer.reset}
+        if not isinstance(operations, list) or not operations:
+            abort(400, 'A non-empty list of operations is required')
+        for op in operations:
+            # JSON true and false are ints to isinstance; they are not timer ids
+            if not isinstance(op, dict) or type(op.get('timer_id')) is not int or op.get('action') not in actions:
+                abort(400, "Each operation needs a timer_id and an action of 'start', 'pause' or 'reset'")
+
+        # One query for every timer in the batch; all of them must belong to this project
+        timer_ids = list(dict.fromkeys(op['timer_id'] for op in operations))
+        timers = {t.id: t for t in Timer.query.filter(Timer.project_id == project.id, Timer.id.in_(timer_ids))}
+        if len(timers) != len(timer_ids):
+            abort(404)
+
+        # A single clock reading keeps timers started together in lockstep. Starting a
+        # running timer or pausing a paused one leaves it unchanged instead of failing the batch
+        now = datetime.now()
+        for op in operations:
+            actions[op['action']](timers[op['timer_id']], now=now, commit=False)
+
+        # Read the rows before the commit expires them, which would reload each one
+        states = [TimerState.from_timer(timers[timer_id]) for timer_id in timer_ids]
+        rows = [
+            {
+                'id': t.id,
+                'name': t.name,
+                'duration': t.duration,
+                'remaining_seconds': t.remaining(now),
+                'paused': t.paused
+            }
+            for t in (timers[timer_id] for timer_id in timer_ids)
+        ]
+        db.session.commit()
+
+        # One coalesced frame to the project room instead of one per timer
+        for state in states:
+            timer_states.put(state)
+        emit_timers_changed(socketio, project.id, states)
+
+        return jsonify({'timers': rows}), 200
+
+    @bp.route('/api/projects/<int:project_id>/timers/export', methods=['GET'])
+    @project_access_required
+    def export_timers(project_id):
+        project = request.current_project
+        fmt = requested_format(request.args)
+        if fmt not in FORMATS:
+            abort(400, "Format must be 'jsonl' or 'csv'")
+
+        # Rows come from a server-side cursor and go out in chunks as they are encoded,
+        # so memory stays flat however many timers the project has
+        chunks = iter_export_chunks(iter_timer_rows(project.id), fmt)
+        response = Response(stream_with_context(chunks), mimetype=FORMATS[fmt])
+        response.headers['Content-Disposition'] = f'attachment; filename="project-{project.id}-timers.{fmt}"'
+        return response
+
+    @bp.route('/api/projects/<int:project_id>/timers/import', methods=['POST'])
+    @project_access_required
+    def import_project_timers(project_id):
+        project = request.current_project
+        fmt = requested_format(request.args, request.content_type)
+        if fmt not in FORMATS:
+            abort(400, "Format must be 'jsonl' or 'csv'")
+
+        # The upload is parsed as it streams in and inserted in batches; one bad
+        # line rolls back the whole import
+        try:
+            imported = import_timers(project.id, iter_import_records(request.stream, fmt))
+        except (TimerImportError, UnicodeDecodeError, csv.Error) as e:
+            db.session.rollback()
+            abort(400, f'Import failed: {e}')
+        # Built before the commit expires the new rows
+        states = [TimerState.from_timer(t) for t in imported]
+        db.session.commit()
+
+        # One frame with every new timer for the sockets that joined the project
+        if states:
+            emit_timers_added(socketio, project.id, states)
+        return jsonify({'imported': len(states)}), 201
+
     @bp.route('/api/projects/<int:project_id>', methods=['GET'])
     def get_project(project_id):
         # Everyone can view project details (read-only)
-        project = Project.query.get_or_404(project_id)
-        timers = Timer.query.filter_by(project=project).all()
-        
-        # Debug: Print selected timer for this project
-        print(f"DEBUG: Project {project_id} ({project.name}) - Selected timer ID: {project.selected_timer_id}")
-        
-        return jsonify({
-            'id': project.id,
-            'name': project.name,
-            'description': project.description,
-            'selected_timer_id': project.selected_timer_id,
-            'timers': [
-                {
-                    'id': x.id,
-                    'name': x.name,
-                    'duration': x.duration,
-                    'description': x.description,
-                    'remaining_seconds': x.remaining(),
-                    'end_time': x.end_time.isoformat(),
-                    'paused': x.paused
-                }
-                for x in timers
-            ]
-        }), 200    
+        def build(slots):
+            # ?after= and ?limit= page through the project's timers
+            after, limit = page_args(request.args)
+            fields = requested_fields(request.args, PROJECT_FIELDS)
+            project = Project.query.options(load_only(*columns(Project, fields))).get_or_404(project_id)
+            timers, next_after = [], None
+            if fields is None or 'timers' in fields:
+                timers, next_after = paginate(Timer.query.filter_by(project_id=project.id), Timer.id, after, limit)
+            if next_after is not None:
+                slots.headers['Link'] = next_link(next_after)
+            server_time_ms = slots.server_time()
+            if logger.isEnabledFor(logging.DEBUG):
+                # selected_timer_id may be deferred by ?fields=; only load it when it is logged
+                logger.debug('Project read', extra={'project_id': project_id,
+                                                    'selected_timer_id': project.selected_timer_id})
+        
+            return select_fields({
+                'id': lambda: project.id,
+                'name': lambda: project.name,
+                'description': lambda: project.description,
+                'selected_timer_id': lambda: project.selected_timer_id,
+                'timers': lambda: [
+                    {
+                        'id': x.id,
+                        'name': x.name,
+                        'duration': x.duration,
+                        'description': x.description,
+                        'remaining_seconds': x.remaining_seconds if x.paused else slots.remaining(x.end_time),
+                        'end_time': x.end_time.isoformat(),
+                        'paused': x.paused,
+                        'end_time_ms': None if x.paused else to_epoch_ms(x.end_time),
+                        'server_time_ms': server_time_ms
+                    }
+                    for x in timers
+                ]
+            }, fields)
+
+        etag = project_etag(project_id)
+        return conditional(etag, lambda: response_cache.serve(('project', project_id, request.query_string), etag, build))
         
     @bp.route('/api/projects/<int:project_id>', methods=['PUT'])
     @admin_required
@@ -277,14 +395,19 @@ def create_routes(socketio):
     @admin_required
     def delete_project(project_id):
         project = Project.query.get_or_404(project_id)
+        timer_ids = [t.id for t in project.timers]
         db.session.delete(project)
         db.session.commit()
+        for timer_id in timer_ids:
+            emit_timer_removed(socketio, project_id, timer_id)
+        emit_selection_changed(socketio, project_id)
+        invalidate_project_access(project_id=project_id)
         return jsonify({'message': 'Project deleted'}), 200
 
     @bp.route('/api/debug/projects', methods=['GET'])
     def debug_projects():
         """Debug endpoint to show all projects and their selected timers"""
-        projects = Project.query.all()
+        projects = Project.query.options(selectinload(Project.timers)).all()
         debug_info = []
         
         for p in projects:
@@ -301,114 +424,90 @@ def create_routes(socketio):
                     for t in p.timers                ]
             }
             debug_info.append(project_info)
-            print(f"DEBUG API: Project {p.id} ({p.name}) - Selected timer: {p.selected_timer_id}")
-            print(f"DEBUG API: Available timers: {[t.id for t in p.timers]}")
+        logger.debug('Debug project listing', extra={'project_count': len(debug_info)})
         
         return jsonify(debug_info)    
     
+    @bp.route('/api/debug/response-cache', methods=['GET'])
+    @admin_required
+    def response_cache_stats():
+        """Hit ratio and size of the project read response cache (admin only)"""
+        return jsonify(response_cache.stats()), 200
+
     @bp.route('/api/projects/<int:project_id>/select-timer/<int:timer_id>', methods=['POST'])
     @project_access_required
     def select_timer(project_id, timer_id):
-        print(f"DEBUG: ========== SELECT TIMER REQUEST ==========")
-        print(f"DEBUG: Project ID: {project_id} (type: {type(project_id)})")
-        print(f"DEBUG: Timer ID: {timer_id} (type: {type(timer_id)})")
-        
-        try:
-            project = Project.query.get_or_404(project_id)
-            print(f"DEBUG: Found project: {project.name} (ID: {project.id})")
-            
-            timer = Timer.query.filter_by(id=timer_id, project=project).first_or_404()
-            print(f"DEBUG: Found timer: {timer.name} (ID: {timer.id})")
-            
-            # Debug: Print previous and new selected timer
-            print(f"DEBUG: Previous selected timer: {project.selected_timer_id}")
-            project.selected_timer_id = timer_id
-            
-            # Force commit and verify
-            db.session.commit()
-            db.session.refresh(project)
-            print(f"DEBUG: New selected timer after commit: {project.selected_timer_id}")
-            
-            # Verify the change was persisted
-            verification_project = Project.query.get(project_id)
-            print(f"DEBUG: Verification - selected timer in DB: {verification_project.selected_timer_id}")
-            
-            print(f"DEBUG: ========== SELECT TIMER SUCCESS ==========")
-            return jsonify({
-                'message': 'Timer selected',
-                'selected_timer_id': timer_id,
-                'project_id': project_id
-            }), 200
-            
-        except Exception as e:
-            print(f"DEBUG: ========== SELECT TIMER ERROR ==========")
-            raise
+        project = request.current_project
+        timer = Timer.query.filter_by(id=timer_id, project=project).first_or_404()
+        previous_timer_id = project.selected_timer_id
+        # Read before the commit expires the instances
+        state = timer_states.load(timer)
+        project.selected_timer_id = timer_id
+        db.session.commit()
+        log_selection('Timer selected', project_id, timer_id, previous_timer_id)
+
+        # Displays following the selection switch without polling
+        emit_selection_changed(socketio, project_id, state)
+        return jsonify({
+            'message': 'Timer selected',
+            'selected_timer_id': timer_id,
+            'project_id': project_id
+        }), 200
 
     @bp.route('/api/projects/<int:project_id>/deselect-timer', methods=['POST'])
     @project_access_required
     def deselect_timer(project_id):
-        print(f"DEBUG: ========== DESELECT TIMER REQUEST ==========")
-        print(f"DEBUG: Project ID: {project_id} (type: {type(project_id)})")
-        
-        try:
-            project = Project.query.get_or_404(project_id)
-            print(f"DEBUG: Found project: {project.name} (ID: {project.id})")
-            
-            # Debug: Print previous selected timer
-            print(f"DEBUG: Previous selected timer: {project.selected_timer_id}")
-            
-            # Clear the selected timer
-            project.selected_timer_id = None
-            
-            # Force commit and verify
-            db.session.commit()
-            db.session.refresh(project)
-            print(f"DEBUG: New selected timer after commit: {project.selected_timer_id}")
-            
-            # Verify the change was persisted
-            verification_project = Project.query.get(project_id)
-            print(f"DEBUG: Verification - selected timer in DB: {verification_project.selected_timer_id}")
-            
-            print(f"DEBUG: ========== DESELECT TIMER SUCCESS ==========")
-            return jsonify({
-                'message': 'Timer deselected',
-                'selected_timer_id': None,
-                'project_id': project_id            }), 200
-            
-        except Exception as e:
-            print(f"DEBUG: ERROR in deselect_timer: {str(e)}")
-            print(f"DEBUG: ========== DESELECT TIMER ERROR ==========")
-            raise
+        project = request.current_project
+        previous_timer_id = project.selected_timer_id
+        project.selected_timer_id = None
+        db.session.commit()
+        log_selection('Timer deselected', project_id, None, previous_timer_id)
+
+        emit_selection_changed(socketio, project_id)
+        return jsonify({
+            'message': 'Timer deselected',
+            'selected_timer_id': None,
+            'project_id': project_id
+        }), 200
 
     @bp.route('/api/projects/<int:project_id>/selected-timer', methods=['GET'])
     def get_selected_timer(project_id):
         # Everyone can view the selected timer (read-only)
-        project = Project.query.get_or_404(project_id)
-        
-        if not project.selected_timer_id:
-            return jsonify({
-                'error': 'No timer selected',
-                'message': 'This project has no selected timer'
-            }), 404
-        
-        timer = Timer.query.get(project.selected_timer_id)
-        if not timer:
-            # If selected timer was deleted, clear the selection
-            project.selected_timer_id = None
-            db.session.commit()
-            return jsonify({
-                'error': 'Selected timer not found',
-                'message': 'The selected timer no longer exists'
-            }), 404
+        # The selection and the selected timer both bump the project's version
+        def build(slots):
+            project = Project.query.get_or_404(project_id)
         
-        return jsonify({
-            'id': timer.id,
-            'name': timer.name,
-            'duration': timer.duration,
-            'description': timer.description,
-            'remaining_seconds': timer.remaining(),
-            'paused': timer.paused,
-            'project_id': timer.project_id        }), 200
+            if not project.selected_timer_id:
+                return jsonify({
+                    'error': 'No timer selected',
+                    'message': 'This project has no selected timer'
+                }), 404
+        
+            timer = Timer.query.get(project.selected_timer_id)
+            if not timer:
+                # If selected timer was deleted, clear the selection
+                project.selected_timer_id = None
+                db.session.commit()
+                emit_selection_changed(socketio, project.id)
+                return jsonify({
+                    'error': 'Selected timer not found',
+                    'message': 'The selected timer no longer exists'
+                }), 404
+        
+            return {
+                'id': timer.id,
+                'name': timer.name,
+                'duration': timer.duration,
+                'description': timer.description,
+                'remaining_seconds': timer.remaining_seconds if timer.paused else slots.remaining(timer.end_time),
+                'paused': timer.paused,
+                'project_id': timer.project_id,
+                'end_time_ms': None if timer.paused else to_epoch_ms(timer.end_time),
+                'server_time_ms': slots.server_time()
+            }
+
+        etag = project_etag(project_id)
+        return conditional(etag, lambda: response_cache.serve(('selected-timer', project_id), etag, build))
         
     ## Authentication routes 
         
@@ -565,19 +664,22 @@ def create_routes(socketio):
     @admin_required
     def list_users():
         """List all users (admin only)"""
-        users = User.query.all()
-        return jsonify({
+        after, limit = page_args(request.args)
+        fields = requested_fields(request.args, USER_FIELDS)
+        users, next_after = paginate(User.query.options(load_only(*columns(User, fields))), User.id, after, limit)
+        response = jsonify({
             'users': [
-                {
-                    'id': user.id,
-                    'username': user.username,
-                    'is_admin': user.is_admin,
-                    'created_at': user.created_at.isoformat(),
-                    'last_login': user.last_login.isoformat() if user.last_login else None
-                }
+                select_fields({
+                    'id': lambda: user.id,
+                    'username': lambda: user.username,
+                    'is_admin': lambda: user.is_admin,
+                    'created_at': lambda: user.created_at.isoformat(),
+                    'last_login': lambda: user.last_login.isoformat() if user.last_login else None
+                }, fields)
                 for user in users
             ]
-        }), 200
+        })
+        return add_next_link(response, next_after), 200
 
     @bp.route('/api/auth/users/<int:user_id>', methods=['PUT'])
     @admin_required
@@ -624,6 +726,7 @@ def create_routes(socketio):
             user.is_admin = is_admin
         
         db.session.commit()
+        invalidate_project_access(user_id=user_id)
         
         return jsonify({
             'message': 'User updated successfully',
@@ -651,6 +754,7 @@ def create_routes(socketio):
         user = User.query.get_or_404(user_id)
         db.session.delete(user)
         db.session.commit()
+        invalidate_project_access(user_id=user_id)
         
         return jsonify({
             'message': 'User deleted successfully'
@@ -664,13 +768,8 @@ def create_routes(socketio):
         """Get project permissions for a specific user (admin only)"""
         user = User.query.get_or_404(user_id)
         
-        # Get all projects the user has access to
-        authorized_projects = user.get_authorised_projects()
-        
-        # Get project details for authorized projects
-        projects = []
-        if authorized_projects:
-            projects = Project.query.filter(Project.id.in_(authorized_projects)).all()
+        # Get all projects the user has access to in one join
+        projects = user.authorised_projects_query().all()
         
         return jsonify({
             'user_id': user.id,
@@ -702,6 +801,7 @@ def create_routes(socketio):
         # Add project permission
         user.add_project_permission(project_id)
         db.session.commit()
+        invalidate_project_access(user_id=user_id)
         
         return jsonify({
             'message': f'Permission granted for project "{project.name}"',
@@ -728,6 +828,7 @@ def create_routes(socketio):
         # Remove project permission
         user.remove_project_permission(project_id)
         db.session.commit()
+        invalidate_project_access(user_id=user_id)
         
         return jsonify({
             'message': f'Permission revoked for project "{project.name}"',
@@ -769,11 +870,10 @@ def create_routes(socketio):
         # Set project permissions
         user.set_authorised_projects(project_ids)
         db.session.commit()
+        invalidate_project_access(user_id=user_id)
         
         # Get project details for response
-        projects = []
-        if project_ids:
-            projects = Project.query.filter(Project.id.in_(project_ids)).all()
+        projects = user.authorised_projects_query().all()
         
         return jsonify({
             'message': 'Project permissions updated',
@@ -794,26 +894,30 @@ def create_routes(socketio):
         """Get all users who have access to a specific project (admin only)"""
         project = Project.query.get_or_404(project_id)
         
-        # Get all users
-        all_users = User.query.all()
-        
-        # Filter users who have access to this project
-        authorized_users = []
-        for user in all_users:
-            if user.has_project_permission(project_id):
-                authorized_users.append({
-                    'id': user.id,
-                    'username': user.username,
-                    'is_admin': user.is_admin,
-                    'created_at': user.created_at.isoformat(),
-                    'last_login': user.last_login.isoformat() if user.last_login else None
-                })
-        
-        return jsonify({
+        after, limit = page_args(request.args)
+        fields = requested_fields(request.args, USER_FIELDS)
+        # Admins plus users granted this project, answered by one indexed query
+        users, next_after = paginate(
+            User.with_project_permission_query(project_id).options(load_only(*columns(User, fields))),
+            User.id, after, limit
+        )
+        authorized_users = [
+            select_fields({
+                'id': lambda: user.id,
+                'username': lambda: user.username,
+                'is_admin': lambda: user.is_admin,
+                'created_at': lambda: user.created_at.isoformat(),
+                'last_login': lambda: user.last_login.isoformat() if user.last_login else None
+            }, fields)
+            for user in users
+        ]
+        
+        response = jsonify({
             'project_id': project.id,
             'project_name': project.name,
             'authorized_users': authorized_users
-        }), 200
+        })
+        return add_next_link(response, next_after), 200
 
     @bp.route('/api/auth/me/projects', methods=['GET'])
     @token_required
@@ -832,11 +936,7 @@ def create_routes(socketio):
             projects = Project.query.all()
         else:
             # Regular user can see only authorized projects
-            authorized_project_ids = user.get_authorised_projects()
-            if authorized_project_ids:
-                projects = Project.query.filter(Project.id.in_(authorized_project_ids)).all()
-            else:
-                projects = []
+            projects = user.authorised_projects_query().all()
         
         return jsonify({
             'user_id': user.id,
@@ -0,0 +1,134 @@
+import time
+from threading import Lock
+
+# A timer nobody watches stays loaded this long, so a page reload or a brief
+# reconnect does not have to reload it, and is then dropped from the tick loop
+IDLE_EVICT_SECONDS = 30
+
+class TimerSubscriptions:
+    """Which sockets watch which timers, with a subscriber count per timer"""
+
+    def __init__(self, idle_seconds=IDLE_EVICT_SECONDS):
+        self.idle_seconds = idle_seconds
+        self._by_sid = {}  # sid -> {timer_id: project_id} joined one by one with join_timer
+        self._project_timers = {}  # sid -> {timer_id: project_id} joined through join_project
+        self._counts = {}  # timer_id -> number of subscribed sockets
+        self._idle_since = {}  # timer_id -> monotonic time its last subscriber left
+        self._projects = {}  # sid -> project ids joined as a whole with join_project
+        self._lock = Lock()
+
+    def subscribe(self, sid, timer_id, project_id):
+        """Record that a socket joined a timer; joining the same timer twice counts once"""
+        with self._lock:
+            self._add(self._by_sid, sid, timer_id, project_id)
+
+    def unsubscribe(self, sid, timer_id):
+        """Forget a timer a socket joined and return its project id, or None if it was not joined.
+
+        The socket keeps watching the timer if it also joined its project.
+        """
+        with self._lock:
+            project_id = self._by_sid.get(sid, {}).pop(timer_id, None)
+            if project_id is not None and timer_id not in self._project_timers.get(sid, {}):
+                self._release(timer_id)
+            return project_id
+
+    def subscribe_project(self, sid, project_id, timer_ids):
+        """Record that a socket watches a whole project, including timers created later"""
+        with self._lock:
+            self._projects.setdefault(sid, set()).add(project_id)
+            for timer_id in timer_ids:
+                self._add(self._project_timers, sid, timer_id, project_id)
+
+    def unsubscribe_project(self, sid, project_id):
+        """Forget a project a socket joined as a whole; return whether it was joined.
+
+        Timers the socket also joined one by one stay subscribed.
+        """
+        with self._lock:
+            projects = self._projects.get(sid, set())
+            if project_id not in projects:
+                return False
+            projects.discard(project_id)
+            joined = self._project_timers.get(sid, {})
+            for timer_id in [t for t, p in joined.items() if p == project_id]:
+                del joined[timer_id]
+                if timer_id not in self._by_sid.get(sid, {}):
+                    self._release(timer_id)
+            return True
+
+    def track(self, timer_id, project_id):
+        """Subscribe the sockets watching a whole project to a new timer of it; return whether there are any"""
+        with self._lock:
+            sids = [sid for sid, projects in self._projects.items() if project_id in projects]
+            for sid in sids:
+                self._add(self._project_timers, sid, timer_id, project_id)
+        return bool(sids)
+
+    def drop_timer(self, timer_id):
+        """Forget a deleted timer for every socket"""
+        with self._lock:
+            for joined in (*self._by_sid.values(), *self._project_timers.values()):
+                joined.pop(timer_id, None)
+            self._counts.pop(timer_id, None)
+            self._idle_since.pop(timer_id, None)
+
+    def drop_socket(self, sid):
+        """Forget every timer of a disconnected socket and return {timer_id: project_id}"""
+        with self._lock:
+            self._projects.pop(sid, None)
+            joined = self._project_timers.pop(sid, {})
+            joined.update(self._by_sid.pop(sid, {}))
+            for timer_id in joined:
+                self._release(timer_id)
+            return joined
+
+    def clear(self):
+        """Forget every socket and timer"""
+        with self._lock:
+            self._by_sid.clear()
+            self._project_timers.clear()
+            self._counts.clear()
+            self._idle_since.clear()
+            self._projects.clear()
+
+    def _add(self, joined_by_sid, sid, timer_id, project_id):
+        # A socket counts once per timer, however it joined it
+        if timer_id not in self._by_sid.get(sid, {}) and timer_id not in self._project_timers.get(sid, {}):
+            self._counts[timer_id] = self._counts.get(timer_id, 0) + 1
+        joined_by_sid.setdefault(sid, {})[timer_id] = project_id
+        self._idle_since.pop(timer_id, None)
+
+    def _release(self, timer_id):
+        count = self._counts.get(timer_id, 0) - 1
+        if count > 0:
+            self._counts[timer_id] = count
+        else:
+            self._counts.pop(timer_id, None)
+            self._idle_since[timer_id] = time.monotonic()
+
+    def project_ids(self, sid):
+        """Projects a socket still watches at least one timer of, or joined as a whole"""
+        return (set(self._by_sid.get(sid, {}).values()) | set(self._project_timers.get(sid, {}).values())
+                | self._projects.get(sid, set()))
+
+    def timer_ids(self):
+        """Timers with at least one subscribed socket"""
+        return set(self._counts)
+
+    def subscriber_count(self, timer_id):
+        return self._counts.get(timer_id, 0)
+
+    def pop_idle(self, now=None):
+        """Return timers that have had no subscribers for idle_seconds and stop tracking them"""
+        now = now or time.monotonic()
+        with self._lock:
+            expired = [timer_id for timer_id, since in self._idle_since.items() if now - since >= self.idle_seconds]
+            for timer_id in expired:
+                del self._idle_since[timer_id]
+            return expired
+
+    def __contains__(self, timer_id):
+        return timer_id in self._counts
+
+timer_subscriptions = TimerSubscriptions()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for the coalesced timers_update frames negotiated with join_timer sync='batch'.
+Runs the app against an in-memory SQLite database with the Flask and Socket.IO test clients.
+"""
+
+import sys
+import os
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import socketio
+
+TIMER_COUNT = 8
+
+@pytest.fixture
+def timers(make_project):
+    """A project with TIMER_COUNT running timers; returns (project_id, timer_ids)"""
+    return make_project('Batch', [{'name': f'Talk {i}', 'duration': 600} for i in range(TIMER_COUNT)], start=True)
+
+def join_all(app, project_id, timer_ids, sync=None):
+    socket = socketio.test_client(app)
+    for timer_id in timer_ids:
+        data = {'project_id': project_id, 'timer_id': timer_id}
+        if sync:
+            data['sync'] = sync
+        socket.emit('join_timer', data)
+    socket.get_received()
+    return socket
+
+def test_one_frame_per_tick_for_the_project(app, timers, tick):
+    """A batch subscriber gets one timers_update per tick carrying every changed timer"""
+    project_id, timer_ids = timers
+
+    batch = join_all(app, project_id, timer_ids, sync='batch')
+    stream = join_all(app, project_id, timer_ids)
+    tick(1)
+    tick(1)
+
+    received = batch.get_received()
+    assert all(m['name'] == 'timers_update' for m in received), [m['name'] for m in received]
+    frames = [m['args'][0] for m in received]
+    assert len(frames) == 2 and all(frame['project_id'] == project_id for frame in frames)
+    assert all(sorted(t['id'] for t in frame['timers']) == sorted(timer_ids) for frame in frames)
+
+    # Streaming subscribers still get a frame per timer for the same ticks
+    updates = [m for m in stream.get_received() if m['name'] == 'timer_update']
+    assert len(updates) == len(frames) * TIMER_COUNT, (len(updates), len(frames))
+    batch.disconnect()
+    stream.disconnect()
+    print(f"✓ {len(frames)} batch frames replaced {len(updates)} per-timer frames")
+
+def test_changes_and_leaving(app, client, admin_headers, timers, tick):
+    """Pausing a timer reaches batch subscribers at once and leaving the last timer stops the frames"""
+    project_id, timer_ids = timers
+
+    batch = join_all(app, project_id, timer_ids[:2], sync='batch')
+    client.post(f'/api/projects/{project_id}/timers/{timer_ids[0]}/pause', headers=admin_headers)
+    frames = [m['args'][0] for m in batch.get_received() if m['name'] == 'timers_update']
+    paused = [t for frame in frames for t in frame['timers'] if t['id'] == timer_ids[0]]
+    assert paused and paused[-1]['paused'], frames
+
+    # Still joined to the second timer, so the project frames keep coming
+    batch.emit('leave_timer', {'timer_id': timer_ids[0]})
+    batch.get_received()
+    tick(1)
+    assert any(m['name'] == 'timers_update' for m in batch.get_received())
+
+    batch.emit('leave_timer', {'timer_id': timer_ids[1]})
+    batch.get_received()
+    tick(1)
+    assert batch.get_received() == []
+    batch.disconnect()
+    print("✓ Changes are pushed at once and leaving stops the frames")
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for POST /api/projects/<id>/timers/batch.
+Runs the app against an in-memory SQLite database with the Flask and Socket.IO test clients.
+"""
+
+import sys
+import os
+from datetime import timedelta
+from sqlalchemy import event
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import socketio
+from database import db
+from models import Timer
+
+TIMERS = [{'name': f'T{i}', 'duration': 60 * (i + 1)} for i in range(3)]
+
+def test_batch_starts_timers_in_lockstep_with_one_frame(app, client, admin_headers, make_project):
+    """Timers started together share one start time and clients get one timers_sync frame"""
+    project_id, timer_ids = make_project('Batch lockstep', TIMERS)
+
+    socket = socketio.test_client(app)
+    socket.emit('join_timer', {'project_id': project_id, 'timer_id': timer_ids[0], 'sync': 'deadline'})
+    socket.get_received()
+
+    response = client.post(f'/api/projects/{project_id}/timers/batch', headers=admin_headers, json={
+        'operations': [{'timer_id': timer_id, 'action': 'start'} for timer_id in timer_ids]
+    })
+    assert response.status_code == 200, response.get_json()
+    assert [t['paused'] for t in response.get_json()['timers']] == [False, False, False]
+
+    with app.app_context():
+        timers = [db.session.get(Timer, timer_id) for timer_id in timer_ids]
+        starts = {t.end_time - timedelta(seconds=t.duration) for t in timers}
+        assert len(starts) == 1, f"timers started at different times: {starts}"
+
+    frames = [m for m in socket.get_received() if m['name'] in ('timers_sync', 'timer_sync')]
+    assert [m['name'] for m in frames] == ['timers_sync']
+    assert [t['id'] for t in frames[0]['args'][0]['timers']] == timer_ids
+    socket.disconnect()
+    print("✓ Batch start keeps timers in lockstep and sends one frame")
+
+def test_batch_statements_do_not_grow_with_timers(app, client, admin_headers, make_project):
+    """A batch reads its timers with one query and does not reload them after the commit"""
+    project_id, timer_ids = make_project('Batch statements', [{'name': f'T{i}', 'duration': 60} for i in range(20)])
+
+    statements = []
+    with app.app_context():
+        engine = db.engine
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.post(f'/api/projects/{project_id}/timers/batch', headers=admin_headers, json={
+            'operations': [{'timer_id': timer_id, 'action': 'start'} for timer_id in timer_ids]
+        })
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    assert response.status_code == 200
+    assert sum('FROM timers' in s for s in statements) == 1, statements
+    assert len(statements) <= 5, statements
+    print(f"✓ A batch of {len(timer_ids)} timers runs {len(statements)} statements")
+
+def test_batch_is_all_or_nothing(app, client, admin_headers, make_project):
+    """An unknown timer or action rejects the whole batch without changing anything"""
+    project_id, timer_ids = make_project('Batch atomic', TIMERS)
+
+    response = client.post(f'/api/projects/{project_id}/timers/batch', headers=admin_headers, json={
+        'operations': [{'timer_id': timer_ids[0], 'action': 'start'}, {'timer_id': 999999, 'action': 'start'}]
+    })
+    assert response.status_code == 404
+
+    response = client.post(f'/api/projects/{project_id}/timers/batch', headers=admin_headers, json={
+        'operations': [{'timer_id': timer_ids[0], 'action': 'start'}, {'timer_id': timer_ids[1], 'action': 'explode'}]
+    })
+    assert response.status_code == 400
+
+    # true would otherwise pass as timer id 1
+    response = client.post(f'/api/projects/{project_id}/timers/batch', headers=admin_headers, json={
+        'operations': [{'timer_id': timer_ids[0], 'action': 'start'}, {'timer_id': True, 'action': 'start'}]
+    })
+    assert response.status_code == 400
+
+    with app.app_context():
+        assert db.session.get(Timer, timer_ids[0]).paused
+    print("✓ Batch is all or nothing")
+
+def test_batch_mixed_operations(app, client, admin_headers, make_project):
+    """Operations apply in order; pause and reset work alongside start"""
+    project_id, timer_ids = make_project('Batch mixed', TIMERS)
+
+    client.post(f'/api/projects/{project_id}/timers/batch', headers=admin_headers, json={
+        'operations': [{'timer_id': timer_id, 'action': 'start'} for timer_id in timer_ids]
+    })
+    response = client.post(f'/api/projects/{project_id}/timers/batch', headers=admin_headers, json={
+        'operations': [
+            {'timer_id': timer_ids[0], 'action': 'pause'},
+            {'timer_id': timer_ids[1], 'action': 'reset'},
+            {'timer_id': timer_ids[2], 'action': 'start'},
+        ]
+    })
+    assert response.status_code == 200
+    timers = response.get_json()['timers']
+    assert [t['paused'] for t in timers] == [True, True, False]
+    assert timers[1]['remaining_seconds'] == timers[1]['duration']
+
+    # A fresh client has no auth cookie
+    response = app.test_client().post(f'/api/projects/{project_id}/timers/batch', json={
+        'operations': [{'timer_id': timer_ids[2], 'action': 'pause'}]
+    })
+    assert response.status_code == 401
+    print("✓ Mixed batch operations apply in order")
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
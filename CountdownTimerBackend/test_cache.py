@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for the bounded TTL/LRU cache used by the authorization and token caches.
+"""
+
+import sys
+import os
+import time
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cache import TTLCache
+
+def test_entries_expire_after_ttl():
+    """Entries are returned until their TTL runs out"""
+    cache = TTLCache(maxsize=10, ttl=0.05)
+    cache.set('a', True)
+    assert cache.get('a') is True
+    time.sleep(0.06)
+    assert cache.get('a') is None
+    assert len(cache) == 0
+    print("✓ Entries expire after their TTL")
+
+def test_per_entry_ttl_overrides_default():
+    """A per-entry TTL wins over the default, and non-positive TTLs are not stored"""
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set('short', 1, ttl=0.05)
+    cache.set('never', 2, ttl=0)
+    time.sleep(0.06)
+    assert cache.get('short') is None
+    assert cache.get('never') is None
+    print("✓ Per-entry TTL overrides the default")
+
+def test_least_recently_used_entry_is_evicted():
+    """Reading an entry keeps it; the least recently used one is evicted when full"""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    print("✓ Least recently used entry is evicted")
+
+def test_discard_where_removes_matching_keys():
+    """Invalidation by predicate only drops matching keys"""
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set((1, 10), True)
+    cache.set((1, 11), False)
+    cache.set((2, 10), True)
+    cache.discard_where(lambda key: key[0] == 1)
+    assert cache.get((1, 10)) is None and cache.get((1, 11)) is None
+    assert cache.get((2, 10)) is True
+    print("✓ discard_where removes only matching keys")
+
+def main():
+    """Run all tests"""
+    print("=== CountdownTimer Cache Test ===\n")
+
+    tests = [
+        test_entries_expire_after_ttl,
+        test_per_entry_ttl_overrides_default,
+        test_least_recently_used_entry_is_evicted,
+        test_discard_where_removes_matching_keys,
+    ]
+    tests_passed = 0
+    for test in tests:
+        try:
+            test()
+            tests_passed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Test Results ===")
+    print(f"Passed: {tests_passed}/{len(tests)}")
+    return 0 if tests_passed == len(tests) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
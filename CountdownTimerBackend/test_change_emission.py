@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for change-driven timer_update emission from the tick loop.
+Runs the app against an in-memory SQLite database and drives send_timer_updates() by hand.
+"""
+
+import sys
+import os
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import socketio
+
+def received(socket, name):
+    return [m['args'][0] for m in socket.get_received() if m['name'] == name]
+
+def updates(socket):
+    return [m['args'][0] for m in socket.get_received() if m['name'] == 'timer_update']
+
+def test_paused_timer_is_sent_once(app, make_project, tick):
+    """A paused timer is not sent again by the tick loop after the join frame"""
+    project_id, (timer_id,) = make_project('Paused', [{'name': 'Idle', 'duration': 300}])
+    socket = socketio.test_client(app)
+    socket.emit('join_timer', {'project_id': project_id, 'timer_id': timer_id})
+    assert len(updates(socket)) == 1
+
+    tick()
+    tick()
+    assert updates(socket) == []
+    socket.disconnect()
+    print("✓ Paused timer is sent once")
+
+def test_running_timer_is_sent_once_per_second(app, make_project, tick):
+    """A running timer is sent when its displayed second changes, not on every tick"""
+    project_id, (timer_id,) = make_project('Running', [{'name': 'Talk', 'duration': 300}], start=True)
+    socket = socketio.test_client(app)
+    socket.emit('join_timer', {'project_id': project_id, 'timer_id': timer_id})
+    updates(socket)
+
+    tick(1)
+    tick()
+    sent = updates(socket)
+    assert len(sent) == 1 and sent[0]['remaining_seconds'] < 300
+    socket.disconnect()
+    print("✓ Running timer is sent once per second")
+
+def test_route_change_is_not_repeated_by_the_tick(app, client, admin_headers, make_project, tick):
+    """A state pushed by a route counts as sent, so the next tick does not push it again"""
+    project_id, (timer_id,) = make_project('Route', [{'name': 'Talk', 'duration': 300}], start=True)
+    socket = socketio.test_client(app)
+    socket.emit('join_timer', {'project_id': project_id, 'timer_id': timer_id})
+    tick(1)
+    updates(socket)
+
+    client.post(f'/api/projects/{project_id}/timers/{timer_id}/pause', headers=admin_headers)
+    sent = updates(socket)
+    assert len(sent) == 1 and sent[0]['paused']
+
+    tick()
+    tick()
+    assert updates(socket) == []
+    socket.disconnect()
+    print("✓ Route change is not repeated by the tick")
+
+def test_deadline_join_is_not_corrected_on_the_next_tick(app, make_project, tick):
+    """The timer_sync sent on join counts as the latest drift correction"""
+    project_id, (timer_id,) = make_project('Deadline', [{'name': 'Talk', 'duration': 300}], start=True)
+    socket = socketio.test_client(app)
+    socket.emit('join_timer', {'project_id': project_id, 'timer_id': timer_id, 'sync': 'deadline'})
+    assert len(received(socket, 'timer_sync')) == 1
+
+    tick(1)
+    tick(1)
+    assert received(socket, 'timer_sync') == []
+    socket.disconnect()
+    print("✓ Deadline join is not corrected on the next tick")
+
+def test_route_change_resets_the_drift_correction(app, client, admin_headers, make_project, tick):
+    """A resumed timer's timer_sync from the route is not followed by a correction on the next tick"""
+    project_id, (timer_id,) = make_project('Resume', [{'name': 'Talk', 'duration': 300}])
+    socket = socketio.test_client(app)
+    socket.emit('join_timer', {'project_id': project_id, 'timer_id': timer_id, 'sync': 'deadline'})
+    tick()
+    received(socket, 'timer_sync')
+
+    client.post(f'/api/projects/{project_id}/timers/{timer_id}/start', headers=admin_headers)
+    assert len(received(socket, 'timer_sync')) == 1
+    tick(1)
+    assert received(socket, 'timer_sync') == []
+    socket.disconnect()
+    print("✓ Route change resets the drift correction")
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
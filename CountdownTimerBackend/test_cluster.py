@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for running several workers behind one message queue.
+Two python-socketio servers share the in-process local:// queue to stand in
+for two worker processes, and two leader locks compete for one database.
+"""
+
+import sys
+import os
+import time
+import socketio
+import sqlalchemy
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cluster import Cluster, ClusterEvents, LocalManager, create_client_manager
+from leader import LeaderLock
+
+def start_worker(channel):
+    """Create a Socket.IO server and cluster for one simulated worker"""
+    server = socketio.Server(client_manager=create_client_manager('local://', channel=channel), async_mode='threading')
+    worker = Cluster()
+    worker.attach(server)
+    return worker
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_client_manager_for_url():
+    """Message queue URLs map to cluster-aware managers; no URL means a single worker"""
+    assert create_client_manager(None) is None
+    manager = create_client_manager('local://')
+    assert isinstance(manager, ClusterEvents) and isinstance(manager, LocalManager)
+    print("✓ Message queue URLs map to cluster-aware managers")
+
+def test_events_reach_other_workers_only():
+    """A published event is handled by every other worker but not by the sender"""
+    first, second = start_worker('events'), start_worker('events')
+    received = {'first': [], 'second': []}
+    first.on('timer_deleted', lambda data: received['first'].append(data))
+    second.on('timer_deleted', lambda data: received['second'].append(data))
+
+    first.publish('timer_deleted', {'timer_id': 7})
+    assert wait_for(lambda: received['second'] == [{'timer_id': 7}])
+    assert received['first'] == []
+    print("✓ Events reach other workers only")
+
+def test_leader_sees_timers_watched_by_other_workers():
+    """Watched timers announced by a worker show up in the leader's remote set"""
+    leader_worker, other_worker = start_worker('watch'), start_worker('watch')
+    other_worker.announce_watched({1, 2})
+    assert wait_for(lambda: leader_worker.remote_watched() == {1, 2})
+
+    other_worker.announce_watched({2})
+    assert wait_for(lambda: leader_worker.remote_watched() == {2})
+    assert other_worker.remote_watched() == set()
+    print("✓ Leader sees timers watched by other workers")
+
+def test_single_worker_publishing_is_a_no_op():
+    """Without a message queue nothing is published and nothing fails"""
+    server = socketio.Server(async_mode='threading')
+    worker = Cluster()
+    worker.attach(server)
+    assert not worker.enabled
+    worker.publish('timer_deleted', {'timer_id': 1})
+    worker.announce_watched({1})
+    print("✓ Single worker publishing is a no-op")
+
+def test_only_one_worker_is_leader(tmp_path):
+    """Two workers on one database: one leads until it releases the lock"""
+    engine = sqlalchemy.create_engine(f'sqlite:///{tmp_path / "leader.db"}')
+    first, second = LeaderLock('test-leader', lock_dir=tmp_path), LeaderLock('test-leader', lock_dir=tmp_path)
+    try:
+        assert first.try_acquire(engine)
+        assert not second.try_acquire(engine)
+        first.release()
+        assert second.try_acquire(engine)
+        assert not first.try_acquire(engine)
+    finally:
+        first.release()
+        second.release()
+        engine.dispose()
+    print("✓ Only one worker is leader")
+
+def test_single_worker_leads_without_the_lock(monkeypatch, tmp_path):
+    """Without a message queue the worker leads and leaves the lock to others, e.g. the debug reloader's child"""
+    import main
+    path = tmp_path / 'single.db'
+    monkeypatch.setenv('DATABASE_URL', f'sqlite:///{path}')
+    monkeypatch.delenv('SOCKETIO_MESSAGE_QUEUE', raising=False)
+    monkeypatch.setattr(main.leader, 'is_leader', False)
+    main.create_app()
+    assert main.leader.is_leader
+
+    engine = sqlalchemy.create_engine(f'sqlite:///{path}')
+    other = LeaderLock(lock_dir=tmp_path)
+    try:
+        assert other.try_acquire(engine)
+    finally:
+        other.release()
+        engine.dispose()
+    print("✓ A single worker leads without the lock")
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
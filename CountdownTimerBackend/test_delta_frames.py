@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script for the compact timer_delta frames negotiated with join_timer sync='delta'.
+Runs the app against an in-memory SQLite database with the Flask and Socket.IO test clients.
+"""
+
+import sys
+import os
+import json
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import socketio
+from broadcast import delta_frame
+
+@pytest.fixture
+def timer(make_project):
+    """A project with one running timer; returns (project_id, timer_id)"""
+    project_id, (timer_id,) = make_project('Delta', [{
+        'name': 'Keynote', 'duration': 600, 'description': 'Opening keynote on the main stage, hall A'
+    }], start=True)
+    return project_id, timer_id
+
+def frames(socket):
+    return [(m['name'], m['args'][0]) for m in socket.get_received() if m['name'] in ('timer_update', 'timer_delta')]
+
+def test_delta_subscribers_get_metadata_once(app, timer, tick):
+    """Join sends one full timer_update, then every second only a [id, remaining, paused] record"""
+    project_id, timer_id = timer
+
+    socket = socketio.test_client(app)
+    socket.emit('join_timer', {'project_id': project_id, 'timer_id': timer_id, 'sync': 'delta'})
+    joined = frames(socket)
+    assert [name for name, _ in joined] == ['timer_update']
+    assert joined[0][1]['description'].startswith('Opening keynote')
+
+    tick(1)
+    tick(1)
+    ticks = frames(socket)
+    assert len(ticks) == 2 and all(name == 'timer_delta' for name, _ in ticks), ticks
+    for _, record in ticks:
+        assert record[0] == timer_id and record[2] == 0 and 590 <= record[1] <= 600
+    socket.disconnect()
+    print("✓ Delta subscribers get metadata once, then compact records")
+
+def test_metadata_changes_resend_the_full_frame(app, client, admin_headers, timer, tick):
+    """Editing a timer sends delta subscribers a full timer_update with the new metadata"""
+    project_id, timer_id = timer
+
+    socket = socketio.test_client(app)
+    socket.emit('join_timer', {'project_id': project_id, 'timer_id': timer_id, 'sync': 'delta'})
+    stream = socketio.test_client(app)
+    stream.emit('join_timer', {'project_id': project_id, 'timer_id': timer_id})
+    socket.get_received()
+    stream.get_received()
+
+    client.put(f'/api/projects/{project_id}/timers/{timer_id}', json={'name': 'Closing'}, headers=admin_headers)
+    updates = [payload for name, payload in frames(socket) if name == 'timer_update']
+    assert updates and updates[-1]['name'] == 'Closing'
+    # Streaming subscribers never see delta records
+    assert all(name == 'timer_update' for name, _ in frames(stream))
+
+    socket.emit('leave_timer', {'timer_id': timer_id})
+    socket.get_received()
+    tick(1)
+    assert frames(socket) == []
+    socket.disconnect()
+    stream.disconnect()
+    print("✓ Metadata changes resend the full frame")
+
+def test_delta_frame_is_a_fraction_of_the_full_frame():
+    """A delta record is a small fraction of the full frame it replaces"""
+    payload = {'id': 1234, 'name': 'Keynote', 'remaining_seconds': 421, 'paused': False, 'duration': 600,
+               'description': 'Opening keynote on the main stage, hall A', 'project_id': 12}
+    full = len(f'42{json.dumps(["timer_update", payload], separators=(",", ":"))}')
+    delta = len(f'42{json.dumps(["timer_delta", delta_frame(payload)], separators=(",", ":"))}')
+    assert delta * 5 <= full, (delta, full)
+    print(f"✓ Delta frame is {delta} bytes against {full} for the full frame")
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
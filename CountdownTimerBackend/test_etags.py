@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for ETag / If-None-Match conditional GETs on project and timer reads.
+Runs the app against an in-memory SQLite database with the Flask test client.
+"""
+
+import sys
+import os
+from sqlalchemy import event
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import db
+
+@pytest.fixture
+def project(client, admin_headers, make_project):
+    """A project with one selected timer; returns (project_id, timer_id)"""
+    project_id, (timer_id,) = make_project('ETag', [{'name': 'T', 'duration': 60}])
+    client.post(f'/api/projects/{project_id}/select-timer/{timer_id}', headers=admin_headers)
+    return project_id, timer_id
+
+def revalidate(client, url):
+    """GET url, then GET it again with the ETag it returned; returns (first, second)"""
+    first = client.get(url)
+    assert first.status_code == 200 and first.headers.get('ETag'), url
+    second = client.get(url, headers={'If-None-Match': first.headers['ETag']})
+    return first, second
+
+def test_unchanged_reads_get_304_without_timer_queries(app, client, project):
+    """A matching If-None-Match is answered without building the body or reading timers"""
+    project_id, timer_id = project
+
+    statements = []
+    with app.app_context():
+        engine = db.engine
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    for url in ['/api/projects', f'/api/projects/{project_id}',
+                f'/api/projects/{project_id}/selected-timer', f'/api/projects/{project_id}/timers/{timer_id}']:
+        first, _ = revalidate(client, url)
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            second = client.get(url, headers={'If-None-Match': first.headers['ETag']})
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+        assert second.status_code == 304, url
+        assert second.data == b''
+        assert second.headers['ETag'] == first.headers['ETag']
+        assert int(second.headers['X-Server-Time-Ms']) >= int(first.headers['X-Server-Time-Ms'])
+    assert statements and not any('FROM timers' in s for s in statements), statements
+    print("✓ Unchanged reads get 304 without touching timers")
+
+def test_every_mutation_changes_the_etag(client, admin_headers, project):
+    """Timer controls, edits, selection and imports each invalidate the project's ETag"""
+    project_id, timer_id = project
+    base = f'/api/projects/{project_id}'
+
+    mutations = [
+        lambda: client.post(f'{base}/timers/{timer_id}/start', headers=admin_headers),
+        lambda: client.post(f'{base}/timers/{timer_id}/pause', headers=admin_headers),
+        lambda: client.put(f'{base}/timers/{timer_id}', json={'name': 'Renamed'}, headers=admin_headers),
+        lambda: client.post(f'{base}/timers/batch', json={'operations': [{'timer_id': timer_id, 'action': 'reset'}]},
+                            headers=admin_headers),
+        lambda: client.post(f'{base}/deselect-timer', headers=admin_headers),
+        lambda: client.put(base, json={'description': 'changed'}, headers=admin_headers),
+        lambda: client.post(f'{base}/timers/import', data='{"name": "Imported", "duration": 5}\n',
+                            content_type='application/x-ndjson', headers=admin_headers),
+    ]
+    for mutation in mutations:
+        etag = client.get(base).headers['ETag']
+        list_etag = client.get('/api/projects').headers['ETag']
+        assert mutation().status_code < 300
+        response = client.get(base, headers={'If-None-Match': etag})
+        assert response.status_code == 200 and response.headers['ETag'] != etag
+        assert client.get('/api/projects', headers={'If-None-Match': list_etag}).status_code == 200
+    print("✓ Every mutation changes the ETag")
+
+def test_deleting_a_timer_changes_the_etag(client, admin_headers, project):
+    """Deleting a timer or another project changes the ETags that cover it"""
+    project_id, timer_id = project
+    other_id = client.post('/api/projects', json={'name': 'ETag other'}, headers=admin_headers).get_json()['id']
+
+    first, _ = revalidate(client, f'/api/projects/{project_id}')
+    client.delete(f'/api/projects/{project_id}/timers/{timer_id}', headers=admin_headers)
+    response = client.get(f'/api/projects/{project_id}', headers={'If-None-Match': first.headers['ETag']})
+    assert response.status_code == 200 and response.get_json()['timers'] == []
+
+    list_etag = client.get('/api/projects').headers['ETag']
+    client.delete(f'/api/projects/{other_id}', headers=admin_headers)
+    assert client.get('/api/projects', headers={'If-None-Match': list_etag}).status_code == 200
+    assert client.get(f'/api/projects/{other_id}', headers={'If-None-Match': '"*"'}).status_code == 404
+    print("✓ Deletions change the ETag")
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for the end_time expiry scheduler.
+Checks heap ordering and rescheduling, and that a running timer is paused and
+persisted at its deadline by the expiry task without anyone watching it.
+"""
+
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from expiry import ExpiryScheduler
+
+def test_timers_fire_in_deadline_order():
+    """pop_due returns only timers whose deadline has passed, earliest first"""
+    scheduler = ExpiryScheduler()
+    now = datetime.now()
+    scheduler.schedule(1, now + timedelta(seconds=20))
+    scheduler.schedule(2, now + timedelta(seconds=10))
+    scheduler.schedule(3, now + timedelta(seconds=30))
+
+    base = now.timestamp()
+    assert 9 < scheduler.next_delay(now=base) <= 10
+    assert scheduler.pop_due(now=base + 5) == []
+    assert scheduler.pop_due(now=base + 25) == [2, 1]
+    assert list(scheduler._deadlines) == [3]
+    print("✓ Timers fire in deadline order")
+
+def test_rescheduled_and_cancelled_timers_do_not_fire_early():
+    """A moved deadline replaces the old one and a cancelled timer never fires"""
+    scheduler = ExpiryScheduler()
+    now = datetime.now()
+    base = now.timestamp()
+    scheduler.schedule(1, now + timedelta(seconds=10))
+    scheduler.schedule(1, now + timedelta(seconds=40))
+    scheduler.schedule(2, now + timedelta(seconds=15))
+    scheduler.cancel(2)
+
+    assert scheduler.pop_due(now=base + 20) == []
+    assert 39 < scheduler.next_delay(now=base) <= 40
+    assert scheduler.pop_due(now=base + 41) == [1]
+    assert scheduler.next_delay() is None and len(scheduler) == 0
+    print("✓ Rescheduled and cancelled timers do not fire early")
+
+def test_stale_entries_are_compacted():
+    """Pause/resume churn does not grow the heap without bound"""
+    scheduler = ExpiryScheduler()
+    now = datetime.now()
+    for i in range(1000):
+        scheduler.schedule(1, now + timedelta(seconds=i + 1))
+    assert len(scheduler._heap) < 100
+    assert scheduler.pop_due(now=now.timestamp() + 10) == []
+    print("✓ Stale heap entries are compacted")
+
+def test_expiry_task_pauses_timer_at_deadline(app):
+    """A running timer is paused in the database at its deadline without a subscriber"""
+    import gevent
+    import main
+    from database import db
+    from models import Project, Timer
+
+    with app.app_context():
+        project = Project(name='Expiry', description='')
+        db.session.add(project)
+        db.session.flush()
+        timer = Timer(name='Short', duration=1, description='', project_id=project.id)
+        db.session.add(timer)
+        db.session.commit()
+        timer.start()
+        main.timer_states.load(timer)
+        timer_id, deadline = timer.id, timer.end_time.timestamp()
+
+    gevent.sleep(deadline - time.time() + 0.2)
+
+    with app.app_context():
+        timer = db.session.get(Timer, timer_id)
+        assert timer.paused, "timer should have been paused at its deadline"
+        assert timer.remaining_seconds == 0
+        assert timer_id not in main.timer_expiry
+    print("✓ Expiry task pauses a timer at its deadline")
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
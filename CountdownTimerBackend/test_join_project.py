@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test script for join_project, which subscribes a socket to every timer of a project at once.
+Runs the app against an in-memory SQLite database with the Flask and Socket.IO test clients.
+"""
+
+import sys
+import os
+from sqlalchemy import event
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import main as backend
+from main import socketio
+from database import db
+from subscriptions import timer_subscriptions
+
+def session_timers(count=3):
+    return [{'name': f'Session {i}', 'duration': 600} for i in range(count)]
+
+def received(socket, *names):
+    return [(m['name'], m['args'][0]) for m in socket.get_received() if m['name'] in names]
+
+def test_one_query_and_one_snapshot(app, make_project):
+    """Joining a project runs one query and answers with a single frame for all its timers"""
+    project_id, timer_ids = make_project('Snapshot', session_timers(5))
+
+    statements = []
+    with app.app_context():
+        engine = db.engine
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    socket = socketio.test_client(app)
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        socket.emit('join_project', {'project_id': project_id, 'sync': 'deadline'})
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    assert len(statements) == 1, statements
+
+    frames = socket.get_received()
+    assert [m['name'] for m in frames] == ['timers_sync']
+    snapshot = frames[0]['args'][0]
+    assert snapshot['project_id'] == project_id
+    assert sorted(t['id'] for t in snapshot['timers']) == sorted(timer_ids)
+    assert all('end_time_ms' in t for t in snapshot['timers'])
+    assert all(timer_subscriptions.subscriber_count(t) == 1 for t in timer_ids)
+
+    socket.emit('join_project', {'project_id': 999999})
+    assert received(socket, 'error')[0][1]['code'] == 404
+    socket.emit('join_project', {'project_id': project_id, 'sync': 'delta'})
+    assert received(socket, 'error')[0][1]['code'] == 400
+    socket.disconnect()
+    print("✓ One query and one snapshot frame")
+
+def test_added_and_deleted_timers_are_tracked(app, client, admin_headers, make_project):
+    """Timers created after the join are pushed and subscribed; deleted ones are announced"""
+    project_id, _ = make_project('Tracking', session_timers())
+
+    socket = socketio.test_client(app)
+    socket.emit('join_project', {'project_id': project_id, 'sync': 'deadline'})
+    socket.get_received()
+
+    new_id = client.post(f'/api/projects/{project_id}/timers', headers=admin_headers,
+                         json={'name': 'Late addition', 'duration': 300}).get_json()['id']
+    syncs = received(socket, 'timer_sync')
+    assert syncs and syncs[-1][1]['id'] == new_id and syncs[-1][1]['name'] == 'Late addition'
+    assert timer_subscriptions.subscriber_count(new_id) == 1
+
+    client.post(f'/api/projects/{project_id}/timers/{new_id}/start', headers=admin_headers)
+    syncs = received(socket, 'timer_sync')
+    assert len(syncs) == 1 and not syncs[0][1]['paused']
+
+    client.delete(f'/api/projects/{project_id}/timers/{new_id}', headers=admin_headers)
+    assert received(socket, 'timer_removed') == [('timer_removed', {'project_id': project_id, 'timer_id': new_id})]
+    # What the background loop does: poll the timers tracked since the join, then drop deleted ones
+    backend.active_timers.update(timer_subscriptions.timer_ids())
+    with app.app_context():
+        backend.evict_idle_timers()
+    assert new_id not in timer_subscriptions and new_id not in backend.active_timers
+    socket.disconnect()
+    print("✓ Added and deleted timers are tracked")
+
+def test_imported_timers_and_deleted_projects_are_pushed(app, client, admin_headers, make_project):
+    """An import reaches the project's sockets as one timers_sync; deleting the project removes every timer"""
+    project_id, timer_ids = make_project('Import push', session_timers(1))
+
+    socket = socketio.test_client(app)
+    socket.emit('join_project', {'project_id': project_id, 'sync': 'deadline'})
+    socket.get_received()
+
+    lines = ''.join(f'{{"name": "Imported {i}", "duration": 60}}\n' for i in range(3))
+    client.post(f'/api/projects/{project_id}/timers/import', data=lines,
+                content_type='application/x-ndjson', headers=admin_headers)
+    frames = received(socket, 'timers_sync', 'timer_sync')
+    assert [name for name, _ in frames] == ['timers_sync'], frames
+    imported = [t['id'] for t in frames[0][1]['timers']]
+    assert [t['name'] for t in frames[0][1]['timers']] == [f'Imported {i}' for i in range(3)]
+    assert all(timer_subscriptions.subscriber_count(t) == 1 for t in imported)
+
+    client.delete(f'/api/projects/{project_id}', headers=admin_headers)
+    removed = [payload['timer_id'] for _, payload in received(socket, 'timer_removed')]
+    assert sorted(removed) == sorted(timer_ids + imported)
+    socket.disconnect()
+    print("✓ Imported timers and deleted projects are pushed")
+
+def test_batch_stream_and_leaving(app, client, admin_headers, make_project, tick):
+    """Without sync the project streams timers_update frames until the socket leaves"""
+    project_id, timer_ids = make_project('Project stream', session_timers())
+
+    socket = socketio.test_client(app)
+    socket.emit('join_project', {'project_id': project_id})
+    snapshot = received(socket, 'timers_update')
+    assert len(snapshot) == 1 and len(snapshot[0][1]['timers']) == len(timer_ids)
+
+    for timer_id in timer_ids:
+        client.post(f'/api/projects/{project_id}/timers/{timer_id}/start', headers=admin_headers)
+    socket.get_received()
+    tick(1)
+    frames = received(socket, 'timers_update', 'timer_update', 'timer_sync')
+    assert len(frames) == 1 and all(name == 'timers_update' for name, _ in frames)
+    assert sorted(t['id'] for t in frames[0][1]['timers']) == sorted(timer_ids)
+
+    socket.emit('leave_project', {'project_id': project_id})
+    assert all(timer_subscriptions.subscriber_count(t) == 0 for t in timer_ids)
+    socket.get_received()
+    tick(1)
+    assert socket.get_received() == []
+    socket.disconnect()
+    print("✓ Batch stream stops after leaving the project")
+
+def test_leaving_keeps_timers_joined_one_by_one(app, client, admin_headers, make_project):
+    """A timer the socket joined with join_timer stays subscribed after it leaves the project"""
+    project_id, timer_ids = make_project('Project and timer', session_timers(2))
+
+    socket = socketio.test_client(app)
+    socket.emit('join_timer', {'project_id': project_id, 'timer_id': timer_ids[0], 'sync': 'deadline'})
+    socket.emit('join_project', {'project_id': project_id, 'sync': 'deadline'})
+    socket.emit('leave_project', {'project_id': project_id})
+    assert timer_subscriptions.subscriber_count(timer_ids[0]) == 1
+    assert timer_subscriptions.subscriber_count(timer_ids[1]) == 0
+    socket.get_received()
+
+    client.post(f'/api/projects/{project_id}/timers/{timer_ids[0]}/start', headers=admin_headers)
+    assert [payload['id'] for _, payload in received(socket, 'timer_sync')] == [timer_ids[0]]
+    client.post(f'/api/projects/{project_id}/timers/{timer_ids[1]}/start', headers=admin_headers)
+    assert received(socket, 'timer_sync', 'timers_sync') == []
+
+    socket.emit('join_project', {'project_id': project_id, 'sync': 'deadline'})
+    socket.emit('leave_timer', {'timer_id': timer_ids[0]})
+    assert timer_subscriptions.subscriber_count(timer_ids[0]) == 1
+    socket.disconnect()
+    print("✓ Leaving the project keeps timers joined one by one")
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
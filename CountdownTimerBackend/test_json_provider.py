@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for the fast JSON provider used by API responses and Socket.IO packets.
+Checks that its output matches Flask's default provider and that an emit is
+encoded once however many sockets receive it.
+"""
+
+import sys
+import os
+import json
+from datetime import datetime
+from decimal import Decimal
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask.json.provider import DefaultJSONProvider
+from main import socketio
+import json_provider
+from json_provider import FastJSONProvider, socket_json
+
+def test_output_matches_default_provider(app):
+    """Values, key order and Flask's date and Decimal handling survive the fast path"""
+    fast, default = FastJSONProvider(app), DefaultJSONProvider(app)
+    payload = {
+        'zeta': 1, 'alpha': [True, None, 1.5], 'name': 'Zürich',
+        'when': datetime(2024, 1, 2, 3, 4, 5), 'price': Decimal('1.10'),
+        'nested': {'b': 2, 'a': {'d': 4, 'c': 3}}, 'huge': 2 ** 70,
+    }
+    fast_text, default_text = fast.dumps(payload), default.dumps(payload, separators=(',', ':'))
+    assert json.loads(fast_text) == json.loads(default_text)
+    assert list(json.loads(fast_text)) == list(json.loads(default_text))
+    assert fast.loads('{"a": [1, 2]}') == {'a': [1, 2]}
+
+    with app.test_request_context():
+        body = fast.response(payload).get_data(as_text=True)
+        assert body.endswith('\n') and json.loads(body) == json.loads(default_text)
+        assert fast.dumps(payload, indent=2) == default.dumps(payload, indent=2)
+    print("✓ Output matches the default provider")
+
+def test_app_uses_provider_and_rejects_bad_json(app, client):
+    """Routes answer through the provider and malformed request bodies are still a 400"""
+    assert isinstance(app.json, FastJSONProvider)
+    response = client.post('/api/auth/login', data='{not json', content_type='application/json')
+    assert response.status_code == 400
+    assert client.get('/api/projects').get_json() is not None
+    print("✓ App uses the provider and rejects malformed JSON")
+
+def test_emit_is_encoded_once_for_every_recipient(app):
+    """One emit to a room of many sockets runs the encoder once and sends every socket the same packet"""
+    server = socketio.server
+    # Plain room members rather than test clients, which re-encode packets to check them
+    sids = [server.manager.connect(f'eio-{i}', '/') for i in range(5)]
+    for sid, eio_sid in zip(sids, [f'eio-{i}' for i in range(5)]):
+        server.manager.enter_room(sid, '/', 'encode_once', eio_sid=eio_sid)
+
+    calls, sent = [], []
+    original_dumps, original_send = socket_json.dumps, server._send_eio_packet
+    socket_json.dumps = lambda obj, **kwargs: calls.append(obj) or original_dumps(obj, **kwargs)
+    server._send_eio_packet = lambda eio_sid, pkt: sent.append((eio_sid, pkt))
+    try:
+        socketio.emit('timer_update', {'id': 1, 'remaining_seconds': 42, 'paused': False}, room='encode_once')
+    finally:
+        socket_json.dumps, server._send_eio_packet = original_dumps, original_send
+        for sid in sids:
+            server.manager.disconnect(sid, '/')
+
+    assert len(calls) == 1, calls
+    assert sorted(eio_sid for eio_sid, _ in sent) == [f'eio-{i}' for i in range(5)]
+    assert len({id(pkt) for _, pkt in sent}) == 1
+    assert json.loads(sent[0][1].data[1:]) == ['timer_update', {'id': 1, 'remaining_seconds': 42, 'paused': False}]
+    print("✓ An emit is encoded once for every recipient")
+
+def test_falls_back_without_orjson(app):
+    """Without orjson installed the standard library does all the work"""
+    installed = json_provider.orjson
+    json_provider.orjson = None
+    try:
+        fast = FastJSONProvider(app)
+        assert fast.dumps({'b': 1, 'a': 2}) == '{"a": 2, "b": 1}'
+        assert socket_json.dumps({'a': 1}, separators=(',', ':')) == '{"a":1}'
+        assert socket_json.loads('[1]') == [1]
+    finally:
+        json_provider.orjson = installed
+    print("✓ Falls back to the standard library without orjson")
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
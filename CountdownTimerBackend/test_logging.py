@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for the structured, leveled logger that replaced the debug print() calls.
+Runs the app against an in-memory SQLite database with the Flask test client.
+"""
+
+import sys
+import os
+import io
+import json
+import logging
+from sqlalchemy import event
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import db
+from logs import StructuredFormatter, SamplingFilter, configure_logging, flush_logs, get_logger
+
+def test_records_are_json_lines_with_fields():
+    """Each record is one JSON object carrying the extra= fields and any traceback"""
+    record = get_logger('test').makeRecord('countdown.test', logging.INFO, __file__, 1,
+                                           'Timer %s selected', (7,), None, extra={'project_id': 3})
+    entry = json.loads(StructuredFormatter().format(record))
+    assert entry['message'] == 'Timer 7 selected' and entry['project_id'] == 3
+    assert entry['level'] == 'INFO' and entry['logger'] == 'countdown.test' and 'time' in entry
+
+    stream = io.StringIO()
+    logger = configure_logging(level='INFO', stream=stream)
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        get_logger('test').exception('Timer update failed', extra={'timer_id': 5})
+    get_logger('test').debug('Not at info level')
+    flush_logs()
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(lines) == 1 and lines[0]['timer_id'] == 5 and 'ValueError: boom' in lines[0]['exception']
+    assert not logger.propagate
+    print("✓ Records are JSON lines with their fields")
+
+def test_debug_records_are_sampled():
+    """The sample rate thins out debug records but never drops anything above debug"""
+    debug = logging.makeLogRecord({'levelno': logging.DEBUG})
+    warning = logging.makeLogRecord({'levelno': logging.WARNING})
+    none, every = SamplingFilter(0), SamplingFilter(1)
+    assert not none.filter(debug) and none.filter(warning)
+    assert every.filter(debug)
+    kept = sum(SamplingFilter(0.25).filter(debug) for _ in range(4000))
+    assert 700 < kept < 1300, kept
+    print("✓ Debug records are sampled")
+
+def test_default_admin_password_is_not_logged(monkeypatch, capfd):
+    """Creating the default admin logs its username and a warning, never the password"""
+    from main import create_app
+    monkeypatch.setenv('DATABASE_URL', 'sqlite://')
+    monkeypatch.setenv('DEFAULT_ADMIN_PASSWORD', 'not-in-the-logs')
+    create_app()
+    flush_logs()
+    entries = [json.loads(line) for line in capfd.readouterr().err.splitlines() if line.startswith('{')]
+    created = [e for e in entries if e['message'].startswith('Created default admin user')]
+    assert len(created) == 1 and created[0]['level'] == 'WARNING'
+    assert created[0]['username'] == os.getenv('DEFAULT_ADMIN_USERNAME', 'admin') and 'password' not in created[0]
+    assert not any('not-in-the-logs' in json.dumps(e) for e in entries)
+    print("✓ The default admin password is not logged")
+
+def test_selection_verifies_only_at_debug_level(app, client, admin_headers, make_project):
+    """Selecting a timer runs no query after its commit unless the logger is at debug level"""
+    project_id, (timer_id,) = make_project('Logging', [{'name': 'T', 'duration': 60}])
+    with app.app_context():
+        engine = db.engine
+
+    def after_update(level):
+        stream = io.StringIO()
+        configure_logging(level=level, stream=stream)
+        statements = []
+        record = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            client.post(f'/api/projects/{project_id}/deselect-timer', headers=admin_headers)
+            del statements[:]
+            response = client.post(f'/api/projects/{project_id}/select-timer/{timer_id}', headers=admin_headers)
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+        assert response.status_code == 200
+        flush_logs()
+        update = next(i for i, s in enumerate(statements) if s.startswith('UPDATE projects SET selected_timer_id'))
+        entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+        selected = [e for e in entries if e['message'] == 'Timer selected']
+        return statements[update + 1:], selected[-1]
+
+    later, entry = after_update('INFO')
+    assert later == [], later
+    assert entry['timer_id'] == timer_id and entry['previous_timer_id'] is None
+    assert 'persisted_timer_id' not in entry
+
+    later, entry = after_update('DEBUG')
+    assert len(later) == 1 and 'FROM projects' in later[0], later
+    assert entry['persisted_timer_id'] == timer_id
+    configure_logging()
+    print("✓ Selection verifies the write only at debug level")
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for the versioned schema migrations.
+Runs against a temporary SQLite database, so no PostgreSQL server is needed.
+"""
+
+import sys
+import os
+from flask import Flask
+import sqlalchemy
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import db
+import models, auth
+from migrations import migrate, ensure_schema, get_schema_version, LATEST_VERSION
+
+def create_test_app():
+    """Create a Flask app bound to an in-memory SQLite database"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+def test_fresh_database_is_stamped_latest():
+    """A fresh database is created at the latest shape without running old migrations"""
+    app = create_test_app()
+    with app.app_context():
+        applied = migrate(db, log=lambda message: None)
+        assert applied == []
+        assert get_schema_version(db.engine) == LATEST_VERSION
+        assert sqlalchemy.inspect(db.engine).has_table('timers')
+    print("✓ Fresh database is stamped at the latest version")
+
+def test_legacy_database_is_upgraded():
+    """A pre-versioning database gets its missing columns and indexes"""
+    app = create_test_app()
+    with app.app_context():
+        with db.engine.begin() as conn:
+            conn.execute(sqlalchemy.text("CREATE TABLE projects (id INTEGER PRIMARY KEY, name VARCHAR(80) NOT NULL UNIQUE)"))
+            conn.execute(sqlalchemy.text(
+                "CREATE TABLE timers (id INTEGER PRIMARY KEY, duration INTEGER NOT NULL, end_time DATETIME NOT NULL, "
+                "project_id INTEGER, remaining_seconds INTEGER NOT NULL DEFAULT 0, description TEXT)"
+            ))
+        assert get_schema_version(db.engine) is None
+
+        applied = migrate(db, log=lambda message: None)
+        assert [m.version for m in applied] == list(range(1, LATEST_VERSION + 1))
+        assert get_schema_version(db.engine) == LATEST_VERSION
+
+        insp = sqlalchemy.inspect(db.engine)
+        assert {'description', 'selected_timer_id'} <= {c['name'] for c in insp.get_columns('projects')}
+        assert {'name', 'paused'} <= {c['name'] for c in insp.get_columns('timers')}
+        assert 'ix_timers_project_id_id' in {i['name'] for i in insp.get_indexes('timers')}
+        assert insp.has_table('user_project_permissions')
+        assert 'authorised_projects' not in {c['name'] for c in insp.get_columns('users')}
+
+        # Running again is a no-op
+        assert migrate(db, log=lambda message: None) == []
+    print("✓ Legacy database is upgraded to the latest version")
+
+def test_json_permissions_are_moved_to_join_table():
+    """users.authorised_projects JSON lists become user_project_permissions rows"""
+    app = create_test_app()
+    with app.app_context():
+        with db.engine.begin() as conn:
+            conn.execute(sqlalchemy.text("CREATE TABLE projects (id INTEGER PRIMARY KEY, name VARCHAR(80) NOT NULL UNIQUE)"))
+            conn.execute(sqlalchemy.text("INSERT INTO projects (id, name) VALUES (1, 'One'), (2, 'Two')"))
+            conn.execute(sqlalchemy.text(
+                "CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR(80) NOT NULL UNIQUE, "
+                "password_hash VARCHAR(128) NOT NULL, is_admin BOOLEAN NOT NULL, created_at DATETIME NOT NULL, "
+                "last_login DATETIME, authorised_projects TEXT)"
+            ))
+            conn.execute(sqlalchemy.text(
+                "INSERT INTO users (id, username, password_hash, is_admin, created_at, authorised_projects) VALUES "
+                "(1, 'alice', 'x', 0, '2024-01-01', '[1, 2, 99]'), "
+                "(2, 'bob', 'x', 0, '2024-01-01', 'not json'), "
+                "(3, 'carol', 'x', 0, '2024-01-01', NULL)"
+            ))
+
+        migrate(db, log=lambda message: None)
+
+        alice = db.session.get(auth.User, 1)
+        bob = db.session.get(auth.User, 2)
+        assert alice.get_authorised_projects() == [1, 2]  # project 99 no longer exists
+        assert bob.get_authorised_projects() == []
+        assert alice.has_project_permission(2) and not bob.has_project_permission(2)
+        assert [u.username for u in auth.User.with_project_permission_query(1)] == ['alice']
+    print("✓ JSON permissions are moved into the join table")
+
+def test_ensure_schema_refuses_when_auto_migrate_disabled():
+    """Startup refuses to run against an outdated schema when AUTO_MIGRATE is off"""
+    app = create_test_app()
+    previous = os.environ.get('AUTO_MIGRATE')
+    os.environ['AUTO_MIGRATE'] = 'False'
+    try:
+        with app.app_context():
+            try:
+                ensure_schema(db)
+                raise AssertionError("ensure_schema should have raised")
+            except RuntimeError:
+                pass
+            migrate(db, log=lambda message: None)
+            ensure_schema(db)  # up to date now, no error
+    finally:
+        if previous is None:
+            os.environ.pop('AUTO_MIGRATE', None)
+        else:
+            os.environ['AUTO_MIGRATE'] = previous
+    print("✓ Outdated schema is refused when AUTO_MIGRATE is disabled")
+
+def main():
+    """Run all tests"""
+    print("=== CountdownTimer Schema Migration Test ===\n")
+
+    tests = [
+        test_fresh_database_is_stamped_latest,
+        test_legacy_database_is_upgraded,
+        test_json_permissions_are_moved_to_join_table,
+        test_ensure_schema_refuses_when_auto_migrate_disabled,
+    ]
+    tests_passed = 0
+    for test in tests:
+        try:
+            test()
+            tests_passed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Test Results ===")
+    print(f"Passed: {tests_passed}/{len(tests)}")
+    return 0 if tests_passed == len(tests) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
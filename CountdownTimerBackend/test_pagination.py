@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for keyset pagination (?after=&limit=) and field selection (?fields=)
+on the project and user list endpoints.
+Runs the app against an in-memory SQLite database with the Flask test client.
+"""
+
+import sys
+import os
+import re
+from sqlalchemy import event
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import db
+
+def follow_pages(client, url, headers=None, key=None):
+    """Collect every item by following Link: rel="next" headers; returns (items, pages)"""
+    items, pages = [], 0
+    while url:
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        items.extend(body[key] if key else body)
+        pages += 1
+        match = re.match(r'<http://localhost([^>]*)>; rel="next"', response.headers.get('Link', ''))
+        url = match.group(1) if match else None
+    return items, pages
+
+def test_pages_cover_the_whole_list_once(client, admin_headers):
+    """Walking the pages returns every project exactly once, in id order"""
+    for i in range(7):
+        client.post('/api/projects', json={'name': f'Paged {i}', 'description': 'x'}, headers=admin_headers)
+
+    everything = client.get('/api/projects').get_json()
+    assert 'Link' not in client.get('/api/projects').headers
+    paged, pages = follow_pages(client, '/api/projects?limit=3')
+    assert paged == everything
+    assert pages == (len(everything) + 2) // 3
+    assert [p['id'] for p in paged] == sorted(p['id'] for p in paged)
+    print("✓ Pages cover the whole project list once")
+
+def test_fields_skip_columns_and_timers(app, client, admin_headers):
+    """fields=id,name leaves description out of the SELECT and loads no timers"""
+    project_id = client.post('/api/projects', json={'name': 'Projected', 'description': 'long text'},
+                             headers=admin_headers).get_json()['id']
+    client.post(f'/api/projects/{project_id}/timers', json={'name': 'T', 'duration': 60}, headers=admin_headers)
+
+    statements = []
+    with app.app_context():
+        engine = db.engine
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        projects = client.get('/api/projects?fields=id,name').get_json()
+        project = client.get(f'/api/projects/{project_id}?fields=name,timers').get_json()
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+    assert all(set(p) == {'id', 'name'} for p in projects)
+    assert set(project) == {'name', 'timers'} and len(project['timers']) == 1
+    project_selects = [s for s in statements if 'FROM projects' in s]
+    assert not any('projects.description' in s for s in project_selects), project_selects
+    assert sum('FROM timers' in s for s in statements) == 1, statements
+
+    assert client.get('/api/projects?fields=id,password').status_code == 400
+    assert client.get('/api/projects?limit=0').status_code == 400
+    assert client.get('/api/projects?after=abc').status_code == 400
+    print("✓ fields= skips unrequested columns and timers")
+
+def test_user_lists_page_and_project(client, admin_headers):
+    """User lists page with after/limit and keep only the requested fields"""
+    project_id = client.post('/api/projects', json={'name': 'Shared'}, headers=admin_headers).get_json()['id']
+    for i in range(4):
+        user_id = client.post('/api/auth/register', json={'username': f'pager{i}', 'password': 'secret123'},
+                              headers=admin_headers).get_json()['user']['id']
+        client.post(f'/api/auth/users/{user_id}/projects/{project_id}', headers=admin_headers)
+
+    users, pages = follow_pages(client, '/api/auth/users?limit=2&fields=id,username', admin_headers, 'users')
+    assert [u['username'] for u in users] == ['admin'] + [f'pager{i}' for i in range(4)]
+    assert pages == 3 and all(set(u) == {'id', 'username'} for u in users)
+
+    authorized, pages = follow_pages(client, f'/api/auth/projects/{project_id}/users?limit=4&fields=username',
+                                     admin_headers, 'authorized_users')
+    assert [u['username'] for u in authorized] == ['admin'] + [f'pager{i}' for i in range(4)]
+    assert pages == 2
+    print("✓ User lists page and keep only requested fields")
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for the native-thread password hashing pool.
+Checks that bcrypt results are unchanged, that a full queue pushes back,
+and that under gevent other greenlets keep running while a hash is computed.
+"""
+
+import sys
+import os
+import time
+import threading
+import bcrypt
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from password_hashing import PasswordHasher, PasswordHasherBusy
+
+def test_hash_and_check_round_trip():
+    """Hashes made in the pool verify like plain bcrypt hashes"""
+    hasher = PasswordHasher()
+    hasher.configure('threading', max_workers=2, max_pending=4)
+    hashed = hasher.run(bcrypt.hashpw, b'secret', bcrypt.gensalt(rounds=4))
+    assert bcrypt.checkpw(b'secret', hashed)
+    assert hasher.run(bcrypt.checkpw, b'secret', hashed) is True
+    assert hasher.run(bcrypt.checkpw, b'wrong', hashed) is False
+    print("✓ Pool hashes verify like plain bcrypt")
+
+def test_full_queue_raises_busy():
+    """Callers beyond max_pending wait queue_timeout and then get PasswordHasherBusy"""
+    hasher = PasswordHasher()
+    hasher.configure('threading', max_workers=1, max_pending=1, queue_timeout=0.05)
+    release = threading.Event()
+    worker = threading.Thread(target=hasher.run, args=(release.wait,))
+    worker.start()
+    time.sleep(0.05)
+    try:
+        hasher.run(len, b'x')
+        raise AssertionError("second caller should have been rejected")
+    except PasswordHasherBusy:
+        pass
+    finally:
+        release.set()
+        worker.join()
+    assert hasher.run(len, b'x') == 1  # slot is free again
+    print("✓ Full queue raises PasswordHasherBusy")
+
+def test_gevent_hub_keeps_running_during_hash():
+    """Under gevent a greenlet keeps ticking while bcrypt runs in the pool"""
+    import gevent
+    hasher = PasswordHasher()
+    hasher.configure('gevent', max_workers=1, max_pending=4)
+    ticks = []
+
+    def ticker():
+        while True:
+            ticks.append(time.monotonic())
+            gevent.sleep(0.01)
+
+    tick_greenlet = gevent.spawn(ticker)
+    gevent.sleep(0)
+    hasher.run(bcrypt.hashpw, b'secret', bcrypt.gensalt(rounds=12))
+    tick_greenlet.kill()
+
+    gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+    assert len(ticks) > 5, f"ticker only ran {len(ticks)} times"
+    assert max(gaps) < 0.1, f"hub was blocked for {max(gaps):.3f}s"
+    print("✓ gevent hub keeps running during a hash")
+
+def main():
+    """Run all tests"""
+    print("=== CountdownTimer Password Hashing Test ===\n")
+
+    tests = [
+        test_hash_and_check_round_trip,
+        test_full_queue_raises_busy,
+        test_gevent_hub_keeps_running_during_hash,
+    ]
+    tests_passed = 0
+    for test in tests:
+        try:
+            test()
+            tests_passed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Test Results ===")
+    print(f"Passed: {tests_passed}/{len(tests)}")
+    return 0 if tests_passed == len(tests) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for the serialized response cache behind the project read endpoints.
+Runs the app against an in-memory SQLite database with the Flask test client.
+"""
+
+import sys
+import os
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import event
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import db
+from response_cache import ResponseSlots, CachedBody, response_cache
+from timer_state import to_epoch_ms
+
+@pytest.fixture
+def project(client, admin_headers, make_project):
+    """A project with one running, selected timer; returns (project_id, timer_id)"""
+    project_id, (timer_id,) = make_project('Cached', [{'name': 'T', 'duration': 600}], start=True)
+    client.post(f'/api/projects/{project_id}/select-timer/{timer_id}', headers=admin_headers)
+    return project_id, timer_id
+
+def without_clock(body):
+    """A response body minus the fields that change from one second to the next"""
+    if isinstance(body, list):
+        return [without_clock(item) for item in body]
+    if isinstance(body, dict):
+        return {key: without_clock(value) for key, value in body.items()
+                if key not in ('remaining_seconds', 'server_time_ms')}
+    return body
+
+def test_slots_are_filled_at_serve_time(app):
+    """A cached body recomputes remaining_seconds and server_time_ms on every render"""
+    with app.app_context():
+        slots = ResponseSlots()
+        end_time = datetime.now() + timedelta(seconds=100)
+        body = {'z_server_time_ms': slots.server_time(), 'a_remaining_seconds': slots.remaining(end_time),
+                'name': 'not a slot'}
+        cached = CachedBody('v1', app.json.dumps(body), slots)
+
+    now_ms = to_epoch_ms(end_time) - 100 * 1000
+    first = json.loads(cached.render(now_ms))
+    later = json.loads(cached.render(now_ms + 30 * 1000))
+    assert first == {'z_server_time_ms': now_ms, 'a_remaining_seconds': 100, 'name': 'not a slot'}
+    assert later['a_remaining_seconds'] == 70 and later['z_server_time_ms'] == now_ms + 30 * 1000
+    assert json.loads(cached.render(now_ms + 500 * 1000))['a_remaining_seconds'] == 0
+    print("✓ Slots are filled in at serve time")
+
+def test_repeat_reads_are_served_from_cache(app, client, project):
+    """The second read of an unchanged project skips the timer query and matches a fresh build"""
+    project_id, _ = project
+
+    statements = []
+    with app.app_context():
+        engine = db.engine
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    for url in ['/api/projects', f'/api/projects/{project_id}', f'/api/projects/{project_id}/selected-timer']:
+        first = client.get(url).get_json()
+        hits = response_cache.hits
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            second = client.get(url).get_json()
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+        assert response_cache.hits == hits + 1, url
+        assert without_clock(first) == without_clock(second), url
+    assert not any('FROM timers' in s for s in statements), statements
+
+    timer = client.get(f'/api/projects/{project_id}/selected-timer').get_json()
+    assert 598 <= timer['remaining_seconds'] <= 600 and not timer['paused']
+    print("✓ Repeat reads are served from the cache")
+
+def test_writes_invalidate_cached_bodies(app, client, admin_headers, project):
+    """Renaming a timer or changing the selection is visible on the next read"""
+    project_id, timer_id = project
+    other_id = client.post(f'/api/projects/{project_id}/timers', json={'name': 'Other', 'duration': 5},
+                           headers=admin_headers).get_json()['id']
+    base = f'/api/projects/{project_id}'
+
+    for url in ['/api/projects', base, f'{base}/selected-timer']:
+        client.get(url)
+    client.put(f'{base}/timers/{timer_id}', json={'name': 'Renamed'}, headers=admin_headers)
+    assert client.get(f'{base}/selected-timer').get_json()['name'] == 'Renamed'
+    assert 'Renamed' in [t['name'] for t in client.get(base).get_json()['timers']]
+    listed = next(p for p in client.get('/api/projects').get_json() if p['id'] == project_id)
+    assert 'Renamed' in [t['name'] for t in listed['timers']]
+
+    client.post(f'{base}/select-timer/{other_id}', headers=admin_headers)
+    assert client.get(f'{base}/selected-timer').get_json()['id'] == other_id
+    client.post(f'{base}/deselect-timer', headers=admin_headers)
+    assert client.get(f'{base}/selected-timer').status_code == 404
+
+    stats = client.get('/api/debug/response-cache', headers=admin_headers).get_json()
+    assert stats['misses'] > 0 and 0 <= stats['hit_ratio'] <= 1
+    assert app.test_client().get('/api/debug/response-cache').status_code == 401
+    print("✓ Writes invalidate cached bodies")
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for the selected_timer_changed push that kiosk displays follow with join_selection.
+Runs the app against an in-memory SQLite database with the Flask and Socket.IO test clients.
+"""
+
+import sys
+import os
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import socketio
+
+TIMERS = [{'name': 'Opening', 'duration': 300}, {'name': 'Break', 'duration': 300}]
+
+def selections(socket):
+    return [m['args'][0] for m in socket.get_received() if m['name'] == 'selected_timer_changed']
+
+def test_select_and_deselect_are_pushed(app, client, admin_headers, make_project):
+    """A display gets the current selection on join and every change after it"""
+    project_id, timer_ids = make_project('Kiosk', TIMERS)
+    base = f'/api/projects/{project_id}'
+
+    kiosk = socketio.test_client(app)
+    bystander = socketio.test_client(app)
+    kiosk.emit('join_selection', {'project_id': project_id})
+    assert selections(kiosk) == [{'project_id': project_id, 'timer': None}]
+
+    client.post(f'{base}/select-timer/{timer_ids[1]}', headers=admin_headers)
+    pushed = selections(kiosk)
+    assert len(pushed) == 1 and pushed[0]['timer']['id'] == timer_ids[1]
+    assert pushed[0]['timer']['name'] == 'Break' and 'server_time_ms' in pushed[0]['timer']
+
+    client.post(f'{base}/deselect-timer', headers=admin_headers)
+    assert selections(kiosk) == [{'project_id': project_id, 'timer': None}]
+    assert selections(bystander) == []
+
+    # A display that joins later starts from the current selection
+    client.post(f'{base}/select-timer/{timer_ids[0]}', headers=admin_headers)
+    late = socketio.test_client(app)
+    late.emit('join_selection', {'project_id': project_id})
+    assert selections(late)[0]['timer']['id'] == timer_ids[0]
+
+    assert selections(kiosk)[0]['timer']['id'] == timer_ids[0]
+    kiosk.emit('leave_selection', {'project_id': project_id})
+    client.post(f'{base}/select-timer/{timer_ids[1]}', headers=admin_headers)
+    assert selections(kiosk) == [] and selections(late)[0]['timer']['id'] == timer_ids[1]
+
+    late.emit('join_selection', {'project_id': 999999})
+    assert [m['args'][0]['code'] for m in late.get_received() if m['name'] == 'error'] == [404]
+    for socket in (kiosk, bystander, late):
+        socket.disconnect()
+    print("✓ Selecting and deselecting are pushed to displays")
+
+def test_deleting_the_selected_timer_is_pushed(app, client, admin_headers, make_project):
+    """Deleting the selected timer clears the display; deleting another timer does not"""
+    project_id, timer_ids = make_project('Kiosk delete', TIMERS)
+    base = f'/api/projects/{project_id}'
+    client.post(f'{base}/select-timer/{timer_ids[0]}', headers=admin_headers)
+
+    kiosk = socketio.test_client(app)
+    kiosk.emit('join_selection', {'project_id': project_id})
+    kiosk.get_received()
+
+    client.delete(f'{base}/timers/{timer_ids[1]}', headers=admin_headers)
+    assert selections(kiosk) == []
+    client.delete(f'{base}/timers/{timer_ids[0]}', headers=admin_headers)
+    assert selections(kiosk) == [{'project_id': project_id, 'timer': None}]
+    assert client.get(f'{base}/selected-timer').status_code == 404
+    kiosk.disconnect()
+    print("✓ Deleting the selected timer is pushed to displays")
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
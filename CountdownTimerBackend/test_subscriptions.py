@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for timer subscriber counting and idle eviction from the tick loop.
+Uses the Flask-SocketIO test client against an in-memory SQLite database.
+"""
+
+import sys
+import os
+import time
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from subscriptions import TimerSubscriptions
+
+def test_counts_follow_sockets():
+    """A timer stays subscribed until its last socket leaves; double joins count once"""
+    subs = TimerSubscriptions(idle_seconds=60)
+    subs.subscribe('a', 1, 10)
+    subs.subscribe('a', 1, 10)
+    subs.subscribe('b', 1, 10)
+    assert subs.subscriber_count(1) == 2
+
+    assert subs.unsubscribe('a', 1) == 10
+    assert subs.unsubscribe('a', 1) is None
+    assert 1 in subs and subs.subscriber_count(1) == 1
+
+    assert subs.drop_socket('b') == {1: 10}
+    assert 1 not in subs
+    print("✓ Subscriber counts follow joins, leaves and disconnects")
+
+def test_idle_timers_are_evicted_after_grace_period():
+    """Unwatched timers are only reported idle after idle_seconds, and a rejoin cancels it"""
+    subs = TimerSubscriptions(idle_seconds=30)
+    subs.subscribe('a', 1, 10)
+    subs.subscribe('a', 2, 10)
+    subs.drop_socket('a')
+
+    subs.subscribe('b', 2, 10)  # reconnect within the grace period
+    assert subs.pop_idle() == []
+    later = time.monotonic() + 31
+    assert subs.pop_idle(now=later) == [1]
+    assert subs.pop_idle(now=later) == []
+    assert subs.project_ids('b') == {10}
+    print("✓ Idle timers are evicted after the grace period")
+
+def test_project_watchers_follow_new_and_deleted_timers():
+    """Sockets that joined a whole project get its new timers; leaving releases them all"""
+    subs = TimerSubscriptions(idle_seconds=60)
+    subs.subscribe_project('a', 10, [1, 2])
+    subs.subscribe('b', 1, 10)
+    assert subs.track(3, 10) and not subs.track(4, 11)
+    assert subs.timer_ids() == {1, 2, 3}
+
+    subs.drop_timer(2)
+    assert subs.timer_ids() == {1, 3} and subs.pop_idle(now=time.monotonic() + 61) == []
+    assert subs.unsubscribe_project('a', 10) and not subs.unsubscribe_project('a', 10)
+    assert subs.subscriber_count(1) == 1 and 3 not in subs
+    assert subs.project_ids('a') == set() and subs.project_ids('b') == {10}
+    print("✓ Project watchers follow new and deleted timers")
+
+def test_project_and_single_joins_are_kept_apart():
+    """Leaving a project keeps timers joined one by one, and leaving one of them keeps the project's"""
+    subs = TimerSubscriptions(idle_seconds=60)
+    subs.subscribe('a', 1, 10)
+    subs.subscribe_project('a', 10, [1, 2])
+    assert subs.subscriber_count(1) == 1
+
+    assert subs.unsubscribe_project('a', 10)
+    assert subs.subscriber_count(1) == 1 and 2 not in subs
+    assert subs.project_ids('a') == {10}
+
+    subs.subscribe_project('a', 10, [1, 2])
+    assert subs.unsubscribe('a', 1) == 10 and subs.subscriber_count(1) == 1
+    assert subs.drop_socket('a') == {1: 10, 2: 10}
+    assert subs.timer_ids() == set()
+    print("✓ Project and single timer joins are kept apart")
+
+def test_tick_loop_stops_polling_unwatched_timers(app):
+    """Joining adds a timer to active_timers; after the last socket leaves it is evicted"""
+    import main
+    from database import db
+    from models import Project, Timer
+    from timer_state import timer_states
+
+    with app.app_context():
+        project = Project(name='Subscriptions', description='')
+        db.session.add(project)
+        db.session.flush()
+        timer = Timer(name='T', duration=60, description='', project_id=project.id)
+        db.session.add(timer)
+        db.session.commit()
+        project_id, timer_id = project.id, timer.id
+
+    first = main.socketio.test_client(app)
+    second = main.socketio.test_client(app)
+    first.emit('join_timer', {'project_id': project_id, 'timer_id': timer_id})
+    second.emit('join_timer', {'project_id': project_id, 'timer_id': timer_id, 'sync': 'deadline'})
+    assert timer_id in main.active_timers
+    assert main.timer_subscriptions.subscriber_count(timer_id) == 2
+
+    first.emit('leave_timer', {'timer_id': timer_id})
+    second.disconnect()
+    assert main.timer_subscriptions.subscriber_count(timer_id) == 0
+
+    previous = main.timer_subscriptions.idle_seconds
+    main.timer_subscriptions.idle_seconds = 0
+    try:
+        main.evict_idle_timers()
+    finally:
+        main.timer_subscriptions.idle_seconds = previous
+    assert timer_id not in main.active_timers
+    assert timer_states.get(timer_id) is None
+    first.disconnect()
+    print("✓ Tick loop stops polling timers nobody watches")
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
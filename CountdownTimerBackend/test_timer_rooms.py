@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-timer Socket.IO rooms behind join_timer, leave_timer and disconnect.
+Runs the app against an in-memory SQLite database with the Flask and Socket.IO test clients.
+"""
+
+import sys
+import os
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from main import socketio
+from broadcast import timer_room
+
+TIMERS = [{'name': 'Stage A', 'duration': 600}, {'name': 'Stage B', 'duration': 600}]
+
+def updated_ids(socket):
+    return [m['args'][0]['id'] for m in socket.get_received() if m['name'] == 'timer_update']
+
+def test_frames_reach_only_the_joined_timer(app, client, admin_headers, make_project, tick):
+    """A socket joined to timer A never receives timer B's ticks or changes"""
+    project_id, (a, b) = make_project('Rooms', TIMERS, start=True)
+    first, second = socketio.test_client(app), socketio.test_client(app)
+    first.emit('join_timer', {'project_id': project_id, 'timer_id': a})
+    second.emit('join_timer', {'project_id': project_id, 'timer_id': b})
+    assert updated_ids(first) == [a] and updated_ids(second) == [b]
+
+    tick(1)
+    assert updated_ids(first) == [a] and updated_ids(second) == [b]
+
+    client.post(f'/api/projects/{project_id}/timers/{b}/pause', headers=admin_headers)
+    assert updated_ids(first) == [] and updated_ids(second) == [b]
+    first.disconnect()
+    second.disconnect()
+    print("✓ Frames reach only the joined timer")
+
+def test_leave_and_disconnect_stop_delivery(app, make_project, tick):
+    """Leaving a timer or disconnecting takes the socket out of the timer's room"""
+    project_id, (a, b) = make_project('Rooms leave', TIMERS, start=True)
+    leaving, dropping = socketio.test_client(app), socketio.test_client(app)
+    leaving.emit('join_timer', {'project_id': project_id, 'timer_id': a})
+    dropping.emit('join_timer', {'project_id': project_id, 'timer_id': b})
+    leaving.get_received()
+
+    leaving.emit('leave_timer', {'timer_id': a})
+    tick(1)
+    assert updated_ids(leaving) == []
+
+    dropping.disconnect()
+    assert list(socketio.server.manager.get_participants('/', timer_room(b))) == []
+    leaving.disconnect()
+    print("✓ Leaving and disconnecting stop delivery")
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-memory timer state store.
+These checks run without a database since the store only does arithmetic on cached state.
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from timer_state import TimerStateStore, to_epoch_ms
+
+def make_timer(**overrides):
+    """Build a stand-in for a Timer row with the columns the store reads"""
+    now = datetime.now()
+    values = {
+        'id': 1,
+        'name': 'Keynote',
+        'duration': 600,
+        'description': 'Main stage',
+        'project_id': 7,
+        'end_time': now + timedelta(seconds=600),
+        'paused': True,
+        'remaining_seconds': 600,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+def test_paused_timer_keeps_remaining_seconds():
+    """A paused timer reports its stored remaining seconds"""
+    store = TimerStateStore()
+    state = store.load(make_timer(remaining_seconds=42))
+    assert state.remaining() == 42
+    assert state.remaining(datetime.now() + timedelta(hours=1)) == 42
+    print("✓ Paused timer keeps its remaining seconds")
+
+def test_running_timer_counts_down_from_end_time():
+    """A running timer is computed from end_time without touching the database"""
+    store = TimerStateStore()
+    now = datetime.now()
+    state = store.load(make_timer(paused=False, end_time=now + timedelta(seconds=90)))
+    assert state.remaining(now) == 90
+    assert state.remaining(now + timedelta(seconds=30)) == 60
+    assert state.remaining(now + timedelta(seconds=120)) == 0
+    print("✓ Running timer counts down from end_time")
+
+def test_load_refreshes_and_discard_forgets():
+    """Reloading a timer replaces its state and discard removes it"""
+    store = TimerStateStore()
+    store.load(make_timer(name='Old name'))
+    store.load(make_timer(name='New name'))
+    assert len(store) == 1
+    assert store.get(1).to_dict()['name'] == 'New name'
+
+    store.discard(1)
+    assert 1 not in store
+    assert store.get(1) is None
+    store.discard(1)  # discarding twice is harmless
+    print("✓ Load refreshes state and discard forgets it")
+
+def test_payload_matches_timer_update_shape():
+    """The payload carries the same keys clients read from timer_update"""
+    store = TimerStateStore()
+    payload = store.load(make_timer()).to_dict()
+    assert set(payload) == {'id', 'name', 'remaining_seconds', 'paused',
+                            'duration', 'description', 'project_id'}
+    print("✓ Payload matches the timer_update shape")
+
+def test_sync_payload_carries_absolute_deadline():
+    """timer_sync sends end_time as epoch ms while running and None while paused"""
+    store = TimerStateStore()
+    now = datetime.now()
+    end_time = now + timedelta(seconds=90)
+    running = store.load(make_timer(paused=False, end_time=end_time)).to_sync_dict(now)
+    assert running['end_time_ms'] == to_epoch_ms(end_time)
+    assert running['server_time_ms'] == to_epoch_ms(now)
+    assert running['end_time_ms'] - running['server_time_ms'] == 90000
+    assert running['remaining_seconds'] == 90
+
+    paused = store.load(make_timer(paused=True)).to_sync_dict(now)
+    assert paused['end_time_ms'] is None
+    print("✓ Sync payload carries an absolute deadline")
+
+def main():
+    """Run all tests"""
+    print("=== CountdownTimer Timer State Test ===\n")
+
+    tests = [
+        test_paused_timer_keeps_remaining_seconds,
+        test_running_timer_counts_down_from_end_time,
+        test_load_refreshes_and_discard_forgets,
+        test_payload_matches_timer_update_shape,
+        test_sync_payload_carries_absolute_deadline,
+    ]
+    tests_passed = 0
+    for test in tests:
+        try:
+            test()
+            tests_passed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__} failed: {e}")
+
+    print(f"\n=== Test Results ===")
+    print(f"Passed: {tests_passed}/{len(tests)}")
+    return 0 if tests_passed == len(tests) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
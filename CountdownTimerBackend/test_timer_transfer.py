@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming timer export and bulk import.
+Runs the app against an in-memory SQLite database with the Flask test client.
+"""
+
+import sys
+import os
+import json
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import db
+from models import Project, Timer
+import timer_transfer
+
+def test_jsonl_export_round_trips_through_import(app, client, admin_headers, make_project):
+    """Exported JSON Lines import into another project as the same schedule, in chunks"""
+    source = make_project('Transfer source')[0]
+    target = make_project('Transfer target')[0]
+
+    lines = ''.join(json.dumps({'name': f'Slot {i}', 'duration': 60 + i, 'description': f'#{i}'}) + '\n'
+                    for i in range(25))
+    previous = timer_transfer.CHUNK_SIZE
+    timer_transfer.CHUNK_SIZE = 10  # Several insert and export chunks
+    try:
+        response = client.post(f'/api/projects/{source}/timers/import', data=lines,
+                               headers=admin_headers, content_type='application/x-ndjson')
+        assert response.status_code == 201, response.get_json()
+        assert response.get_json() == {'imported': 25}
+
+        response = client.get(f'/api/projects/{source}/timers/export', headers=admin_headers)
+        assert response.is_streamed and response.mimetype == 'application/x-ndjson'
+        exported = response.get_data(as_text=True)
+    finally:
+        timer_transfer.CHUNK_SIZE = previous
+
+    rows = [json.loads(line) for line in exported.splitlines()]
+    assert [r['name'] for r in rows] == [f'Slot {i}' for i in range(25)]
+    assert all(r['paused'] and r['remaining_seconds'] == r['duration'] for r in rows)
+
+    response = client.post(f'/api/projects/{target}/timers/import', data=exported,
+                           headers=admin_headers, content_type='application/x-ndjson')
+    assert response.get_json() == {'imported': 25}
+    with app.app_context():
+        copied = Timer.query.filter_by(project_id=target).order_by(Timer.id).all()
+        assert [(t.name, t.duration, t.description) for t in copied] == [(r['name'], r['duration'], r['description']) for r in rows]
+    print("✓ JSON Lines export round-trips through import")
+
+def test_csv_export_and_import(client, admin_headers, make_project):
+    """CSV exports carry a header and import back by column name"""
+    project = make_project('Transfer csv')[0]
+
+    csv_data = 'name,duration,description\nOpening,300,"Doors, then talk"\nBreak,900,\n'
+    response = client.post(f'/api/projects/{project}/timers/import?format=csv', data=csv_data,
+                           headers=admin_headers, content_type='text/csv')
+    assert response.get_json() == {'imported': 2}
+
+    response = client.get(f'/api/projects/{project}/timers/export?format=csv', headers=admin_headers)
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0] == 'id,name,duration,description,remaining_seconds,paused'
+    assert lines[1].endswith(',Opening,300,"Doors, then talk",300,True')
+    print("✓ CSV export and import")
+
+def test_bad_line_rolls_back_whole_import(app, client, admin_headers, make_project):
+    """One invalid record rejects the import with its line number and inserts nothing"""
+    project = make_project('Transfer invalid')[0]
+
+    lines = '{"name": "Good", "duration": 10}\n{"name": "Bad", "duration": "soon"}\n'
+    response = client.post(f'/api/projects/{project}/timers/import', data=lines,
+                           headers=admin_headers, content_type='application/x-ndjson')
+    assert response.status_code == 400
+    assert 'Line 2' in response.get_json()['message']
+    with app.app_context():
+        assert Timer.query.filter_by(project_id=project).count() == 0
+
+    response = client.get(f'/api/projects/{project}/timers/export?format=xml', headers=admin_headers)
+    assert response.status_code == 400
+    print("✓ A bad line rolls back the whole import")
+
+def test_import_returns_only_the_new_timers(app, make_project):
+    """import_timers returns the rows it inserted, and an empty import leaves the project version alone"""
+    project, (existing,) = make_project('Transfer rows', [{'name': 'Existing', 'duration': 60}])
+    with app.app_context():
+        version = db.session.get(Project, project).version
+        assert timer_transfer.import_timers(project, iter([])) == []
+        assert db.session.get(Project, project).version == version
+
+        records = [(1, {'name': 'First', 'duration': 10}), (2, {'name': 'Second', 'duration': 20})]
+        imported = timer_transfer.import_timers(project, iter(records))
+        assert [t.name for t in imported] == ['First', 'Second']
+        assert existing not in {t.id for t in imported}
+        db.session.commit()
+        assert Timer.query.filter(Timer.id.in_([t.id for t in imported])).count() == 2
+        assert db.session.get(Project, project).version == version + 1
+    print("✓ Import returns only the new timers")
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script for the resolved JWT secret and the verified token cache.
+"""
+
+import sys
+import os
+import time
+import hashlib
+import jwt
+import pytest
+
+# Add the current directory to Python path so we can import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import auth
+from auth import AuthManager, verified_token_cache
+
+@pytest.fixture(autouse=True)
+def jwt_secret(monkeypatch):
+    """Start every test from a fresh secret and an empty cache, and restore the old secret afterwards"""
+    monkeypatch.setattr(AuthManager, '_jwt_secret', None)
+    monkeypatch.setenv('JWT_SECRET_KEY', 'first-secret')
+    AuthManager.load_jwt_secret()
+    yield
+    verified_token_cache.clear()
+
+def cache_key(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+def test_cached_token_expires_with_its_exp_claim():
+    """A cached token stops validating once its exp passes, well inside the cache's own TTL"""
+    expires_at = time.time() + 1.5
+    token = jwt.encode({'user_id': 1, 'username': 'admin', 'is_admin': True, 'exp': expires_at},
+                       AuthManager.get_jwt_secret(), algorithm='HS256')
+    assert AuthManager.verify_token(token)['user_id'] == 1
+    assert verified_token_cache.get(cache_key(token)) is not None
+
+    time.sleep(expires_at - time.time() + 0.1)
+    assert AuthManager.verify_token(token) is None
+    print("✓ Cached token expires with its exp claim")
+
+def test_rotating_the_secret_clears_the_cache(monkeypatch):
+    """Tokens verified against the old secret are checked again after a reload"""
+    token = AuthManager.generate_token(1, 'admin', is_admin=True)
+    assert AuthManager.verify_token(token) is not None
+
+    AuthManager.load_jwt_secret()
+    assert verified_token_cache.get(cache_key(token)) is None
+    assert AuthManager.verify_token(token) is not None
+
+    monkeypatch.setenv('JWT_SECRET_KEY', 'second-secret')
+    AuthManager.load_jwt_secret()
+    assert AuthManager.verify_token(token) is None
+    print("✓ Rotating the secret clears the cache")
+
+def test_secret_is_resolved_once(app, client, admin_headers, monkeypatch):
+    """Requests sign and verify tokens with the secret create_app resolved, without reading the environment"""
+    lookups = []
+    getenv = os.getenv
+    monkeypatch.setattr(auth.os, 'getenv', lambda key, *args: lookups.append(key) or getenv(key, *args))
+
+    for _ in range(3):
+        # Miss the token cache so every request verifies the signature
+        verified_token_cache.clear()
+        assert client.get('/api/auth/me', headers=admin_headers).status_code == 200
+    AuthManager.generate_token(1, 'admin', is_admin=True)
+    assert 'JWT_SECRET_KEY' not in lookups
+    print("✓ Secret is resolved once")
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,116 @@
+from datetime import datetime
+from threading import Lock
+from expiry import timer_expiry
+
+def to_epoch_ms(value):
+    """Convert a naive local datetime, as stored in the timers table, to epoch milliseconds"""
+    return int(value.timestamp() * 1000)
+
+class TimerState:
+    """Snapshot of a timer's countdown state kept in memory for the broadcaster"""
+    __slots__ = ('id', 'name', 'duration', 'description', 'project_id',
+                 'end_time', 'paused', 'remaining_seconds')
+
+    def __init__(self, id, name, duration, description, project_id,
+                 end_time, paused, remaining_seconds):
+        self.id = id
+        self.name = name
+        self.duration = duration
+        self.description = description
+        self.project_id = project_id
+        self.end_time = end_time
+        self.paused = paused
+        self.remaining_seconds = remaining_seconds
+
+    @classmethod
+    def from_timer(cls, timer):
+        """Build a state snapshot from a Timer row"""
+        return cls(
+            id=timer.id,
+            name=timer.name,
+            duration=timer.duration,
+            description=timer.description,
+            project_id=timer.project_id,
+            end_time=timer.end_time,
+            paused=timer.paused,
+            remaining_seconds=timer.remaining_seconds,
+        )
+
+    def to_record(self):
+        """Return every field, JSON serializable, for sending the state to other workers"""
+        record = {name: getattr(self, name) for name in self.__slots__}
+        record['end_time'] = self.end_time.isoformat()
+        return record
+
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild a state received from another worker"""
+        return cls(**dict(record, end_time=datetime.fromisoformat(record['end_time'])))
+
+    def remaining(self, now=None):
+        """Get remaining seconds, mirroring Timer.remaining() without a database hit"""
+        if self.paused:
+            return self.remaining_seconds
+        delta = self.end_time - (now or datetime.now())
+        return max(int(delta.total_seconds()), 0)
+
+    def to_dict(self, now=None):
+        """Return the timer_update payload for this timer"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'remaining_seconds': self.remaining(now),
+            'paused': self.paused,
+            'duration': self.duration,
+            'description': self.description,
+            'project_id': self.project_id
+        }
+
+    def to_sync_dict(self, now=None):
+        """Return the timer_sync payload: an absolute deadline clients count down to locally"""
+        now = now or datetime.now()
+        payload = self.to_dict(now)
+        payload['end_time_ms'] = None if self.paused else to_epoch_ms(self.end_time)
+        payload['server_time_ms'] = to_epoch_ms(now)
+        return payload
+
+class TimerStateStore:
+    """Authoritative in-process timer state, synced from the timers table on change"""
+
+    def __init__(self):
+        self._states = {}
+        self._lock = Lock()
+
+    def get(self, timer_id):
+        """Return the cached state for a timer, or None if it is not loaded"""
+        return self._states.get(timer_id)
+
+    def load(self, timer):
+        """Create or refresh the state of a timer from its database row"""
+        return self.put(TimerState.from_timer(timer))
+
+    def put(self, state):
+        """Store a state, e.g. one another worker loaded"""
+        with self._lock:
+            self._states[state.id] = state
+        # Every start, pause, reset, edit and expiry passes through here
+        timer_expiry.update(state)
+        return state
+
+    def discard(self, timer_id):
+        """Forget a timer, e.g. after it has been deleted"""
+        with self._lock:
+            self._states.pop(timer_id, None)
+
+    def clear(self):
+        """Forget every timer"""
+        with self._lock:
+            self._states.clear()
+
+    def __contains__(self, timer_id):
+        return timer_id in self._states
+
+    def __len__(self):
+        return len(self._states)
+
+timer_states = TimerStateStore()
@@ -0,0 +1,134 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert
+from database import db
+from models import Timer, bump_project_versions
+
+# Rows fetched from the server-side cursor, and rows inserted, per round trip
+CHUNK_SIZE = 1000
+
+EXPORT_FIELDS = ['id', 'name', 'duration', 'description', 'remaining_seconds', 'paused']
+FORMATS = {
+    'jsonl': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+class TimerImportError(ValueError):
+    """An import row that cannot become a timer; line is 1-based"""
+
+    def __init__(self, line, message):
+        super().__init__(f'Line {line}: {message}')
+        self.line = line
+
+def requested_format(args, content_type=None):
+    """Pick jsonl or csv from ?format= or the request's Content-Type, defaulting to jsonl"""
+    fmt = args.get('format')
+    if not fmt and content_type:
+        fmt = next((name for name, mimetype in FORMATS.items() if content_type.startswith(mimetype)), None)
+    return fmt or 'jsonl'
+
+def iter_timer_rows(project_id):
+    """Yield export rows for a project's timers, streamed from a server-side cursor"""
+    stmt = (
+        select(Timer.id, Timer.name, Timer.duration, Timer.description,
+               Timer.remaining_seconds, Timer.paused, Timer.end_time)
+        .where(Timer.project_id == project_id)
+        .order_by(Timer.id)
+        .execution_options(yield_per=CHUNK_SIZE)
+    )
+    now = datetime.now()
+    for row in db.session.execute(stmt):
+        remaining = row.remaining_seconds if row.paused else max(int((row.end_time - now).total_seconds()), 0)
+        yield {
+            'id': row.id,
+            'name': row.name,
+            'duration': row.duration,
+            'description': row.description,
+            'remaining_seconds': remaining,
+            'paused': row.paused,
+        }
+
+def iter_export_chunks(rows, fmt):
+    """Encode export rows as JSON Lines or CSV, one chunk of text per CHUNK_SIZE rows"""
+    buffer = io.StringIO()
+    writer = None
+    if fmt == 'csv':
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, lineterminator='\n')
+        writer.writeheader()
+    count = 0
+    for row in rows:
+        if writer:
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(row) + '\n')
+        count += 1
+        if count % CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def iter_import_records(stream, fmt):
+    """Yield (line number, dict) for each record of an uploaded JSON Lines or CSV stream"""
+    text = io.TextIOWrapper(stream, encoding='utf-8', newline='' if fmt == 'csv' else None)
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            raise TimerImportError(line_number, 'not valid JSON')
+        if not isinstance(record, dict):
+            raise TimerImportError(line_number, 'expected a JSON object')
+        yield line_number, record
+
+def timer_values(project_id, line_number, record, now):
+    """Validate one import record and return the column values for a new, paused timer"""
+    name = record.get('name')
+    if not isinstance(name, str) or not name.strip():
+        raise TimerImportError(line_number, 'name is required')
+    if len(name) > 80:
+        raise TimerImportError(line_number, 'name is longer than 80 characters')
+    try:
+        duration = int(record.get('duration'))
+    except (TypeError, ValueError):
+        raise TimerImportError(line_number, 'duration must be a whole number of seconds')
+    if duration < 0:
+        raise TimerImportError(line_number, 'duration must not be negative')
+    description = record.get('description') or ''
+    return {
+        'name': name,
+        'duration': duration,
+        'description': str(description),
+        'project_id': project_id,
+        'paused': True,
+        'remaining_seconds': duration,
+        # Same end_time a Timer() created via the API would get
+        'end_time': now + timedelta(seconds=Timer._get_safe_seconds(duration)),
+    }
+
+def import_timers(project_id, records):
+    """Insert timers with one executemany per CHUNK_SIZE records and return the new Timer rows; the caller commits"""
+    now = datetime.now()
+    statement = insert(Timer).returning(Timer)
+    chunk = []
+    imported = []
+    for line_number, record in records:
+        chunk.append(timer_values(project_id, line_number, record, now))
+        if len(chunk) == CHUNK_SIZE:
+            imported.extend(db.session.scalars(statement, chunk))
+            chunk = []
+    if chunk:
+        imported.extend(db.session.scalars(statement, chunk))
+    if imported:
+        # Bulk inserts skip the ORM flush that normally bumps the version
+        bump_project_versions(db.session, [project_id])
+    return imported
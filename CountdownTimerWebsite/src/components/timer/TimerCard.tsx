@@ -1,6 +1,12 @@
 import { useState, useEffect, useRef } from 'react';
 import { io, Socket } from 'socket.io-client';
 import { parseTimeInput } from '../../utils/timeParser';
+import {
+    useSyncedCountdown,
+    type TimerSyncPayload,
+    type TimersSyncPayload,
+} from '../../utils/timerSync';
+import type { SubscribeTimerSync } from '../../utils/projectSync';
 
 interface Timer {
     id: string;
@@ -24,6 +30,8 @@ interface TimerCardProps {
     onTimerSelected?: (id: string) => void;
     isViewOnly?: boolean;
     disabled?: boolean;
+    // Shared project socket; without it the card opens its own connection
+    subscribeSync?: SubscribeTimerSync;
 }
 
 // Dynamically generate API and WebSocket base URLs from the current browser location
@@ -39,6 +47,7 @@ function TimerCard({
     onTimerUpdated,
     onTimerSelected,
     disabled = false,
+    subscribeSync,
 }: TimerCardProps) {
     const { hostname } = window.location;
     const API_BASE_URL = `/api/projects/${projectId}`;
@@ -75,7 +84,12 @@ function TimerCard({
     const disabledClasses = 'opacity-30 cursor-not-allowed grayscale-90'; // Define disabled classes
 
     // WebSocket reference
-    const wsRef = useRef<Socket | null>(null); // Format time as HH:MM:SS
+    const wsRef = useRef<Socket | null>(null);
+
+    // Local countdown driven by timer_sync deadlines from the server
+    const { applySync } = useSyncedCountdown(setTimeLeft);
+
+    // Format time as HH:MM:SS
     const formatTime = (seconds: number): string => {
         const hours = Math.floor(seconds / 3600);
         const minutes = Math.floor((seconds % 3600) / 60);
@@ -90,36 +104,17 @@ function TimerCard({
 
     // Initialize WebSocket connection
     useEffect(() => {
-        // Connect to Socket.IO server
-        const socket = io(WS_BASE_URL, {
-            path: '/socket.io',
-            transports: ['websocket'],
-            query: { EIO: '4', transport: 'websocket' },
-        });
-
-        wsRef.current = socket;
-
-        // Join the specific timer room
-        socket.on('connect', () => {
-            console.log(`Socket.IO connection established for timer ${id}`);
-
-            socket.emit('join_timer', {
-                project_id: projectId,
-                timer_id: id,
-            });
-        }); // Listen for timer updates
-        socket.on('timer_update', (data) => {
+        // Listen for deadline syncs, the countdown itself runs locally
+        const handleSync = (data: TimerSyncPayload) => {
             if (String(data.id) === String(id)) {
-                console.log('Received timer update:', data);
+                console.log('Received timer sync:', data);
                 // Update timer state based on server data
-                if (data.remaining_seconds !== undefined) {
-                    setTimeLeft(data.remaining_seconds);
-                }
+                applySync(data);
 
                 setIsPaused(data.paused);
                 setIsRunning(!data.paused);
                 setCurrentName(data.name);
-                setCurrentDescription(data.description);
+                setCurrentDescription(data.description || '');
 
                 // Update duration state if provided
                 if (data.duration) {
@@ -132,8 +127,38 @@ function TimerCard({
                     }`
                 );
             }
+        };
+
+        // The project page shares one socket for all of its cards
+        if (subscribeSync) {
+            return subscribeSync(id, handleSync);
+        }
+
+        // Connect to Socket.IO server
+        const socket = io(WS_BASE_URL, {
+            path: '/socket.io',
+            transports: ['websocket'],
+            query: { EIO: '4', transport: 'websocket' },
         });
 
+        wsRef.current = socket;
+
+        // Join the specific timer room
+        socket.on('connect', () => {
+            console.log(`Socket.IO connection established for timer ${id}`);
+
+            socket.emit('join_timer', {
+                project_id: projectId,
+                timer_id: id,
+                sync: 'deadline',
+            });
+        });
+        socket.on('timer_sync', handleSync);
+        // Batch operations send one frame for all changed timers of the project
+        socket.on('timers_sync', (batch: TimersSyncPayload) =>
+            batch.timers.forEach(handleSync)
+        );
+
         socket.on('connect_error', (error) => {
             console.error('Socket.IO connection error:', error);
             setError('Connection error. Timer updates may not be accurate.');
@@ -149,15 +174,7 @@ function TimerCard({
                 console.log(`Socket.IO connection closed for timer ${id}`);
             }
         };
-    }, [
-        id,
-        projectId,
-        WS_BASE_URL,
-        isPaused,
-        isRunning,
-        currentName,
-        currentDescription,
-    ]);
+    }, [id, projectId, WS_BASE_URL, applySync, subscribeSync]);
 
     // Timer control functions with server communication
     const startTimer = async () => {
@@ -6,6 +6,7 @@ import ViewSelectedTimerButton from '../components/timer/ViewSelectedTimerButton
 import ThemeSwitcher from '../components/ThemeSwitcher';
 import Login from '../components/login';
 import { LoadingSpinner, EmptyState } from '../components/common';
+import { useProjectTimerSync } from '../utils/projectSync';
 
 interface ProjectData {
     name: string;
@@ -166,6 +167,29 @@ function ProjectAdminPage() {
             prevTimers.filter((timer) => String(timer.id) !== timerId)
         );
     };
+
+    // One socket for every card on the page; it also reports timers other
+    // users create or delete while the page is open
+    const subscribeSync = useProjectTimerSync(projectID, {
+        onTimerAdded: (payload) =>
+            setTimers((prevTimers) =>
+                prevTimers.some(
+                    (timer) => String(timer.id) === String(payload.id)
+                )
+                    ? prevTimers
+                    : [
+                          ...prevTimers,
+                          {
+                              id: payload.id,
+                              name: payload.name,
+                              description: payload.description || '',
+                              duration: payload.duration,
+                          },
+                      ]
+            ),
+        onTimerRemoved: handleTimerDeleted,
+    });
+
     const handleTimerUpdated = (updatedTimer: {
         id: string;
         name: string;
@@ -419,6 +443,7 @@ function ProjectAdminPage() {
                                                 : undefined
                                         }
                                         disabled={isViewOnly}
+                                        subscribeSync={subscribeSync}
                                     />
                                 );
                             })}
@@ -3,6 +3,13 @@ import { useState, useEffect, useRef, useCallback } from 'react';
 import { io, Socket } from 'socket.io-client';
 import FullScreenTimer from '../components/FullScreenTimer';
 import { useTheme } from '../contexts/ThemeContext';
+import {
+    useSyncedCountdown,
+    withResponseServerTime,
+    type TimerSyncPayload,
+    type TimersSyncPayload,
+    type SelectedTimerChangedPayload,
+} from '../utils/timerSync';
 
 function ViewSelectedTimer() {
     const { projectId } = useParams<{ projectId: string }>();
@@ -21,101 +28,76 @@ function ViewSelectedTimer() {
         isPaused: false,
     });
     const [isLoading, setIsLoading] = useState(true);
-    const [isInitialLoad, setIsInitialLoad] = useState(true);
     const [error, setError] = useState<string | null>(null);
 
     // WebSocket reference
     const wsRef = useRef<Socket | null>(null);
+    const selectedIdRef = useRef('');
     const { hostname } = window.location;
     const WS_BASE_URL = `wss://${hostname}`;
 
-    // Fetch selected timer data
-    const fetchSelectedTimer = useCallback(async () => {
-        if (!projectId) {
-            console.log('DEBUG: No projectId available');
-            return;
-        }
+    // Local countdown driven by timer_sync deadlines from the server
+    const { applySync } = useSyncedCountdown((seconds) =>
+        setTimer((prev) => ({ ...prev, timeLeft: seconds }))
+    );
+
+    // Show the selected timer, from a socket push or the REST fallback
+    const showTimer = useCallback(
+        (data: TimerSyncPayload) => {
+            selectedIdRef.current = String(data.id);
+            applySync(data);
+            setTimer({
+                id: String(data.id),
+                name: data.name,
+                description: data.description || '',
+                duration: data.duration,
+                timeLeft: data.remaining_seconds,
+                isRunning: !data.paused,
+                isPaused: data.paused,
+            });
+            setError(null);
+            setIsLoading(false);
+        },
+        [applySync]
+    );
 
-        console.log('DEBUG: Fetching selected timer for project:', projectId);
+    const showNoSelection = useCallback((message: string) => {
+        selectedIdRef.current = '';
+        setError(message);
+        setIsLoading(false);
+    }, []);
+
+    // Only used while the socket cannot connect
+    const fetchSelectedTimer = useCallback(async () => {
+        if (!projectId) return;
         try {
-            // Only show loading animation on initial load
-            if (isInitialLoad) {
-                setIsLoading(true);
+            const response = await fetch(
+                `/api/projects/${projectId}/selected-timer`
+            );
+            if (response.status === 404) {
+                const errorData = await response.json();
+                showNoSelection(
+                    errorData.message || 'No timer selected for this project'
+                );
+                return;
             }
-            const url = `/api/projects/${projectId}/selected-timer`;
-            console.log('DEBUG: Making API call to:', url);
-
-            const response = await fetch(url);
-            console.log('DEBUG: Response status:', response.status);
-            console.log('DEBUG: Response ok:', response.ok);
             if (!response.ok) {
-                if (response.status === 404) {
-                    const errorData = await response.json();
-                    console.log('DEBUG: 404 error data:', errorData);
-                    setError(
-                        errorData.message ||
-                            'No timer selected for this project'
-                    );
-                } else {
-                    console.log(
-                        'DEBUG: Non-404 error, status:',
-                        response.status
-                    );
-                    throw new Error(`HTTP error! Status: ${response.status}`);
-                }
-                setIsLoading(false);
-                setIsInitialLoad(false);
-                return;
+                throw new Error(`HTTP error! Status: ${response.status}`);
             }
-
+            // The REST payload carries the same deadline fields as timer_sync
             const timerData = await response.json();
-            console.log('DEBUG: Timer data received:', timerData); // Check if the selected timer has changed
-            const newTimerId = timerData.id.toString();
-            if (timer.id && timer.id !== '' && timer.id !== newTimerId) {
-                console.log(
-                    'DEBUG: Selected timer changed from',
-                    timer.id,
-                    'to',
-                    newTimerId
-                );
-                // Don't show loading animation for timer changes, just update silently
-            }
-
-            setTimer({
-                id: newTimerId,
-                name: timerData.name,
-                description: timerData.description || '',
-                duration: timerData.duration,
-                timeLeft: timerData.remaining_seconds,
-                isRunning: !timerData.paused,
-                isPaused: timerData.paused,
-            });
-            setError(null);
-            setIsLoading(false);
-            setIsInitialLoad(false);
+            showTimer(withResponseServerTime(timerData, response));
         } catch (err) {
             console.error('Error fetching selected timer:', err);
             setError('Failed to load selected timer data');
             setIsLoading(false);
-            setIsInitialLoad(false);
         }
-    }, [projectId, timer.id, isInitialLoad]); // Fetch selected timer on component mount and set up polling
-    useEffect(() => {
-        fetchSelectedTimer();
-
-        // Set up polling to check for selected timer changes every 2 seconds
-        const pollInterval = setInterval(() => {
-            fetchSelectedTimer();
-        }, 2000);
+    }, [projectId, showTimer, showNoSelection]);
 
-        return () => {
-            clearInterval(pollInterval);
-        };
-    }, [fetchSelectedTimer]);
-
-    // Initialize WebSocket connection for the selected timer (only after we have timer data)
+    // One socket follows the project's selection and the selected timer's
+    // countdown; selected_timer_changed switches timers without polling
     useEffect(() => {
-        if (!projectId || !timer.id || timer.id === '') return;
+        if (!projectId) return;
 
         // Connect to Socket.IO server
         const socket = io(WS_BASE_URL, {
@@ -126,34 +108,70 @@ function ViewSelectedTimer() {
 
         wsRef.current = socket;
 
-        // Join the specific timer room
+        // Move this socket to the room of the newly selected timer
+        let joinedTimerId = '';
+        const followTimer = (timerId: string) => {
+            if (timerId === joinedTimerId) return;
+            if (joinedTimerId) {
+                socket.emit('leave_timer', { timer_id: joinedTimerId });
+            }
+            if (timerId) {
+                socket.emit('join_timer', {
+                    project_id: projectId,
+                    timer_id: timerId,
+                    sync: 'deadline',
+                });
+            }
+            joinedTimerId = timerId;
+        };
+
         socket.on('connect', () => {
             console.log(
-                `Socket.IO connection established for selected timer ${timer.id}`
+                `Socket.IO connection established for project ${projectId} selection`
             );
-            socket.emit('join_timer', {
-                project_id: projectId,
-                timer_id: timer.id,
-            });
-        }); // Listen for timer updates
-        socket.on('timer_update', (data) => {
-            if (data.id == timer.id) {
-                console.log('Received selected timer update:', data);
+            // Rooms do not survive a reconnect
+            joinedTimerId = '';
+            socket.emit('join_selection', { project_id: projectId });
+        });
+        socket.on(
+            'selected_timer_changed',
+            (data: SelectedTimerChangedPayload) => {
+                console.log('Selected timer changed:', data);
+                if (data.timer) {
+                    showTimer(data.timer);
+                    followTimer(String(data.timer.id));
+                } else {
+                    showNoSelection('No timer selected for this project');
+                    followTimer('');
+                }
+            }
+        );
+
+        // Listen for deadline syncs, the countdown itself runs locally
+        const handleSync = (data: TimerSyncPayload) => {
+            if (String(data.id) === selectedIdRef.current) {
+                console.log('Received selected timer sync:', data);
+                applySync(data);
                 setTimer((prev) => ({
                     ...prev,
                     name: data.name,
                     description: data.description || '',
                     duration: data.duration,
-                    timeLeft: data.remaining_seconds,
                     isRunning: !data.paused,
                     isPaused: data.paused,
                 }));
             }
-        });
+        };
+        socket.on('timer_sync', handleSync);
+        // Batch operations send one frame for all changed timers of the project
+        socket.on('timers_sync', (batch: TimersSyncPayload) =>
+            batch.timers.forEach(handleSync)
+        );
 
         socket.on('connect_error', (error) => {
             console.error('Socket.IO connection error:', error);
-            setError('Connection error. Timer updates may not be accurate.');
+            // Show the REST state until the socket reconnects
+            fetchSelectedTimer();
         });
 
         socket.on('disconnect', () => {
@@ -166,7 +184,14 @@ function ViewSelectedTimer() {
                 wsRef.current = null;
             }
         };
-    }, [projectId, timer.id, WS_BASE_URL]);
+    }, [
+        projectId,
+        WS_BASE_URL,
+        applySync,
+        showTimer,
+        showNoSelection,
+        fetchSelectedTimer,
+    ]);
 
     // Custom error content for no selected timer
     const errorContent = error ? (
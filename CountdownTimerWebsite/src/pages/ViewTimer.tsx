@@ -2,6 +2,11 @@ import { useParams } from 'react-router-dom';
 import { useState, useEffect, useRef } from 'react';
 import { io, Socket } from 'socket.io-client';
 import FullScreenTimer from '../components/FullScreenTimer';
+import {
+    useSyncedCountdown,
+    type TimerSyncPayload,
+    type TimersSyncPayload,
+} from '../utils/timerSync';
 
 function ViewTimer() {
     const { timerId } = useParams<{ timerId: string }>();
@@ -29,6 +34,11 @@ function ViewTimer() {
     // const API_BASE_URL = `/api/projects/${projectId}`;
     const WS_BASE_URL = `wss://${hostname}`;
 
+    // Local countdown driven by timer_sync deadlines from the server
+    const { applySync } = useSyncedCountdown((seconds) =>
+        setTimer((prev) => ({ ...prev, timeLeft: seconds }))
+    );
+
     // Initialize WebSocket connection
     useEffect(() => {
         if (!actualTimerId || !projectId) return;
@@ -51,19 +61,17 @@ function ViewTimer() {
             socket.emit('join_timer', {
                 project_id: projectId,
                 timer_id: actualTimerId,
+                sync: 'deadline',
             });
         });
 
-        // Listen for timer updates
-        socket.on('timer_update', (data) => {
-            if (data.id == actualTimerId) {
-                console.log('Received timer update:', data);
+        // Listen for deadline syncs, the countdown itself runs locally
+        const handleSync = (data: TimerSyncPayload) => {
+            if (String(data.id) === String(actualTimerId)) {
+                console.log('Received timer sync:', data);
+                applySync(data);
                 setTimer((prev) => ({
                     ...prev,
-                    timeLeft:
-                        data.remaining_seconds !== undefined
-                            ? data.remaining_seconds
-                            : prev.timeLeft,
                     isPaused: data.paused,
                     isRunning: !data.paused,
                     duration: data.duration || prev.duration,
@@ -72,7 +80,12 @@ function ViewTimer() {
                 }));
                 setIsLoading(false);
             }
-        });
+        };
+        socket.on('timer_sync', handleSync);
+        // Batch operations send one frame for all changed timers of the project
+        socket.on('timers_sync', (batch: TimersSyncPayload) =>
+            batch.timers.forEach(handleSync)
+        );
 
         socket.on('connect_error', (error) => {
             console.error('Socket.IO connection error:', error);
@@ -90,7 +103,7 @@ function ViewTimer() {
                 );
             }
         };
-    }, [actualTimerId, projectId, WS_BASE_URL]);
+    }, [actualTimerId, projectId, WS_BASE_URL, applySync]);
 
     return (
         <FullScreenTimer
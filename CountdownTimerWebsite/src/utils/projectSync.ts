@@ -0,0 +1,100 @@
+/**
+ * One Socket.IO connection for every timer of a project. The page joins the
+ * project with join_project and hands each timer's timer_sync payloads to the
+ * card that registered for it, instead of every card opening its own socket.
+ */
+
+import { useCallback, useEffect, useRef } from 'react';
+import { io } from 'socket.io-client';
+import type { TimerSyncPayload, TimersSyncPayload } from './timerSync';
+
+export type SubscribeTimerSync = (
+    timerId: string,
+    handler: (payload: TimerSyncPayload) => void
+) => () => void;
+
+interface ProjectTimerSyncOptions {
+    // A timer created elsewhere after the page joined the project
+    onTimerAdded?: (payload: TimerSyncPayload) => void;
+    onTimerRemoved?: (timerId: string) => void;
+}
+
+interface TimerRemovedPayload {
+    project_id: number;
+    timer_id: number;
+}
+
+/**
+ * Join a project once and return subscribeSync(timerId, handler), which
+ * registers a card for its timer's payloads and returns an unsubscribe
+ * function.
+ */
+export function useProjectTimerSync(
+    projectId: string | undefined,
+    options: ProjectTimerSyncOptions = {}
+): SubscribeTimerSync {
+    const handlersRef = useRef(
+        new Map<string, (payload: TimerSyncPayload) => void>()
+    );
+    // Latest payload per timer, for cards that mount after the snapshot
+    const latestRef = useRef(new Map<string, TimerSyncPayload>());
+    const optionsRef = useRef(options);
+    optionsRef.current = options;
+
+    useEffect(() => {
+        if (!projectId) return;
+        const latest = latestRef.current;
+        const socket = io(`wss://${window.location.hostname}`, {
+            path: '/socket.io',
+            transports: ['websocket'],
+            query: { EIO: '4', transport: 'websocket' },
+        });
+
+        // The first timers_sync is the snapshot join_project replies with
+        let joined = false;
+        const deliver = (payload: TimerSyncPayload) => {
+            // Timers created or imported after the snapshot are new to this page
+            const isNew = joined && !latest.has(String(payload.id));
+            latest.set(String(payload.id), payload);
+            handlersRef.current.get(String(payload.id))?.(payload);
+            if (isNew) optionsRef.current.onTimerAdded?.(payload);
+        };
+
+        socket.on('connect', () => {
+            socket.emit('join_project', {
+                project_id: projectId,
+                sync: 'deadline',
+            });
+        });
+        socket.on('timer_sync', deliver);
+        // The join snapshot, batch operations and imports carry several timers at once
+        socket.on('timers_sync', (batch: TimersSyncPayload) => {
+            batch.timers.forEach(deliver);
+            joined = true;
+        });
+        socket.on('timer_removed', (data: TimerRemovedPayload) => {
+            const key = String(data.timer_id);
+            latest.delete(key);
+            optionsRef.current.onTimerRemoved?.(key);
+        });
+        socket.on('connect_error', (error) => {
+            console.error('Socket.IO connection error:', error);
+        });
+
+        return () => {
+            socket.disconnect();
+            latest.clear();
+        };
+    }, [projectId]);
+
+    return useCallback((timerId, handler) => {
+        handlersRef.current.set(timerId, handler);
+        const payload = latestRef.current.get(timerId);
+        if (payload) handler(payload);
+        return () => {
+            if (handlersRef.current.get(timerId) === handler) {
+                handlersRef.current.delete(timerId);
+            }
+        };
+    }, []);
+}
@@ -0,0 +1,117 @@
+/**
+ * Client side of the deadline-based timer_sync protocol: the server sends an
+ * absolute end time on start/pause/reset/edit (plus occasional drift
+ * corrections) and the countdown is interpolated locally in between.
+ */
+
+import { useCallback, useEffect, useRef } from 'react';
+
+export interface TimerSyncPayload {
+    id: number;
+    name: string;
+    description: string | null;
+    duration: number;
+    remaining_seconds: number;
+    paused: boolean;
+    project_id: number;
+    end_time_ms: number | null; // epoch ms, null while paused
+    server_time_ms: number; // server clock when the payload was built
+}
+
+// Sent to a project's room when several timers change in one batch
+export interface TimersSyncPayload {
+    project_id: number;
+    timers: TimerSyncPayload[];
+}
+
+// Sent to a project's selection room whenever its selected timer changes
+export interface SelectedTimerChangedPayload {
+    project_id: number;
+    timer: TimerSyncPayload | null; // null when no timer is selected
+}
+
+// How often the local countdown re-renders; only whole seconds are displayed
+const LOCAL_TICK_MS = 250;
+
+/**
+ * Difference between the server clock and this device's clock in milliseconds
+ */
+export function getClockOffset(payload: TimerSyncPayload): number {
+    return payload.server_time_ms - Date.now();
+}
+
+/**
+ * Take server_time_ms from the X-Server-Time-Ms header when a REST response
+ * has one. After a 304 the browser hands back the cached body, whose
+ * server_time_ms is stale, but the header is fresh.
+ */
+export function withResponseServerTime(
+    payload: TimerSyncPayload,
+    response: Response
+): TimerSyncPayload {
+    const serverTime = Number(response.headers.get('X-Server-Time-Ms'));
+    return serverTime ? { ...payload, server_time_ms: serverTime } : payload;
+}
+
+/**
+ * Seconds left on a synced timer, measured against the server clock
+ */
+export function getRemainingSeconds(
+    payload: TimerSyncPayload,
+    clockOffset: number
+): number {
+    if (payload.paused || payload.end_time_ms === null) {
+        return payload.remaining_seconds;
+    }
+    const serverNow = Date.now() + clockOffset;
+    return Math.max(0, Math.floor((payload.end_time_ms - serverNow) / 1000));
+}
+
+/**
+ * Count down locally from the latest timer_sync payload.
+ * Returns applySync, which should be called with every timer_sync event;
+ * onTick receives the remaining seconds whenever they change.
+ */
+export function useSyncedCountdown(onTick: (seconds: number) => void) {
+    const syncRef = useRef<{
+        payload: TimerSyncPayload;
+        clockOffset: number;
+    } | null>(null);
+    const lastSecondsRef = useRef<number | null>(null);
+    const onTickRef = useRef(onTick);
+    onTickRef.current = onTick;
+
+    const emitTick = useCallback(() => {
+        const sync = syncRef.current;
+        if (!sync) return;
+        const seconds = getRemainingSeconds(sync.payload, sync.clockOffset);
+        if (seconds !== lastSecondsRef.current) {
+            lastSecondsRef.current = seconds;
+            onTickRef.current(seconds);
+        }
+    }, []);
+
+    const applySync = useCallback(
+        (payload: TimerSyncPayload) => {
+            syncRef.current = {
+                payload,
+                clockOffset: getClockOffset(payload),
+            };
+            lastSecondsRef.current = null;
+            emitTick();
+        },
+        [emitTick]
+    );
+
+    useEffect(() => {
+        const interval = setInterval(() => {
+            if (syncRef.current && !syncRef.current.payload.paused) {
+                emitTick();
+            }
+        }, LOCAL_TICK_MS);
+
+        return () => clearInterval(interval);
+    }, [emitTick]);
+
+    return { applySync };
+}